@@ -96,11 +96,22 @@ class ClientInvoice(SQLModel):
         return round(float(v), 2)
 
 
+class ClientSummary(SQLModel):
+    """Per-client row of a weekly manifest"""
+    client_id: UUID
+    client_name: str
+    ticket_count: int
+    total_weight: float  # tonnes
+    rate: float  # per tonne
+    total_amount: float
+    reference_count: int
+
+
 class WeeklyManifest(SQLModel):
     """Weekly summary manifest"""
     week_start: date
     week_end: date
-    client_summaries: List[Dict[str, Any]] = []
+    client_summaries: List[ClientSummary] = []
     total_clients: int = 0
     total_tickets: int = 0
     total_tonnage: float = 0.0
@@ -1,11 +1,16 @@
 from datetime import datetime
 from ..utils.datetime_utils import utcnow_naive
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 
 
+# Review queue rows: unreviewed matches in the 60-85% confidence band
+_REVIEW_QUEUE_PREDICATE = text("reviewed = false AND confidence >= 60 AND confidence < 85")
+
+
 class MatchResultBase(SQLModel):
     ticket_id: UUID = Field(foreign_key="ticket.id", index=True)
     image_id: UUID = Field(foreign_key="ticketimage.id", index=True)
@@ -20,6 +25,15 @@ class MatchResultBase(SQLModel):
 
 class MatchResult(MatchResultBase, table=True):
     __tablename__ = "match_results"
+    __table_args__ = (
+        Index(
+            "ix_match_results_review",
+            text("confidence DESC"),
+            "created_at",
+            postgresql_where=_REVIEW_QUEUE_PREDICATE,
+            sqlite_where=_REVIEW_QUEUE_PREDICATE,
+        ),
+    )
     
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=utcnow_naive)
@@ -63,4 +77,11 @@ class MatchResultSummary(SQLModel):
 class MatchDecision(SQLModel):
     """Request model for manual match decisions"""
     accepted: bool
-    reason: Optional[str] = None
\ No newline at end of file
+    reason: Optional[str] = None
+
+
+class BulkMatchDecision(SQLModel):
+    """Request model for applying one manual decision to several matches"""
+    match_ids: List[UUID] = Field(min_length=1, max_length=500)
+    accepted: bool
+    reason: Optional[str] = None
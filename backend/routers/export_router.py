@@ -1,4 +1,5 @@
 import logging
+import os
 from datetime import date
 from pathlib import Path
 from uuid import UUID
@@ -152,7 +153,14 @@ async def download_export(
     # Get file path
     file_path = export_service.get_export_file_path(export_id)
     
-    if not file_path:
+    # Stat once here and hand the result to FileResponse so it does not
+    # stat the file again
+    try:
+        stat_result = os.stat(file_path) if file_path else None
+    except FileNotFoundError:
+        stat_result = None
+    
+    if not stat_result:
         raise HTTPException(
             status_code=404,
             detail="Export not found or file no longer exists"
@@ -161,7 +169,8 @@ async def download_export(
     return FileResponse(
         path=str(file_path),
         media_type='application/zip',
-        filename=file_path.name
+        filename=file_path.name,
+        stat_result=stat_result
     )
 
 
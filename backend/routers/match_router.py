@@ -4,7 +4,7 @@ from uuid import UUID
 
 from backend.middleware.auth_middleware import staff_required
 from backend.models.match_result import (
-    MatchResultRead, MatchDecision
+    MatchResultRead, MatchDecision, BulkMatchDecision
 )
 from backend.services.match_service import MatchService, get_match_service
 
@@ -223,6 +223,36 @@ async def reject_match(
         )
 
 
+@router.post("/results/bulk-decision")
+async def bulk_match_decision(
+    decision: BulkMatchDecision,
+    request: Request = None,
+    current_user: dict = Depends(staff_required()),
+    match_service: MatchService = Depends(get_match_service)
+) -> List[MatchResultRead]:
+    """
+    Manually accept or reject several match results at once
+    
+    Requires PROCESSOR, MANAGER, or ADMIN role.
+    """
+    try:
+        return await match_service.bulk_decide_matches(
+            user_id=current_user.id,
+            decision=decision
+        )
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process match decisions: {str(e)}"
+        )
+
+
 @router.get("/review-queue")
 async def get_review_queue(
     batch_id: Optional[UUID] = None,
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Add partial index for the review queue to the match_results table
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import inspect
+from backend.core.database import engine
+from backend.models.match_result import MatchResult
+
+def add_review_index():
+    """Add ix_match_results_review index to match_results table if it doesn't exist"""
+    # The index is declared on the model, so existing databases get exactly
+    # what create_all builds for new ones
+    review_index = next(
+        index for index in MatchResult.__table__.indexes
+        if index.name == "ix_match_results_review"
+    )
+    
+    with engine.connect() as conn:
+        # Check if index exists
+        existing = {index["name"] for index in inspect(conn).get_indexes("match_results")}
+        
+        if review_index.name not in existing:
+            review_index.create(bind=conn)
+            conn.commit()
+            print("Added ix_match_results_review index to match_results table")
+        else:
+            print("ix_match_results_review index already exists")
+
+if __name__ == "__main__":
+    add_review_index()
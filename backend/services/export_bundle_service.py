@@ -1,18 +1,18 @@
-import os
-import shutil
+import asyncio
 import zipfile
-import json
 import logging
 from datetime import date
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
+import orjson
 from sqlmodel import Session
 
 from ..models.export import (
     ExportRequest, ExportResult, ExportValidation,
-    ExportAuditLog, WeeklyGrouping
+    ExportAuditLog, WeeklyGrouping, ClientGrouping
 )
 from ..services.weekly_export_service import WeeklyExportService
 from ..services.invoice_generator_service import InvoiceGeneratorService
@@ -22,6 +22,20 @@ from ..services.audit_service import AuditService
 logger = logging.getLogger(__name__)
 
 
+def _json_dumps(data, indent: bool = False) -> str:
+    """Serialize to JSON with orjson; values it cannot encode are stringified"""
+    option = orjson.OPT_INDENT_2 if indent else 0
+    return orjson.dumps(data, default=str, option=option).decode()
+
+
+# Image formats whose payload is already compressed; deflating them again
+# costs CPU for no size reduction
+_PRECOMPRESSED_SUFFIXES = ('.png', '.jpg', '.jpeg')
+
+# Characters not allowed in exported file/folder names, mapped to '_'
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+
 class ExportBundleService:
     """Service for creating export bundles (ZIP files)"""
     
@@ -35,6 +49,11 @@ class ExportBundleService:
         # Create export directory
         self.export_base_path = Path("exports")
         self.export_base_path.mkdir(exist_ok=True)
+        
+        # Upper bound on storage reads in flight while bundling images
+        self.max_concurrent_image_reads = 64
+        self.zip_write_buffer_size = 1024 * 1024
+        self.csv_rows_per_write = 1024
     
     async def create_export_bundle(
         self,
@@ -111,7 +130,7 @@ class ExportBundleService:
                 )
             
             # 4. Create export bundle
-            export_path = await self._create_zip_bundle(
+            export_path, file_size = await self._create_zip_bundle(
                 week_groups=week_groups,
                 export_request=export_request,
                 validation=validation
@@ -136,9 +155,6 @@ class ExportBundleService:
                 week_groups=week_groups
             )
             
-            # Get file size
-            file_size = export_path.stat().st_size if export_path.exists() else 0
-            
             return ExportResult(
                 success=True,
                 export_id=audit_log.id,
@@ -187,90 +203,82 @@ class ExportBundleService:
         week_groups: Dict[str, WeeklyGrouping],
         export_request: ExportRequest,
         validation: ExportValidation
-    ) -> Path:
+    ) -> Tuple[Path, int]:
         """
         Create the ZIP file with proper structure
         
+        Entries are written straight into the archive from memory, so no
+        intermediate copy of the bundle is staged on disk.
+        
         Returns:
-            Path to created ZIP file
+            Tuple of (path to created ZIP file, its size in bytes)
         """
-        # Create temporary directory for building the export
-        timestamp = date.today().strftime("%Y%m%d")
-        temp_dir = self.export_base_path / f"temp_{timestamp}_{os.getpid()}"
-        temp_dir.mkdir(exist_ok=True)
+        export_date = date.today()
+        timestamp = export_date.strftime("%Y%m%d")
+        zip_filename = f"invoices_export_{timestamp}.zip"
+        zip_path = self.export_base_path / zip_filename
         
-        try:
+        # Client names and references repeat across weeks; sanitize each once
+        safe_names: Dict[str, str] = {}
+        
+        def safe_name(name: str) -> str:
+            sanitized = safe_names.get(name)
+            if sanitized is None:
+                sanitized = safe_names[name] = self._sanitize_filename(name)
+            return sanitized
+        
+        # Text entries are deflated at the fastest level (see _write_zip_entry).
+        # A 1 MB write buffer keeps large bundles from issuing many small
+        # write syscalls. CSV generation, deflate and file writes are
+        # blocking, so they run in worker threads; only the storage reads
+        # stay on the event loop. The ZipFile is only ever used by one
+        # thread at a time since each step is awaited.
+        with open(zip_path, 'wb', buffering=self.zip_write_buffer_size) as zip_file, \
+                zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
             # Generate merged CSV
-            merged_csv = self.invoice_generator.generate_merged_csv(week_groups)
-            merged_path = temp_dir / "merged.csv"
-            merged_path.write_text(merged_csv)
+            await asyncio.to_thread(self._write_merged_csv, zipf, week_groups)
             
             # Process each week
             for week_key, week_group in week_groups.items():
                 week_dir_name = f"week_{week_group.week_start.isoformat()}"
-                week_dir = temp_dir / week_dir_name
-                week_dir.mkdir(exist_ok=True)
                 
                 # Generate manifest for the week
-                manifest = self.invoice_generator.generate_weekly_manifest(week_group)
-                manifest_csv = self.invoice_generator.manifest_to_csv(manifest)
-                manifest_path = week_dir / "manifest.csv"
-                manifest_path.write_text(manifest_csv)
+                await asyncio.to_thread(self._write_week_manifest, zipf, week_dir_name, week_group)
                 
                 # Process each client in the week
                 for client_key, client_group in week_group.client_groups.items():
                     # Use client name for directory, sanitized
-                    client_dir_name = f"client_{self._sanitize_filename(client_group.client_name)}"
-                    client_dir = week_dir / client_dir_name
-                    client_dir.mkdir(exist_ok=True)
+                    client_dir_name = f"{week_dir_name}/client_{safe_name(client_group.client_name)}"
                     
-                    # Generate invoice
-                    invoice = self.invoice_generator.generate_client_invoice(
-                        client_group=client_group,
-                        week_start=week_group.week_start,
-                        week_end=week_group.week_end
+                    # Generate and write the invoice
+                    await asyncio.to_thread(
+                        self._write_client_invoice, zipf, client_dir_name, client_group, week_group
                     )
                     
-                    # Validate invoice totals
-                    invoice_errors = self.invoice_generator.validate_invoice_totals(
-                        invoice=invoice,
-                        client_group=client_group
-                    )
-                    if invoice_errors:
-                        logger.warning(
-                            f"Invoice validation errors for {client_group.client_name}: "
-                            f"{invoice_errors}"
-                        )
-                    
-                    # Write invoice CSV
-                    invoice_csv = self.invoice_generator.invoice_to_csv(invoice)
-                    invoice_path = client_dir / "invoice.csv"
-                    invoice_path.write_text(invoice_csv)
-                    
-                    # Copy ticket images if requested
+                    # Add ticket images if requested
                     if export_request.include_images:
-                        tickets_dir = client_dir / "tickets"
-                        tickets_dir.mkdir(exist_ok=True)
-                        
+                        image_entries = []
                         for reference, ref_group in client_group.reference_groups.items():
-                            # Create reference folder
-                            ref_dir_name = self._sanitize_filename(reference)
-                            ref_dir = tickets_dir / ref_dir_name
-                            ref_dir.mkdir(exist_ok=True)
+                            # One folder per reference
+                            ref_dir_name = f"{client_dir_name}/tickets/{safe_name(reference)}"
                             
-                            # Copy images for tickets in this reference
                             for ticket_data in ref_group.tickets:
                                 if ticket_data.get('image_path'):
-                                    await self._copy_ticket_image(
-                                        image_path=ticket_data['image_path'],
-                                        ticket_number=ticket_data['ticket_number'],
-                                        destination_dir=ref_dir
-                                    )
+                                    image_entries.append((
+                                        f"{ref_dir_name}/{ticket_data['ticket_number']}.png",
+                                        ticket_data['image_path'],
+                                        ticket_data['ticket_number']
+                                    ))
+                        
+                        # One bulk storage read per client instead of a round trip per image
+                        images = await self._read_ticket_images(image_entries)
+                        
+                        await asyncio.to_thread(self._write_image_entries, zipf, image_entries, images)
             
             # Create audit.json if there were validation issues
             if validation.validation_errors or validation.has_critical_errors:
                 audit_data = {
-                    "export_date": date.today().isoformat(),
+                    "export_date": export_date.isoformat(),
                     "validation": {
                         "is_valid": validation.is_valid,
                         "total_tickets": validation.total_tickets,
@@ -282,54 +290,109 @@ class ExportBundleService:
                     },
                     "forced_export": export_request.force_export
                 }
-                audit_path = temp_dir / "audit.json"
-                audit_path.write_text(json.dumps(audit_data, indent=2))
+                self._write_zip_entry(zipf, "audit.json", _json_dumps(audit_data, indent=True))
             
-            # Create ZIP file
-            zip_filename = f"invoices_export_{timestamp}.zip"
-            zip_path = self.export_base_path / zip_filename
-            
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in temp_dir.rglob('*'):
-                    if file_path.is_file():
-                        arcname = str(file_path.relative_to(temp_dir))
-                        zipf.write(file_path, arcname)
-            
-            logger.info(f"Created export bundle: {zip_path}")
-            return zip_path
-            
-        finally:
-            # Clean up temp directory
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
+            # Finish the central directory now so the writer's position is the
+            # final bundle size; no need to stat the file after writing it
+            zipf.close()
+            file_size = zip_file.tell()
+        
+        logger.info(f"Created export bundle: {zip_path} ({file_size} bytes)")
+        return zip_path, file_size
+    
+    def _write_merged_csv(
+        self,
+        zipf: zipfile.ZipFile,
+        week_groups: Dict[str, WeeklyGrouping]
+    ) -> None:
+        """Stream the merged CSV into the bundle without building it in memory"""
+        rows = self.invoice_generator.iter_merged_csv(week_groups)
+        with zipf.open("merged.csv", 'w', force_zip64=True) as dest:
+            while chunk := list(islice(rows, self.csv_rows_per_write)):
+                dest.write("".join(chunk).encode("utf-8"))
+    
+    def _write_week_manifest(
+        self,
+        zipf: zipfile.ZipFile,
+        week_dir_name: str,
+        week_group: WeeklyGrouping
+    ) -> None:
+        """Generate the weekly manifest and add it to the bundle"""
+        manifest = self.invoice_generator.generate_weekly_manifest(week_group)
+        manifest_csv = self.invoice_generator.manifest_to_csv(manifest)
+        self._write_zip_entry(zipf, f"{week_dir_name}/manifest.csv", manifest_csv)
+    
+    def _write_client_invoice(
+        self,
+        zipf: zipfile.ZipFile,
+        client_dir_name: str,
+        client_group: ClientGrouping,
+        week_group: WeeklyGrouping
+    ) -> None:
+        """Generate, validate and add a client's invoice to the bundle"""
+        invoice = self.invoice_generator.generate_client_invoice(
+            client_group=client_group,
+            week_start=week_group.week_start,
+            week_end=week_group.week_end
+        )
+        
+        # Validate invoice totals
+        invoice_errors = self.invoice_generator.validate_invoice_totals(
+            invoice=invoice,
+            client_group=client_group
+        )
+        if invoice_errors:
+            logger.warning(
+                f"Invoice validation errors for {client_group.client_name}: "
+                f"{invoice_errors}"
+            )
+        
+        invoice_csv = self.invoice_generator.invoice_to_csv(invoice)
+        self._write_zip_entry(zipf, f"{client_dir_name}/invoice.csv", invoice_csv)
+    
+    def _write_image_entries(
+        self,
+        zipf: zipfile.ZipFile,
+        image_entries: List[Tuple[str, str, str]],
+        images: List[Optional[bytes]]
+    ) -> None:
+        """Add the images read for one client to the bundle"""
+        for index, (arcname, _, _) in enumerate(image_entries):
+            image_data = images[index]
+            # Drop the reference so each image is freed once written
+            images[index] = None
+            if image_data:
+                self._write_zip_entry(zipf, arcname, image_data)
+    
+    def _write_zip_entry(self, zipf: zipfile.ZipFile, arcname: str, data) -> None:
+        """Add an entry, storing already-compressed images instead of deflating them"""
+        if arcname.lower().endswith(_PRECOMPRESSED_SUFFIXES):
+            zipf.writestr(arcname, data, compress_type=zipfile.ZIP_STORED)
+        else:
+            zipf.writestr(arcname, data, compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
     
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize filename for filesystem compatibility"""
-        # Remove or replace problematic characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            name = name.replace(char, '_')
-        # Limit length
-        return name[:50]
+        # Replace problematic characters in one pass and limit length
+        return name.translate(_SANITIZE_TABLE)[:50]
     
-    async def _copy_ticket_image(
+    async def _read_ticket_images(
         self,
-        image_path: str,
-        ticket_number: str,
-        destination_dir: Path
-    ):
-        """Copy ticket image to export directory with proper naming"""
-        try:
-            # Read image from storage
-            image_data = await self.storage_service.read_file(image_path)
-            if image_data:
-                # Save with ticket number as filename
-                dest_path = destination_dir / f"{ticket_number}.png"
-                dest_path.write_bytes(image_data)
-            else:
+        image_entries: List[Tuple[str, str, str]]
+    ) -> List[Optional[bytes]]:
+        """Read ticket image bytes for (arcname, image_path, ticket_number) entries"""
+        contents = await self.storage_service.read_files(
+            [image_path for _, image_path, _ in image_entries],
+            max_concurrency=self.max_concurrent_image_reads
+        )
+        
+        images = []
+        for _, image_path, ticket_number in image_entries:
+            image_data = contents.get(image_path)
+            if not image_data:
                 logger.warning(f"Could not read image for ticket {ticket_number} from {image_path}")
-        except Exception as e:
-            logger.error(f"Error copying image for ticket {ticket_number}: {e}")
+            images.append(image_data)
+        return images
     
     def _create_audit_log(
         self,
@@ -349,16 +412,17 @@ class ExportBundleService:
         total_amount = 0.0
         
         if week_groups:
-            total_tickets = sum(wg.total_tickets for wg in week_groups.values())
-            total_clients = sum(len(wg.client_groups) for wg in week_groups.values())
-            total_amount = sum(wg.total_amount for wg in week_groups.values())
+            for wg in week_groups.values():
+                total_tickets += wg.total_tickets
+                total_clients += len(wg.client_groups)
+                total_amount += wg.total_amount
         
         # Create metadata
         metadata = {
             "export_type": export_request.export_type,
             "include_images": export_request.include_images,
             "force_export": export_request.force_export,
-            "client_ids": [str(cid) for cid in export_request.client_ids] if export_request.client_ids else None,
+            "client_ids": export_request.client_ids or None,
             "validation_summary": {
                 "total_tickets": validation.total_tickets,
                 "matched_images": validation.matched_images,
@@ -377,8 +441,8 @@ class ExportBundleService:
             total_clients=total_clients,
             total_amount=round(total_amount, 2),
             validation_passed=validation.is_valid,
-            validation_errors=json.dumps(validation.validation_errors) if validation.validation_errors else None,
-            export_metadata=json.dumps(metadata),
+            validation_errors=_json_dumps(validation.validation_errors) if validation.validation_errors else None,
+            export_metadata=_json_dumps(metadata),
             file_path=file_path
         )
         
@@ -389,10 +453,14 @@ class ExportBundleService:
         return audit_log
     
     def get_export_file_path(self, export_id: UUID) -> Optional[Path]:
-        """Get file path for a previous export"""
+        """
+        Get file path for a previous export
+        
+        The path is returned as recorded in the audit log without checking
+        the filesystem; callers serving the file detect a missing bundle
+        from the stat they need anyway.
+        """
         audit_log = self.db.get(ExportAuditLog, export_id)
         if audit_log and audit_log.file_path:
-            path = Path(audit_log.file_path)
-            if path.exists():
-                return path
+            return Path(audit_log.file_path)
         return None
\ No newline at end of file
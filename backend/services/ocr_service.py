@@ -1,7 +1,9 @@
 import re
+import threading
 from typing import Tuple, Optional, List
 from PIL import Image
 import logging
+import numpy as np
 
 try:
     import pytesseract
@@ -10,8 +12,19 @@ except ImportError:
     TESSERACT_AVAILABLE = False
     pytesseract = None
 
+# In-process libtesseract bindings; avoids a tesseract subprocess per image
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+    tesserocr = None
+
 logger = logging.getLogger(__name__)
 
+# Any reasonably sized alphanumeric ticket number
+_FALLBACK_TICKET_NUMBER = re.compile(r'[A-Z0-9\-_]{3,15}')
+
 
 class OCRService:
     """
@@ -26,8 +39,21 @@ class OCRService:
             r'\d{4,8}',                # 12345678
             r'[A-Z]\d{2,4}[A-Z]\d{2,4}', # T12A34
         ]
+        self._ticket_patterns = [
+            re.compile(pattern, re.IGNORECASE) for pattern in self.ticket_number_patterns
+        ]
+        # All patterns as one alternation, so OCR text is scanned once
+        self._combined_ticket_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in self.ticket_number_patterns),
+            re.IGNORECASE
+        )
         
-        if not TESSERACT_AVAILABLE:
+        # tesserocr API handle, created on first use and reused; it is not
+        # thread-safe, so calls are serialized
+        self._tesserocr_api = None
+        self._tesserocr_lock = threading.Lock()
+        
+        if not TESSERACT_AVAILABLE and not TESSEROCR_AVAILABLE:
             logger.warning("Tesseract not available. OCR functionality will be limited.")
     
     def extract_ticket_number(self, image: Image.Image) -> Tuple[Optional[str], float]:
@@ -40,28 +66,13 @@ class OCRService:
         Returns:
             Tuple of (ticket_number, confidence_score)
         """
-        if not TESSERACT_AVAILABLE:
+        if not TESSERACT_AVAILABLE and not TESSEROCR_AVAILABLE:
             logger.warning("Tesseract not available, using fallback method")
             return self._fallback_ticket_extraction(image)
         
         try:
-            # Get OCR data with confidence scores
-            ocr_data = pytesseract.image_to_data(
-                image, 
-                output_type=pytesseract.Output.DICT,
-                config='--psm 6'  # Single uniform block of text
-            )
-            
             # Extract text with confidence scores
-            texts = []
-            confidences = []
-            
-            for i, text in enumerate(ocr_data['text']):
-                if text.strip():
-                    conf = float(ocr_data['conf'][i])
-                    if conf > 0:  # Valid confidence score
-                        texts.append(text.strip())
-                        confidences.append(conf)
+            texts, confidences = self._recognize_words(image)
             
             if not texts:
                 logger.warning("No text detected by OCR")
@@ -78,6 +89,55 @@ class OCRService:
             logger.error(f"Error in OCR processing: {e}")
             return None, 0.0
     
+    def _recognize_words(self, image: Image.Image) -> Tuple[List[str], List[float]]:
+        """
+        Recognize the words in an image as a single block of text
+        
+        Uses the in-process tesserocr bindings when installed, otherwise
+        the tesseract binary through pytesseract.
+        
+        Args:
+            image: PIL Image to process
+            
+        Returns:
+            Tuple of (words, confidences) for words with a valid confidence
+        """
+        texts = []
+        confidences = []
+        
+        if TESSEROCR_AVAILABLE:
+            with self._tesserocr_lock:
+                if self._tesserocr_api is None:
+                    self._tesserocr_api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_BLOCK)
+                api = self._tesserocr_api
+                api.SetImage(image)
+                api.Recognize()
+                
+                level = tesserocr.RIL.WORD
+                for word in tesserocr.iterate_level(api.GetIterator(), level):
+                    text = (word.GetUTF8Text(level) or '').strip()
+                    conf = float(word.Confidence(level))
+                    if text and conf > 0:  # Valid confidence score
+                        texts.append(text)
+                        confidences.append(conf)
+            return texts, confidences
+        
+        # Get OCR data with confidence scores
+        ocr_data = pytesseract.image_to_data(
+            image, 
+            output_type=pytesseract.Output.DICT,
+            config='--psm 6'  # Single uniform block of text
+        )
+        
+        for i, text in enumerate(ocr_data['text']):
+            if text.strip():
+                conf = float(ocr_data['conf'][i])
+                if conf > 0:  # Valid confidence score
+                    texts.append(text.strip())
+                    confidences.append(conf)
+        
+        return texts, confidences
+    
     def _find_best_ticket_number(self, texts: List[str], confidences: List[float]) -> Tuple[Optional[str], float]:
         """
         Find the best ticket number candidate from OCR results
@@ -92,25 +152,25 @@ class OCRService:
         best_candidate = None
         best_confidence = 0.0
         
-        # Combine all text into a single string for pattern matching
-        combined_text = ' '.join(texts)
+        # Combine the text into a single string for pattern matching; every
+        # pattern needs a digit, so tokens without one are left out
+        combined_text = ' '.join(text for text in texts if any(c.isdigit() for c in text))
+        texts_lower = [text.lower() for text in texts]
         
-        # Try each pattern
-        for pattern in self.ticket_number_patterns:
-            matches = re.finditer(pattern, combined_text, re.IGNORECASE)
+        # Try all patterns in a single pass; at each position the first
+        # pattern that matches wins, and ties go to the leftmost candidate
+        for match in self._combined_ticket_pattern.finditer(combined_text):
+            candidate = match.group().upper()
             
-            for match in matches:
-                candidate = match.group().upper()
-                
-                # Find confidence for this candidate
-                candidate_confidence = self._calculate_candidate_confidence(
-                    candidate, texts, confidences
-                )
-                
-                # Check if this is the best candidate so far
-                if candidate_confidence > best_confidence:
-                    best_candidate = candidate
-                    best_confidence = candidate_confidence
+            # Find confidence for this candidate
+            candidate_confidence = self._calculate_candidate_confidence(
+                candidate, texts, confidences, texts_lower
+            )
+            
+            # Check if this is the best candidate so far
+            if candidate_confidence > best_confidence:
+                best_candidate = candidate
+                best_confidence = candidate_confidence
         
         # If no pattern matches found, try to find any alphanumeric sequence
         if not best_candidate:
@@ -124,7 +184,8 @@ class OCRService:
         return best_candidate, best_confidence
     
     def _calculate_candidate_confidence(self, candidate: str, texts: List[str], 
-                                      confidences: List[float]) -> float:
+                                      confidences: List[float],
+                                      texts_lower: Optional[List[str]] = None) -> float:
         """
         Calculate confidence score for a ticket number candidate
         
@@ -132,17 +193,22 @@ class OCRService:
             candidate: Potential ticket number
             texts: List of detected text strings
             confidences: Corresponding confidence scores
+            texts_lower: texts already lowercased, shared across candidates
             
         Returns:
             Calculated confidence score
         """
         try:
             # Find which text segments contribute to this candidate
-            relevant_confidences = []
+            if texts_lower is None:
+                texts_lower = [text.lower() for text in texts]
+            candidate_lower = candidate.lower()
             
-            for i, text in enumerate(texts):
-                if candidate.lower() in text.lower() or text.lower() in candidate.lower():
-                    relevant_confidences.append(confidences[i])
+            relevant_confidences = [
+                confidence
+                for text_lower, confidence in zip(texts_lower, confidences)
+                if candidate_lower in text_lower or text_lower in candidate_lower
+            ]
             
             if relevant_confidences:
                 # Use average confidence of relevant segments
@@ -179,10 +245,8 @@ class OCRService:
             bonuses.append(5.0)
         
         # Pattern match bonus
-        for pattern in self.ticket_number_patterns:
-            if re.match(pattern + '$', candidate, re.IGNORECASE):
-                bonuses.append(10.0)
-                break
+        if any(pattern.fullmatch(candidate) for pattern in self._ticket_patterns):
+            bonuses.append(10.0)
         
         # Character composition bonus
         if any(c.isalpha() for c in candidate) and any(c.isdigit() for c in candidate):
@@ -212,36 +276,34 @@ class OCRService:
             if width > 200 and height > 100:
                 confidence += 20.0
             
-            # Contrast check (simplified)
+            # Contrast and content checks both come from the 256-bin grayscale
+            # histogram, so no pixel-sized arrays or masks are allocated
             try:
-                from PIL import ImageStat
-                if image.mode != 'L':
-                    gray = image.convert('L')
-                else:
-                    gray = image
-                
-                stat = ImageStat.Stat(gray)
-                contrast = stat.stddev[0]
-                
-                if contrast > 30:  # Good contrast
-                    confidence += 30.0
-                elif contrast > 15:  # Moderate contrast
-                    confidence += 15.0
-                    
+                gray = image if image.mode == 'L' else image.convert('L')
+                histogram = np.asarray(gray.histogram(), dtype=np.float64)
+                pixel_count = histogram.sum()
+                if not pixel_count:
+                    raise ValueError("Empty image")
+                levels = np.arange(histogram.size, dtype=np.float64)
+                mean = histogram @ levels / pixel_count
+                contrast = float(np.sqrt(histogram @ (levels - mean) ** 2 / pixel_count))
+                non_white_ratio = float(histogram[:240].sum() / pixel_count)
             except Exception:
+                contrast = non_white_ratio = None
+            
+            # Contrast check (simplified)
+            if contrast is None:
                 confidence += 10.0  # Default if can't calculate
+            elif contrast > 30:  # Good contrast
+                confidence += 30.0
+            elif contrast > 15:  # Moderate contrast
+                confidence += 15.0
             
             # Content check (non-white pixels)
-            try:
-                import numpy as np
-                img_array = np.array(image.convert('L'))
-                non_white_ratio = np.sum(img_array < 240) / img_array.size
-                
-                if non_white_ratio > 0.1:  # At least 10% content
-                    confidence += 20.0
-                    
-            except Exception:
+            if non_white_ratio is None:
                 confidence += 10.0  # Default if can't calculate
+            elif non_white_ratio > 0.1:  # At least 10% content
+                confidence += 20.0
             
             logger.info(f"Fallback OCR estimation: confidence {confidence:.1f}%")
             
@@ -276,12 +338,11 @@ class OCRService:
             return False
         
         # Check against known patterns
-        for pattern in self.ticket_number_patterns:
-            if re.match(pattern + '$', clean_number, re.IGNORECASE):
-                return True
+        if any(pattern.fullmatch(clean_number) for pattern in self._ticket_patterns):
+            return True
         
         # Allow any alphanumeric string that's reasonable length
-        if re.match(r'^[A-Z0-9\-_]{3,15}$', clean_number):
+        if _FALLBACK_TICKET_NUMBER.fullmatch(clean_number):
             return True
         
         return False
@@ -301,20 +362,26 @@ class OCRService:
             return "", 0.0
         
         try:
-            # Extract all text
-            text = pytesseract.image_to_string(image, config='--psm 6')
-            
-            # Get confidence data
+            # One recognition pass gives both the words and their confidences
             ocr_data = pytesseract.image_to_data(
                 image, 
-                output_type=pytesseract.Output.DICT
+                output_type=pytesseract.Output.DICT,
+                config='--psm 6'
             )
             
+            # Rebuild the text line by line from the recognised words
+            lines = {}
+            for i, word in enumerate(ocr_data['text']):
+                if word.strip():
+                    line_key = (ocr_data['block_num'][i], ocr_data['par_num'][i], ocr_data['line_num'][i])
+                    lines.setdefault(line_key, []).append(word.strip())
+            text = '\n'.join(' '.join(words) for words in lines.values())
+            
             # Calculate average confidence
             confidences = [float(conf) for conf in ocr_data['conf'] if float(conf) > 0]
             avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
             
-            return text.strip(), avg_confidence
+            return text, avg_confidence
             
         except Exception as e:
             logger.error(f"Error extracting all text: {e}")
@@ -1,13 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby, repeat
 from pathlib import Path
-from typing import List, Tuple, Optional, Union
+from typing import Dict, Iterator, List, Tuple, Optional, Union
 from PIL import Image
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
+import PyPDF2
 import logging
+import os
+import re
+import tempfile
 
 from ..utils.image_utils import ImageUtils
 
 logger = logging.getLogger(__name__)
 
+# pdfinfo reports the first page size as e.g. "612 x 792 pts (letter)"
+_PAGE_SIZE_PATTERN = re.compile(r'([\d.]+)\s*x\s*([\d.]+)\s*pts')
+
 
 class PDFExtractionService:
     """
@@ -17,8 +26,27 @@ class PDFExtractionService:
     def __init__(self):
         self.image_utils = ImageUtils()
         self.default_dpi = 300  # High quality for OCR
+        self.min_dpi = 150
+        # Letter width at 300 DPI; larger pages are rendered at a lower DPI
+        self.target_page_width = 2550
         self.min_page_width = 100
         self.min_page_height = 100
+        
+        # pdftoppm processes for multi-page renders; pdf2image splits the
+        # page range between them
+        self.thread_count = max(1, (os.cpu_count() or 1) - 1)
+        
+        # Threads for per-page enhancement; PIL releases the GIL while it works
+        self.max_enhance_workers = min(8, os.cpu_count() or 1)
+        
+        # Threads for per-ticket crop and OCR; tesseract runs out of process
+        self.max_ticket_workers = min(8, os.cpu_count() or 1)
+        
+        # Pages rendered per pdftoppm call when streaming a whole document
+        self.page_batch_size = 8
+        
+        # pdfinfo results per path, tagged with the (mtime_ns, size) they were read at
+        self._info_cache: Dict[str, Tuple[int, int, dict]] = {}
     
     def extract_pages_as_images(self, pdf_path: Union[str, Path]) -> List[Tuple[int, Image.Image]]:
         """
@@ -34,57 +62,142 @@ class PDFExtractionService:
             ValueError: If PDF cannot be opened or is invalid
         """
         try:
-            pdf_path = Path(pdf_path)
-            if not pdf_path.exists():
-                raise ValueError(f"PDF file not found: {pdf_path}")
-            
-            if not pdf_path.suffix.lower() == '.pdf':
-                raise ValueError(f"File is not a PDF: {pdf_path}")
-            
-            # Convert PDF to images using pdf2image
-            try:
-                images = convert_from_path(
-                    str(pdf_path),
-                    dpi=self.default_dpi,
-                    fmt='PNG'
-                )
-            except Exception as e:
-                raise ValueError(f"Failed to open PDF: {e}")
+            extracted_images = list(self.iter_pages_as_images(pdf_path))
+            logger.info(f"Extracted {len(extracted_images)} pages from PDF")
+            return extracted_images
             
-            if not images:
-                raise ValueError("PDF contains no pages")
+        except Exception as e:
+            logger.error(f"Error extracting pages from PDF: {e}")
+            raise ValueError(f"Failed to extract pages from PDF: {e}")
+    
+    def iter_pages_as_images(self, pdf_path: Union[str, Path]) -> Iterator[Tuple[int, Image.Image]]:
+        """
+        Yield enhanced PDF pages as they are rendered
+        
+        Pages are rendered page_batch_size at a time into a temporary
+        folder and decoded from there one file each, so only one batch is
+        held in memory however long the document is.
+        
+        Args:
+            pdf_path: Path to the PDF file
             
-            extracted_images = []
+        Yields:
+            Tuples (page_number, PIL_Image)
             
-            for page_num, image in enumerate(images, 1):
+        Raises:
+            ValueError: If PDF cannot be opened or is invalid
+        """
+        pdf_path = Path(pdf_path)
+        if not pdf_path.exists():
+            raise ValueError(f"PDF file not found: {pdf_path}")
+        
+        if not pdf_path.suffix.lower() == '.pdf':
+            raise ValueError(f"File is not a PDF: {pdf_path}")
+        
+        try:
+            total_pages = self._get_page_count(pdf_path)
+        except Exception as e:
+            raise ValueError(f"Failed to open PDF: {e}")
+        
+        if total_pages < 1:
+            raise ValueError("PDF contains no pages")
+        
+        extracted_count = 0
+        
+        dpi = self._get_render_dpi(pdf_path)
+        
+        with tempfile.TemporaryDirectory() as output_folder, \
+                ThreadPoolExecutor(max_workers=self.max_enhance_workers) as executor:
+            for first_page in range(1, total_pages + 1, self.page_batch_size):
+                last_page = min(first_page + self.page_batch_size - 1, total_pages)
+                
+                # Convert PDF pages to image files using pdf2image
                 try:
-                    # Check if page has reasonable dimensions
-                    if image.width < self.min_page_width or image.height < self.min_page_height:
-                        logger.warning(f"Page {page_num} has very small dimensions: {image.width}x{image.height}")
-                        continue
-                    
-                    # Apply any image enhancements
-                    enhanced_image = self.image_utils.enhance_image_for_ocr(image)
-                    
+                    paths = convert_from_path(
+                        str(pdf_path),
+                        dpi=dpi,
+                        fmt='ppm',  # raw 8-bit PGM, no encode/decode step
+                        grayscale=True,
+                        first_page=first_page,
+                        last_page=last_page,
+                        thread_count=self.thread_count,
+                        output_folder=output_folder,
+                        paths_only=True
+                    )
+                except Exception as e:
+                    raise ValueError(f"Failed to open PDF: {e}")
+                
+                page_paths = list(enumerate(paths, first_page))
+                run = map if len(page_paths) <= 1 or self.max_enhance_workers <= 1 else executor.map
+                
+                pages = [
+                    (page_num, image)
+                    for (page_num, _), image in zip(page_paths, run(self._load_page, page_paths, repeat(dpi)))
+                    if image is not None
+                ]
+                
+                # Apply any image enhancements
+                enhanced_images = run(self._enhance_page, pages)
+                
+                for (page_num, _), enhanced_image in zip(pages, enhanced_images):
                     if enhanced_image:
-                        extracted_images.append((page_num, enhanced_image))
+                        extracted_count += 1
                         logger.info(f"Successfully extracted page {page_num}")
+                        yield page_num, enhanced_image
                     else:
                         logger.warning(f"Failed to enhance page {page_num}")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing page {page_num}: {e}")
-                    continue
-            
-            if not extracted_images:
-                raise ValueError("No pages could be extracted from PDF")
+        
+        if not extracted_count:
+            raise ValueError("No pages could be extracted from PDF")
+    
+    def _load_page(self, page: Tuple[int, str], dpi: int) -> Optional[Image.Image]:
+        """
+        Decode one rendered page file and delete it
+        
+        Args:
+            page: Tuple (page_number, image_file_path)
+            dpi: Resolution the page was rendered at; PGM files do not record it
             
-            logger.info(f"Extracted {len(extracted_images)} pages from PDF")
-            return extracted_images
+        Returns:
+            PIL Image, or None if the page is too small or unreadable
+        """
+        page_num, path = page
+        try:
+            image = Image.open(path)
+            # Check if page has reasonable dimensions
+            if image.width < self.min_page_width or image.height < self.min_page_height:
+                logger.warning(f"Page {page_num} has very small dimensions: {image.width}x{image.height}")
+                image.close()
+                return None
+            # Decoding releases the file, so it can be removed
+            image.load()
+            image.info['dpi'] = (dpi, dpi)
+            return image
+        except Exception as e:
+            logger.error(f"Error reading page {page_num}: {e}")
+            return None
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def _enhance_page(self, page: Tuple[int, Image.Image]) -> Optional[Image.Image]:
+        """
+        Enhance one extracted page for OCR
+        
+        Args:
+            page: Tuple (page_number, PIL_Image)
             
+        Returns:
+            Enhanced PIL Image or None if processing fails
+        """
+        page_num, image = page
+        try:
+            return self.image_utils.enhance_image_for_ocr(image)
         except Exception as e:
-            logger.error(f"Error extracting pages from PDF: {e}")
-            raise ValueError(f"Failed to extract pages from PDF: {e}")
+            logger.error(f"Error processing page {page_num}: {e}")
+            return None
     
     def _convert_page_to_image(self, pdf_path: Union[str, Path], page_number: int) -> Optional[Image.Image]:
         """
@@ -98,11 +211,14 @@ class PDFExtractionService:
             PIL Image or None if conversion fails
         """
         try:
+            dpi = self._get_render_dpi(pdf_path)
+            
             # Convert specific page using pdf2image
             images = convert_from_path(
                 str(pdf_path),
-                dpi=self.default_dpi,
-                fmt='PNG',
+                dpi=dpi,
+                fmt='ppm',
+                grayscale=True,
                 first_page=page_number,
                 last_page=page_number
             )
@@ -110,9 +226,9 @@ class PDFExtractionService:
             if images:
                 pil_image = images[0]
                 # Set DPI info for the image
-                pil_image.info['dpi'] = (self.default_dpi, self.default_dpi)
+                pil_image.info['dpi'] = (dpi, dpi)
                 
-                logger.debug(f"Page {page_number} converted to {pil_image.size} image at {self.default_dpi} DPI")
+                logger.debug(f"Page {page_number} converted to {pil_image.size} image at {dpi} DPI")
                 return pil_image
             
             return None
@@ -121,6 +237,127 @@ class PDFExtractionService:
             logger.error(f"Error converting page {page_number} to image: {e}")
             return None
     
+    def _convert_page_range_to_images(self, pdf_path: Union[str, Path],
+                                      first_page: int, last_page: int) -> List[Image.Image]:
+        """
+        Convert a contiguous run of PDF pages with a single render call
+        
+        Args:
+            pdf_path: Path to the PDF file
+            first_page: First page of the run (1-based)
+            last_page: Last page of the run (inclusive)
+            
+        Returns:
+            List of PIL Images in page order
+        """
+        dpi = self._get_render_dpi(pdf_path)
+        images = convert_from_path(
+            str(pdf_path),
+            dpi=dpi,
+            fmt='ppm',
+            grayscale=True,
+            first_page=first_page,
+            last_page=last_page,
+            thread_count=self.thread_count
+        )
+        
+        for pil_image in images:
+            pil_image.info['dpi'] = (dpi, dpi)
+        
+        return images
+    
+    def _get_info(self, pdf_path: Union[str, Path]) -> dict:
+        """
+        Run pdfinfo on a PDF, reusing the result while the file is unchanged
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Dictionary of pdfinfo fields
+        """
+        path = str(pdf_path)
+        stat = os.stat(path)
+        cached = self._info_cache.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        
+        info = pdfinfo_from_path(path)
+        self._info_cache[path] = (stat.st_mtime_ns, stat.st_size, info)
+        return info
+    
+    def _get_page_count(self, pdf_path: Union[str, Path]) -> int:
+        """
+        Read the page count from the PDF metadata without rendering any page
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Number of pages reported by pdfinfo
+        """
+        return int(self._get_info(pdf_path)['Pages'])
+    
+    def _get_render_dpi(self, pdf_path: Union[str, Path]) -> int:
+        """
+        Pick the render DPI from the page size reported by pdfinfo
+        
+        Pages up to letter width keep default_dpi; wider pages are rendered
+        at the DPI that gives target_page_width pixels, but never below
+        min_dpi. Falls back to default_dpi when the size is unavailable.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            DPI to pass to pdf2image
+        """
+        try:
+            match = _PAGE_SIZE_PATTERN.search(str(self._get_info(pdf_path).get('Page size', '')))
+        except Exception as e:
+            logger.debug(f"Could not read page size, using {self.default_dpi} DPI: {e}")
+            return self.default_dpi
+        
+        if not match:
+            return self.default_dpi
+        
+        width_inches = float(match.group(1)) / 72
+        if width_inches <= 0:
+            return self.default_dpi
+        
+        dpi = round(self.target_page_width / width_inches)
+        return max(self.min_dpi, min(self.default_dpi, dpi))
+    
+    def _get_page_sizes(self, pdf_path: Union[str, Path], max_pages: int) -> List[dict]:
+        """
+        Read page dimensions from the PDF media boxes
+        
+        Sizes are in points, which equal pixels at 72 DPI; rotated pages
+        report their displayed orientation.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            max_pages: Maximum number of leading pages to describe
+            
+        Returns:
+            List of page info dictionaries
+        """
+        reader = PyPDF2.PdfReader(str(pdf_path))
+        pages_info = []
+        
+        for i, page in enumerate(reader.pages[:max_pages]):
+            width = round(float(page.mediabox.width))
+            height = round(float(page.mediabox.height))
+            if page.rotation % 180:
+                width, height = height, width
+            pages_info.append({
+                'page_number': i + 1,
+                'width': width,
+                'height': height
+            })
+        
+        return pages_info
+    
     def detect_and_crop_tickets(self, image: Image.Image, page_number: int) -> List[Tuple[Image.Image, dict]]:
         """
         Detect and crop individual tickets from a page image
@@ -133,39 +370,20 @@ class PDFExtractionService:
             List of tuples (cropped_ticket_image, metadata_dict)
         """
         try:
-            ticket_results = []
-            
             # Detect multiple ticket boundaries on the page
             boundaries_list = self.image_utils.detect_multiple_tickets(image)
             
             logger.info(f"Page {page_number}: Detected {len(boundaries_list)} ticket(s)")
             
-            for idx, boundaries in enumerate(boundaries_list):
-                try:
-                    # Crop to detected boundaries
-                    cropped_image = self.image_utils.crop_image(image, boundaries)
-                    
-                    # Validate that cropped image has sufficient content
-                    if self.image_utils.validate_image_completeness(cropped_image):
-                        # Try to extract ticket number from the image
-                        ticket_number = self.image_utils.extract_ticket_number_from_image(cropped_image)
-                        
-                        # Create metadata for this ticket
-                        metadata = {
-                            'page_number': page_number,
-                            'ticket_index': idx,
-                            'boundaries': boundaries,
-                            'detected_ticket_number': ticket_number,
-                            'image_size': cropped_image.size
-                        }
-                        
-                        ticket_results.append((cropped_image, metadata))
-                        logger.info(f"Page {page_number}, Ticket {idx}: Successfully extracted (Number: {ticket_number or 'Unknown'})")
-                    else:
-                        logger.warning(f"Page {page_number}, Ticket {idx}: Cropped area appears to be mostly empty")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing ticket {idx} on page {page_number}: {e}")
+            # Tickets are cropped and OCR'd independently; map keeps their order
+            ticket_args = (repeat(image), repeat(page_number), range(len(boundaries_list)), boundaries_list)
+            if len(boundaries_list) <= 1 or self.max_ticket_workers <= 1:
+                cropped_tickets = list(map(self._crop_ticket, *ticket_args))
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_ticket_workers, len(boundaries_list))) as executor:
+                    cropped_tickets = list(executor.map(self._crop_ticket, *ticket_args))
+            
+            ticket_results = [result for result in cropped_tickets if result is not None]
             
             # If no tickets were successfully extracted, try the full page
             if not ticket_results and self.image_utils.validate_image_completeness(image):
@@ -185,6 +403,49 @@ class PDFExtractionService:
             logger.error(f"Error detecting tickets on page {page_number}: {e}")
             return []
     
+    def _crop_ticket(self, image: Image.Image, page_number: int, idx: int,
+                     boundaries: Tuple[int, int, int, int]) -> Optional[Tuple[Image.Image, dict]]:
+        """
+        Crop one detected ticket from a page and read its ticket number
+        
+        Args:
+            image: PIL Image of the full page
+            page_number: Page number for logging
+            idx: Index of the ticket on the page
+            boundaries: Ticket bounding box (left, top, right, bottom)
+            
+        Returns:
+            Tuple (cropped_ticket_image, metadata_dict), or None if the
+            cropped area is empty or processing fails
+        """
+        try:
+            # Crop to detected boundaries
+            cropped_image = self.image_utils.crop_image(image, boundaries)
+            
+            # Validate that cropped image has sufficient content
+            if not self.image_utils.validate_image_completeness(cropped_image):
+                logger.warning(f"Page {page_number}, Ticket {idx}: Cropped area appears to be mostly empty")
+                return None
+            
+            # Try to extract ticket number from the image
+            ticket_number = self.image_utils.extract_ticket_number_from_image(cropped_image)
+            
+            # Create metadata for this ticket
+            metadata = {
+                'page_number': page_number,
+                'ticket_index': idx,
+                'boundaries': boundaries,
+                'detected_ticket_number': ticket_number,
+                'image_size': cropped_image.size
+            }
+            
+            logger.info(f"Page {page_number}, Ticket {idx}: Successfully extracted (Number: {ticket_number or 'Unknown'})")
+            return cropped_image, metadata
+            
+        except Exception as e:
+            logger.error(f"Error processing ticket {idx} on page {page_number}: {e}")
+            return None
+    
     def enhance_image_for_processing(self, image: Image.Image) -> Image.Image:
         """
         Enhance image for better OCR and quality validation
@@ -206,12 +467,13 @@ class PDFExtractionService:
             logger.error(f"Error enhancing image: {e}")
             return image
     
-    def validate_pdf_file(self, pdf_path: Union[str, Path]) -> bool:
+    def validate_pdf_file(self, pdf_path: Union[str, Path], deep: bool = False) -> bool:
         """
         Validate that the file is a readable PDF
         
         Args:
             pdf_path: Path to the PDF file
+            deep: Also render the first page to check it can be rasterized
             
         Returns:
             True if valid PDF, False otherwise
@@ -227,20 +489,26 @@ class PDFExtractionService:
                 logger.error(f"File is not a PDF: {pdf_path}")
                 return False
             
-            # Try to convert first page to check if PDF is valid
+            # Read the page count from the metadata; only render when asked to
             try:
-                images = convert_from_path(
-                    str(pdf_path),
-                    dpi=72,  # Low DPI for quick validation
-                    fmt='PNG',
-                    first_page=1,
-                    last_page=1
-                )
-                
-                if not images:
+                if self._get_page_count(pdf_path) < 1:
                     logger.error(f"PDF contains no pages: {pdf_path}")
                     return False
                 
+                if deep:
+                    images = convert_from_path(
+                        str(pdf_path),
+                        dpi=72,  # Low DPI for quick validation
+                        fmt='ppm',
+                        grayscale=True,
+                        first_page=1,
+                        last_page=1
+                    )
+                    
+                    if not images:
+                        logger.error(f"PDF first page could not be rendered: {pdf_path}")
+                        return False
+                
                 logger.info(f"Valid PDF: {pdf_path}")
                 return True
                 
@@ -271,27 +539,17 @@ class PDFExtractionService:
                 'pages_info': []
             }
             
-            # Convert first few pages to get page info
+            # Read page count and sizes from the PDF structure, no rendering
             try:
-                # First, get page count by converting with low DPI
-                test_images = convert_from_path(
-                    str(pdf_path),
-                    dpi=72,  # Low DPI for quick info gathering
-                    fmt='PNG'
-                )
-                
-                info['page_count'] = len(test_images)
+                info['page_count'] = self._get_page_count(pdf_path)
                 
                 # Get detailed info for first 10 pages
-                for i, image in enumerate(test_images[:10]):
-                    page_info = {
-                        'page_number': i + 1,
-                        'width': image.width,
-                        'height': image.height
-                    }
-                    info['pages_info'].append(page_info)
+                try:
+                    info['pages_info'] = self._get_page_sizes(pdf_path, 10)
+                except Exception as e:
+                    logger.warning(f"Could not read page sizes: {e}")
                 
-                # pdf2image doesn't provide metadata, so we'll leave it empty
+                # Document metadata is not exposed yet, so we'll leave it empty
                 info['metadata'] = {}
                 
             except Exception as e:
@@ -329,23 +587,31 @@ class PDFExtractionService:
             
             # First get total page count to validate page numbers
             try:
-                test_images = convert_from_path(
-                    str(pdf_path),
-                    dpi=72,  # Low DPI just to get page count
-                    fmt='PNG'
-                )
-                total_pages = len(test_images)
+                total_pages = self._get_page_count(pdf_path)
             except Exception as e:
                 logger.error(f"Error getting page count: {e}")
                 return []
             
+            valid_pages = []
             for page_num in page_numbers:
+                if page_num < 1 or page_num > total_pages:
+                    logger.warning(f"Page {page_num} does not exist in PDF (total pages: {total_pages})")
+                    continue
+                valid_pages.append(page_num)
+            
+            # Render each run of consecutive pages with one pdftoppm call
+            rendered = {}
+            for _, run in groupby(enumerate(sorted(set(valid_pages))), key=lambda ix: ix[1] - ix[0]):
+                run_pages = [page_num for _, page_num in run]
                 try:
-                    if page_num < 1 or page_num > total_pages:
-                        logger.warning(f"Page {page_num} does not exist in PDF (total pages: {total_pages})")
-                        continue
-                    
-                    pil_image = self._convert_page_to_image(pdf_path, page_num)
+                    images = self._convert_page_range_to_images(pdf_path, run_pages[0], run_pages[-1])
+                    rendered.update(zip(run_pages, images))
+                except Exception as e:
+                    logger.error(f"Error extracting pages {run_pages[0]}-{run_pages[-1]}: {e}")
+            
+            for page_num in valid_pages:
+                try:
+                    pil_image = rendered.get(page_num)
                     
                     if pil_image:
                         # Apply enhancements
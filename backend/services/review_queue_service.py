@@ -3,10 +3,15 @@ from uuid import UUID
 from datetime import timedelta
 from ..utils.datetime_utils import utcnow_naive
 
+from pydantic import TypeAdapter
 from sqlmodel import Session, select, and_
 from backend.models.match_result import MatchResult, MatchResultRead
 
 
+# Built once so list reads reuse the compiled schema
+_match_result_list_adapter = TypeAdapter(List[MatchResultRead])
+
+
 class ReviewQueueService:
     """Service for managing the manual review queue for matching results"""
     
@@ -29,7 +34,7 @@ class ReviewQueueService:
         """
         query = select(MatchResult).where(
             and_(
-                not MatchResult.reviewed,
+                MatchResult.reviewed.is_(False),
                 MatchResult.confidence >= 60.0,
                 MatchResult.confidence < 85.0
             )
@@ -54,13 +59,13 @@ class ReviewQueueService:
             query = query.order_by(MatchResult.created_at.desc())
         
         results = self.session.exec(query).all()
-        return [MatchResultRead.model_validate(result) for result in results]
+        return _match_result_list_adapter.validate_python(results, from_attributes=True)
     
     def get_queue_statistics(self, batch_id: Optional[UUID] = None) -> Dict[str, Any]:
         """Get statistics about the review queue"""
         query = select(MatchResult).where(
             and_(
-                not MatchResult.reviewed,
+                MatchResult.reviewed.is_(False),
                 MatchResult.confidence >= 60.0,
                 MatchResult.confidence < 85.0
             )
@@ -130,7 +135,7 @@ class ReviewQueueService:
         active_query = select(MatchResult).where(
             and_(
                 MatchResult.reviewed_by == reviewer_id,
-                not MatchResult.reviewed
+                MatchResult.reviewed.is_(False)
             )
         )
         active_assignments = list(self.session.exec(active_query).all())
@@ -140,7 +145,7 @@ class ReviewQueueService:
         completed_query = select(MatchResult).where(
             and_(
                 MatchResult.reviewed_by == reviewer_id,
-                MatchResult.reviewed,
+                MatchResult.reviewed.is_(True),
                 MatchResult.reviewed_at >= week_ago
             )
         )
@@ -193,7 +198,7 @@ class ReviewQueueService:
         
         query = select(MatchResult).where(
             and_(
-                not MatchResult.reviewed,
+                MatchResult.reviewed.is_(False),
                 MatchResult.confidence >= 60.0,
                 MatchResult.confidence < 85.0,
                 MatchResult.created_at <= threshold_time
@@ -1,3 +1,4 @@
+import asyncio
 import aiofiles
 from pathlib import Path
 from uuid import UUID
@@ -64,6 +65,50 @@ class StorageService:
         
         return file_path
     
+    async def read_file(self, file_path: str) -> bytes | None:
+        """
+        Read a stored file's content.
+
+        Args:
+            file_path: Absolute path, or path relative to the storage base
+
+        Returns:
+            File content as bytes, or None if the file does not exist
+        """
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = self.base_path / path
+
+        try:
+            async with aiofiles.open(path, 'rb') as f:
+                return await f.read()
+        except FileNotFoundError:
+            return None
+
+    async def read_files(self, file_paths: list[str], max_concurrency: int = 64) -> dict[str, bytes | None]:
+        """
+        Read several stored files concurrently.
+
+        Args:
+            file_paths: Paths accepted by read_file
+            max_concurrency: Maximum number of reads in flight at once
+
+        Returns:
+            Mapping of each path to its content, or None if it could not be read
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def read_one(file_path: str) -> bytes | None:
+            async with semaphore:
+                try:
+                    return await self.read_file(file_path)
+                except OSError:
+                    return None
+
+        unique_paths = list(dict.fromkeys(file_paths))
+        contents = await asyncio.gather(*(read_one(path) for path in unique_paths))
+        return dict(zip(unique_paths, contents))
+
     def file_exists(self, batch_id: UUID, filename: str) -> bool:
         """Check if a file exists in the batch directory"""
         file_path = self.get_batch_directory(batch_id) / filename
@@ -145,8 +145,8 @@ class TicketImageMatcher:
         """
         pdf_images = []
         
-        # Extract pages from PDF
-        page_images = self.pdf_service.extract_pages_as_images(pdf_path)
+        # Extract pages from PDF one batch at a time
+        page_images = self.pdf_service.iter_pages_as_images(pdf_path)
         
         for page_num, page_image in page_images:
             # Detect and crop individual tickets on this page
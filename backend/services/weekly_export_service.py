@@ -287,7 +287,21 @@ class WeeklyExportService:
             )
         
         logger.info(f"Grouped tickets into {len(week_groups)} weeks")
-        return week_groups
+        return self._sort_groups(week_groups)
+    
+    @staticmethod
+    def _sort_groups(week_groups: Dict[str, WeeklyGrouping]) -> Dict[str, WeeklyGrouping]:
+        """
+        Reorder weeks, clients and references by key, once
+        
+        Dicts keep insertion order, so the invoice and manifest generators
+        can iterate the groups directly instead of sorting them on every pass.
+        """
+        for week_group in week_groups.values():
+            for client_group in week_group.client_groups.values():
+                client_group.reference_groups = dict(sorted(client_group.reference_groups.items()))
+            week_group.client_groups = dict(sorted(week_group.client_groups.items()))
+        return dict(sorted(week_groups.items()))
     
     async def log_export_operation(
         self,
@@ -38,7 +38,7 @@ class XlsParserService:
             # Detect if this is a multi-row format
             if self._is_multi_row_format(sheet):
                 logger.info("Detected multi-row ticket format, using MultiRowXlsParser")
-                return self.multi_row_parser.parse_xls_file(file_path)
+                return self.multi_row_parser.parse_xls_file(file_path, workbook=workbook)
             
             # Detect structure
             header_row = self.excel_utils.find_header_row(sheet)
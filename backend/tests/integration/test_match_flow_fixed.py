@@ -229,32 +229,12 @@ class TestMatchFlowIntegration:
         """Test batch statistics calculation"""
         batch_id = uuid4()
         
-        # Mock match results with different confidence levels
-        mock_results = []
-        
-        # High confidence (auto-accepted)
-        result1 = Mock()
-        result1.confidence = 95.0
-        result1.accepted = True
-        result1.reviewed = True
-        mock_results.append(result1)
-        
-        # Medium confidence (needs review)
-        result2 = Mock()
-        result2.confidence = 75.0
-        result2.accepted = False
-        result2.reviewed = False
-        mock_results.append(result2)
-        
-        # Low confidence (rejected)
-        result3 = Mock()
-        result3.confidence = 45.0
-        result3.accepted = False
-        result3.reviewed = True
-        mock_results.append(result3)
-        
-        # Mock get_match_results to return our test data
-        match_service.get_match_results = AsyncMock(return_value=mock_results)
+        # One auto-accepted (95%), one needing review (75%) and one
+        # rejected (45%) match, as aggregated by the database
+        mock_session.exec.return_value.one.return_value = (
+            3, 1, 1, 1, (95.0 + 75.0 + 45.0) / 3, 45.0, 95.0
+        )
+        match_service.get_match_results = AsyncMock()
         
         summary = await match_service.get_batch_match_summary(batch_id)
         
@@ -266,6 +246,9 @@ class TestMatchFlowIntegration:
         assert summary.confidence_avg == (95.0 + 75.0 + 45.0) / 3
         assert summary.confidence_min == 45.0
         assert summary.confidence_max == 95.0
+        
+        # Rows are aggregated in SQL, not loaded and counted in Python
+        match_service.get_match_results.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_review_queue_functionality(self, match_service, mock_session):
@@ -317,14 +317,14 @@ class TestPDFImageExtractionFlow:
                     
                     # Test actual validation service integration
                     with patch.object(services['validator'].image_utils, 'calculate_dpi') as mock_dpi, \
-                         patch.object(services['validator'].image_utils, 'calculate_contrast_ratio') as mock_contrast, \
+                         patch.object(services['validator'].image_utils, 'contrast_ratio_from_histogram') as mock_contrast, \
                          patch.object(services['validator'].image_utils, 'get_image_size_mb') as mock_size, \
-                         patch.object(services['validator'].image_utils, 'validate_image_completeness') as mock_complete:
+                         patch.object(services['validator'].image_utils, 'completeness_from_histogram') as mock_complete:
                         
                         mock_dpi.return_value = (300, 300)
                         mock_contrast.return_value = 85.0
                         mock_size.return_value = 2.5
-                        mock_complete.return_value = True
+                        mock_complete.return_value = 50.0
                         
                         # Mock database operations
                         services['ticket_service'].db.add.return_value = None
@@ -52,6 +52,12 @@ class TestExcelUtils:
         assert excel_utils.parse_date_value("invalid_date") is None
         assert excel_utils.parse_date_value("") is None
     
+    def test_parse_date_value_excel_serial(self, excel_utils):
+        """Test parsing Excel date numbers in both workbook date modes"""
+        assert excel_utils.parse_date_value(45761.0) == date(2025, 4, 14)
+        assert excel_utils.parse_date_value(45761.0, 1) == date(2029, 4, 15)
+        assert excel_utils.parse_date_value(-1.0) is None
+    
     @patch('xlrd.open_workbook')
     def test_open_xls_file_success(self, mock_open, excel_utils):
         """Test successful XLS file opening"""
@@ -0,0 +1,175 @@
+import json
+import pytest
+import zipfile
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+from unittest.mock import Mock
+
+from backend.services import export_bundle_service
+from backend.services.export_bundle_service import ExportBundleService
+from backend.services.storage_service import StorageService
+from backend.models.export import (
+    ExportRequest, ExportValidation,
+    WeeklyGrouping, ClientGrouping, ReferenceGrouping
+)
+
+
+class TestExportBundleService:
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        service = ExportBundleService(Mock())
+        service.storage_service = StorageService(base_path=str(tmp_path / "batches"))
+        return service
+
+    @pytest.fixture
+    def image_path(self, tmp_path):
+        images_dir = tmp_path / "batches" / "batch-1" / "images"
+        images_dir.mkdir(parents=True)
+        path = images_dir / "T4121_page_1.png"
+        path.write_bytes(b"\x89PNG\r\n\x1a\nfake image data")
+        return path
+
+    @pytest.fixture
+    def week_groups(self, image_path):
+        ref_group = ReferenceGrouping(
+            reference="#007",
+            tickets=[
+                {
+                    "ticket_number": "T4121",
+                    "entry_date": "2024-04-15",
+                    "net_weight": 8.5,
+                    "rate": 25.0,
+                    "amount": 212.50,
+                    "image_path": str(image_path),
+                    "note": ""
+                },
+                {
+                    "ticket_number": "T4122",
+                    "entry_date": "2024-04-16",
+                    "net_weight": 10.0,
+                    "rate": 25.0,
+                    "amount": 250.00,
+                    "image_path": str(image_path.parent / "missing.png"),
+                    "note": ""
+                }
+            ],
+            ticket_count=2,
+            total_tonnage=18.5,
+            subtotal=462.50
+        )
+        client_id = uuid4()
+        client_group = ClientGrouping(
+            client_id=client_id,
+            client_name="Client/007",
+            reference_groups={"#007": ref_group},
+            total_tickets=2,
+            total_tonnage=18.5,
+            total_amount=462.50,
+            rate_per_tonne=25.0
+        )
+        week_group = WeeklyGrouping(
+            week_start=date(2024, 4, 15),
+            week_end=date(2024, 4, 20),
+            client_groups={str(client_id): client_group},
+            total_tickets=2,
+            total_tonnage=18.5,
+            total_amount=462.50
+        )
+        return {"2024-04-15": week_group}
+
+    @pytest.fixture
+    def validation(self):
+        return ExportValidation(
+            is_valid=True,
+            total_tickets=2,
+            matched_images=2,
+            missing_images=0,
+            match_percentage=100.0
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_zip_bundle_structure(self, service, week_groups, validation, image_path):
+        export_request = ExportRequest(start_date=date(2024, 4, 15))
+
+        zip_path, file_size = await service._create_zip_bundle(week_groups, export_request, validation)
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            names = set(zipf.namelist())
+            assert names == {
+                "merged.csv",
+                "week_2024-04-15/manifest.csv",
+                "week_2024-04-15/client_Client_007/invoice.csv",
+                "week_2024-04-15/client_Client_007/tickets/#007/T4121.png",
+            }
+            image_arcname = "week_2024-04-15/client_Client_007/tickets/#007/T4121.png"
+            assert zipf.read(image_arcname) == image_path.read_bytes()
+            assert b"T4122" in zipf.read("merged.csv")
+
+            # PNGs are stored as-is, text entries are deflated
+            assert zipf.getinfo(image_arcname).compress_type == zipfile.ZIP_STORED
+            # Small images carry no zip64 extra field
+            assert zipf.getinfo(image_arcname).extra == b""
+            assert zipf.getinfo("merged.csv").compress_type == zipfile.ZIP_DEFLATED
+
+        assert file_size == zip_path.stat().st_size
+
+        # Nothing but the bundle itself is left behind in the export directory
+        assert [p.name for p in service.export_base_path.iterdir()] == [zip_path.name]
+
+    @pytest.mark.asyncio
+    async def test_create_zip_bundle_without_images(self, service, week_groups, validation):
+        export_request = ExportRequest(start_date=date(2024, 4, 15), include_images=False)
+
+        zip_path, file_size = await service._create_zip_bundle(week_groups, export_request, validation)
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            assert not any(name.endswith(".png") for name in zipf.namelist())
+
+    @pytest.mark.asyncio
+    async def test_create_zip_bundle_writes_audit_on_validation_errors(self, service, week_groups):
+        export_request = ExportRequest(start_date=date(2024, 4, 15), force_export=True)
+        validation = ExportValidation(
+            is_valid=False,
+            total_tickets=2,
+            matched_images=1,
+            missing_images=1,
+            match_percentage=50.0,
+            validation_errors=["1 tickets missing images"]
+        )
+
+        zip_path, file_size = await service._create_zip_bundle(week_groups, export_request, validation)
+
+        with zipfile.ZipFile(zip_path) as zipf:
+            assert "audit.json" in zipf.namelist()
+            assert b"1 tickets missing images" in zipf.read("audit.json")
+
+    def test_sanitize_filename(self, service):
+        assert service._sanitize_filename('a<b>:c"d/e\\f|g?h*') == "a_b__c_d_e_f_g_h_"
+        assert service._sanitize_filename("x" * 80) == "x" * 50
+
+    def test_json_dumps_stringifies_non_native_values(self):
+        assert export_bundle_service._json_dumps({"amount": Decimal("462.50")}) == '{"amount":"462.50"}'
+
+    def test_create_audit_log_serializes_metadata(self, service, week_groups, validation):
+        client_id = uuid4()
+        export_request = ExportRequest(start_date=date(2024, 4, 15), client_ids=[client_id])
+        validation.validation_errors = ["warning"]
+
+        audit_log = service._create_audit_log(
+            export_request=export_request,
+            user_id=uuid4(),
+            validation=validation,
+            status="success",
+            file_path="exports/bundle.zip",
+            week_groups=week_groups
+        )
+
+        metadata = json.loads(audit_log.export_metadata)
+        assert metadata["client_ids"] == [str(client_id)]
+        assert json.loads(audit_log.validation_errors) == ["warning"]
+        assert audit_log.total_tickets == 2
+        assert audit_log.total_clients == 1
+        assert audit_log.total_amount == 462.50
@@ -25,6 +25,12 @@ class TestFuzzyMatchUtils:
         # Complete difference
         assert FuzzyMatchUtils.levenshtein_distance("abc", "xyz") == 3
     
+    def test_levenshtein_distance_symmetric(self):
+        """Test Levenshtein distance does not depend on argument order"""
+        assert FuzzyMatchUtils.levenshtein_distance("sitting", "kitten") == 3
+        assert FuzzyMatchUtils.levenshtein_distance("ab", "abcde") == 3
+        assert FuzzyMatchUtils.levenshtein_distance("abcde", "ab") == 3
+    
     def test_similarity_ratio_identical(self):
         """Test similarity ratio for identical strings"""
         ratio = FuzzyMatchUtils.similarity_ratio("hello", "hello")
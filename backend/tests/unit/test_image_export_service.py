@@ -46,14 +46,26 @@ class TestImageExportService:
         assert new_path.exists()
         assert new_path.is_dir()
     
-    def test_get_batch_images_directory_creates_path(self, export_service, batch_id):
-        result = export_service._get_batch_images_directory(batch_id)
+    def test_ensure_batch_images_directory_creates_path(self, export_service, batch_id):
+        result = export_service._ensure_batch_images_directory(batch_id)
         
         expected_path = export_service.base_path / batch_id / "images"
         assert result == expected_path
         assert result.exists()
         assert result.is_dir()
     
+    def test_resolve_batch_images_directory_does_not_create(self, export_service, batch_id):
+        result = export_service._resolve_batch_images_directory(batch_id)
+        
+        assert result == export_service.base_path / batch_id / "images"
+        assert not result.exists()
+    
+    def test_read_only_lookups_do_not_create_directory(self, export_service, batch_id):
+        export_service.get_image_path(batch_id, "missing.png")
+        export_service.list_batch_images(batch_id)
+        
+        assert not (export_service.base_path / batch_id).exists()
+    
     def test_save_ticket_image_success_with_ticket_number(self, export_service, sample_image, batch_id):
         ticket_number = "TK-2024-001"
         page_number = 1
@@ -135,13 +147,16 @@ class TestImageExportService:
         result = export_service._ensure_unique_filename(test_path)
         
         assert result != test_path
-        assert result.name == "test_1.png"
+        assert result.parent == test_path.parent
+        assert result.name.startswith("test_")
+        assert result.suffix == ".png"
+        assert not result.exists()
     
     def test_get_image_path_existing_file(self, export_service, batch_id):
         filename = "test.png"
         
         # Create the expected directory structure and file
-        images_dir = export_service._get_batch_images_directory(batch_id)
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
         test_file = images_dir / filename
         test_file.touch()
         
@@ -158,7 +173,7 @@ class TestImageExportService:
         filename = "test.png"
         
         # Create the file
-        images_dir = export_service._get_batch_images_directory(batch_id)
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
         test_file = images_dir / filename
         test_file.touch()
         
@@ -177,7 +192,7 @@ class TestImageExportService:
     
     def test_list_batch_images_with_files(self, export_service, batch_id):
         # Create some test files
-        images_dir = export_service._get_batch_images_directory(batch_id)
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
         
         test_files = ["image1.png", "image2.png", "image3.png"]
         for filename in test_files:
@@ -201,7 +216,7 @@ class TestImageExportService:
     
     def test_get_batch_images_info_with_files(self, export_service, batch_id):
         # Create some test files with content
-        images_dir = export_service._get_batch_images_directory(batch_id)
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
         
         test_content = b"fake image data"
         for i in range(3):
@@ -215,9 +230,29 @@ class TestImageExportService:
         assert result['total_size_bytes'] == len(test_content) * 3
         assert result['total_size_mb'] > 0
     
+    def test_get_batch_size_summary(self, export_service, batch_id):
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
+        
+        test_content = b"fake image data"
+        for i in range(3):
+            (images_dir / f"image{i}.png").write_bytes(test_content)
+        (images_dir / "notes.txt").write_bytes(test_content)
+        
+        result = export_service.get_batch_size_summary(batch_id)
+        
+        assert result['image_count'] == 3
+        assert result['total_size_bytes'] == len(test_content) * 3
+        assert 'images' not in result
+    
+    def test_get_batch_size_summary_missing_batch(self, export_service, batch_id):
+        result = export_service.get_batch_size_summary(batch_id)
+        
+        assert result['image_count'] == 0
+        assert result['total_size_bytes'] == 0
+    
     def test_cleanup_batch_images_success(self, export_service, batch_id):
         # Create some test files
-        images_dir = export_service._get_batch_images_directory(batch_id)
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
         
         test_files = []
         for i in range(3):
@@ -241,11 +276,23 @@ class TestImageExportService:
         assert result['deleted_count'] == 0
         assert len(result['errors']) == 0
     
+    def test_cleanup_batch_images_keeps_other_files(self, export_service, batch_id):
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
+        (images_dir / "image0.png").touch()
+        other_file = images_dir / "notes.txt"
+        other_file.touch()
+        
+        result = export_service.cleanup_batch_images(batch_id)
+        
+        assert result['success'] is True
+        assert result['deleted_count'] == 1
+        assert other_file.exists()
+    
     def test_verify_image_integrity_valid(self, export_service, batch_id, sample_image):
         filename = "test.png"
         
         # Save a real image
-        images_dir = export_service._get_batch_images_directory(batch_id)
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
         image_path = images_dir / filename
         sample_image.save(image_path, format='PNG')
         
@@ -257,7 +304,7 @@ class TestImageExportService:
         filename = "invalid.png"
         
         # Create a file with invalid image data
-        images_dir = export_service._get_batch_images_directory(batch_id)
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
         image_path = images_dir / filename
         image_path.write_bytes(b"not an image")
         
@@ -265,6 +312,16 @@ class TestImageExportService:
         
         assert result is False
     
+    def test_verify_image_integrity_truncated_header(self, export_service, batch_id):
+        filename = "truncated.png"
+        
+        images_dir = export_service._ensure_batch_images_directory(batch_id)
+        (images_dir / filename).write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00")
+        
+        result = export_service.verify_image_integrity(batch_id, filename)
+        
+        assert result is False
+    
     def test_verify_image_integrity_not_found(self, export_service, batch_id):
         result = export_service.verify_image_integrity(batch_id, "nonexistent.png")
         assert result is False
@@ -284,7 +341,7 @@ class TestImageExportService:
         test_content = b"fake image data"
         
         for batch_id in batch_ids:
-            images_dir = export_service._get_batch_images_directory(batch_id)
+            images_dir = export_service._ensure_batch_images_directory(batch_id)
             for i in range(2):
                 test_file = images_dir / f"image{i}.png"
                 test_file.write_bytes(test_content)
@@ -295,7 +352,13 @@ class TestImageExportService:
         assert result['total_images'] == 4
         assert result['total_size_bytes'] == len(test_content) * 4
         assert result['total_size_mb'] > 0
-        assert len(result['batch_details']) == 2
+        assert result['batch_details'] == []
+        
+        detailed = export_service.get_export_statistics(include_details=True)
+        
+        assert detailed['total_images'] == 4
+        assert sorted(b['batch_id'] for b in detailed['batch_details']) == batch_ids
+        assert all(b['image_count'] == 2 for b in detailed['batch_details'])
     
     def test_save_multiple_images_same_batch(self, export_service, batch_id):
         images_data = [
@@ -91,6 +91,41 @@ class TestImageValidator:
         assert result['valid'] is False
         assert any('mostly blank' in error for error in result['errors'])
     
+    def test_completeness_metric(self, validator, valid_image, blank_image):
+        """Test completeness percentage is reported in metrics"""
+        valid_result = validator.validate_image(valid_image)
+        blank_result = validator.validate_image(blank_image)
+        
+        # 201x101 black rectangle on a 300x200 canvas, minus the white text
+        assert 25.0 < valid_result['metrics']['completeness_percentage'] < 34.0
+        assert blank_result['metrics']['completeness_percentage'] == 0.0
+    
+    def test_histogram_metrics_match_image_utils(self, validator, valid_image):
+        """Test the shared histogram gives the same metrics as the per-image helpers"""
+        result = validator.validate_image(valid_image)
+        utils = validator.image_utils
+        
+        assert result['metrics']['contrast_ratio'] == pytest.approx(
+            utils.calculate_contrast_ratio(valid_image)
+        )
+        assert result['metrics']['completeness_percentage'] == pytest.approx(
+            utils.compute_completeness_percentage(valid_image)
+        )
+    
+    def test_histogram_error_reported_per_check(self, validator, valid_image):
+        """Test a failed histogram is reported by the contrast and completeness checks"""
+        with patch.object(validator.image_utils, 'grayscale_histogram',
+                          side_effect=Exception("histogram failed")):
+            result = validator.validate_image(valid_image)
+        
+        assert result['valid'] is False
+        assert result['errors'] == [
+            "Error validating contrast: histogram failed",
+            "Error validating completeness: histogram failed"
+        ]
+        assert 'dpi' in result['metrics']
+        assert 'estimated_size_mb' in result['metrics']
+    
     def test_quick_validation_valid(self, validator, valid_image):
         """Test quick validation for valid image"""
         result = validator.validate_quick(valid_image)
@@ -129,6 +164,13 @@ class TestImageValidator:
         # Reset for other tests
         validator.min_dpi = original_min_dpi
     
+    def test_set_validation_thresholds_is_per_instance(self, validator):
+        """Test overriding thresholds does not change other validators"""
+        validator.set_validation_thresholds(min_dpi=300.0)
+        
+        assert validator.min_dpi == 300.0
+        assert ImageValidator().min_dpi == 150.0
+    
     def test_validate_batch_images(self, validator, valid_image, small_image):
         """Test batch validation of multiple images"""
         images = [valid_image, small_image, valid_image]
@@ -141,6 +183,17 @@ class TestImageValidator:
         assert result['success_rate'] == (2/3 * 100.0)
         assert len(result['individual_results']) == 3
     
+    def test_validate_batch_images_threaded_keeps_order(self, validator, valid_image, small_image, blank_image):
+        """Test threaded batch validation returns results in input order"""
+        images = [small_image, valid_image, blank_image, valid_image, small_image]
+        validator.max_batch_workers = 4
+        
+        result = validator.validate_batch_images(images)
+        
+        assert [r['valid'] for r in result['individual_results']] == [False, True, False, True, False]
+        assert result['valid_images'] == 2
+        assert result['invalid_images'] == 3
+    
     def test_contrast_calculation(self, validator):
         """Test contrast calculation with known values"""
         # Create high contrast image
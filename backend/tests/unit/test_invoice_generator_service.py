@@ -3,8 +3,11 @@ from datetime import date
 from uuid import uuid4
 from io import StringIO
 import csv
+from unittest.mock import patch
 
-from backend.services.invoice_generator_service import InvoiceGeneratorService
+from backend.services.invoice_generator_service import (
+    InvoiceGeneratorService, VECTORIZED_LINE_ITEM_THRESHOLD
+)
 from backend.models.export import (
     ClientInvoice, InvoiceLineItem, WeeklyManifest,
     WeeklyGrouping, ClientGrouping, ReferenceGrouping
@@ -120,6 +123,29 @@ class TestInvoiceGeneratorService:
         assert row3['reference'] == 'MM1001'
         assert row3['ticket_number'] == 'T4123'
     
+    def test_generate_merged_csv_quotes_special_characters(self, service, sample_week_groups):
+        """Test merged CSV escapes text fields like csv.writer"""
+        week_group = sample_week_groups["2024-04-15"]
+        client_group = list(week_group.client_groups.values())[0]
+        client_group.client_name = 'Client, "007"'
+        client_group.reference_groups["#007"].tickets[0]["note"] = "line one\nline two"
+        
+        csv_content = service.generate_merged_csv(sample_week_groups)
+        
+        rows = list(csv.DictReader(StringIO(csv_content)))
+        assert len(rows) == 3
+        assert rows[0]['client_name'] == 'Client, "007"'
+        assert rows[0]['note'] == "line one\nline two"
+        assert rows[2]['note'] == ''
+    
+    def test_iter_merged_csv_matches_generated_csv(self, service, sample_week_groups):
+        """Test the streamed rows join to the same content as generate_merged_csv"""
+        lines = list(service.iter_merged_csv(sample_week_groups))
+        
+        assert len(lines) == 4  # header + 3 tickets
+        assert lines[0].startswith('week_start,client_id')
+        assert "".join(lines) == service.generate_merged_csv(sample_week_groups)
+    
     def test_generate_client_invoice(self, service, sample_week_groups):
         """Test client invoice generation"""
         week_group = sample_week_groups["2024-04-15"]
@@ -154,6 +180,42 @@ class TestInvoiceGeneratorService:
         assert invoice.total_tonnage == 23.5
         assert invoice.total_amount == 587.50
     
+    @pytest.mark.parametrize("reference_count", [3, 40])
+    def test_generate_client_invoice_totals(self, service, reference_count):
+        """Test invoice totals for short (plain sum) and long (NumPy) invoices"""
+        client_group = ClientGrouping(
+            client_id=uuid4(),
+            client_name="Test Client",
+            reference_groups={
+                f"REF{i}": ReferenceGrouping(
+                    reference=f"REF{i}", tickets=[], ticket_count=1,
+                    total_tonnage=1.5 + i, subtotal=(1.5 + i) * 25.0
+                )
+                for i in range(reference_count)
+            },
+            total_tickets=reference_count,
+            total_tonnage=0.0,
+            total_amount=0.0,
+            rate_per_tonne=25.0
+        )
+        
+        with patch.object(
+            InvoiceGeneratorService, '_line_item_arrays',
+            wraps=InvoiceGeneratorService._line_item_arrays
+        ) as mock_arrays:
+            invoice = service.generate_client_invoice(
+                client_group=client_group,
+                week_start=date(2024, 4, 15),
+                week_end=date(2024, 4, 20)
+            )
+        
+        expected_tonnage = sum(1.5 + i for i in range(reference_count))
+        assert len(invoice.line_items) == reference_count
+        assert invoice.total_tonnage == pytest.approx(expected_tonnage)
+        assert invoice.total_amount == pytest.approx(expected_tonnage * 25.0)
+        assert isinstance(invoice.total_tonnage, float)
+        assert mock_arrays.called == (reference_count > VECTORIZED_LINE_ITEM_THRESHOLD)
+    
     def test_invoice_to_csv(self, service):
         """Test invoice CSV formatting"""
         invoice = ClientInvoice(
@@ -209,12 +271,13 @@ class TestInvoiceGeneratorService:
         # Check client summary
         assert len(manifest.client_summaries) == 1
         summary = manifest.client_summaries[0]
-        assert summary['client_name'] == 'Client 007'
-        assert summary['ticket_count'] == 3
-        assert summary['total_weight'] == 23.5
-        assert summary['rate'] == 25.0
-        assert summary['total_amount'] == 587.50
-        assert summary['reference_count'] == 2
+        assert summary.client_id == list(week_group.client_groups.values())[0].client_id
+        assert summary.client_name == 'Client 007'
+        assert summary.ticket_count == 3
+        assert summary.total_weight == 23.5
+        assert summary.rate == 25.0
+        assert summary.total_amount == 587.50
+        assert summary.reference_count == 2
     
     def test_manifest_to_csv(self, service):
         """Test manifest CSV formatting"""
@@ -332,6 +395,40 @@ class TestInvoiceGeneratorService:
         assert "Amount mismatch" in errors[1]
         assert "Line item calculation error" in errors[2]
     
+    @pytest.mark.parametrize("line_item_count", [3, 40])
+    def test_validate_invoice_totals_reports_only_wrong_line_items(self, service, line_item_count):
+        """Test only the miscalculated line items are reported"""
+        client_group = ClientGrouping(
+            client_id=uuid4(),
+            client_name="Test Client",
+            reference_groups={},
+            total_tickets=line_item_count,
+            total_tonnage=10.0 * line_item_count,
+            total_amount=250.0 * line_item_count + 10.0,
+            rate_per_tonne=25.0
+        )
+        line_items = [
+            InvoiceLineItem(
+                reference=f"REF{i}", ticket_count=1, total_weight=10.0, rate=25.0,
+                amount=260.0 if i == 1 else 250.0
+            )
+            for i in range(line_item_count)
+        ]
+        invoice = ClientInvoice(
+            client_id=client_group.client_id,
+            client_name=client_group.client_name,
+            week_start=date(2024, 4, 15),
+            week_end=date(2024, 4, 20),
+            line_items=line_items,
+            total_tonnage=client_group.total_tonnage,
+            total_amount=client_group.total_amount
+        )
+        
+        errors = service.validate_invoice_totals(invoice, client_group)
+        assert errors == [
+            "Line item calculation error for REF1: amount=$260.00, expected=$250.00"
+        ]
+    
     def test_rounding_precision(self, service):
         """Test that financial values are properly rounded"""
         # Test InvoiceLineItem rounding
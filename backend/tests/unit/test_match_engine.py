@@ -1,10 +1,13 @@
+import numpy as np
+import pytest
 from datetime import datetime, date
 from uuid import uuid4
 from unittest.mock import Mock
 
 from backend.services.match_engine import (
-    TicketMatchEngine, MatchScore, MatchCandidate
+    TicketMatchEngine, MatchScore, MatchCandidate, MatchFeatures, ticket_number_similarity
 )
+from backend.services import match_engine
 from backend.models.ticket import TicketRead
 from backend.models.ticket_image import TicketImageRead
 
@@ -42,6 +45,26 @@ class TestMatchScore:
         assert len(score.breakdown) == 2
         assert len(score.reasons) == 2
     
+    def test_add_reason(self):
+        """Test reasons not tied to a scoring rule"""
+        score = MatchScore()
+        score.add_score("rule1", 10.0, 20.0, "Detail 1")
+        score.add_score("rule2", 0.0, 20.0)
+        score.add_reason("Won conflict resolution")
+        
+        assert score.reasons == ["rule1: Detail 1", "Won conflict resolution"]
+        assert set(score.breakdown) == {"rule1", "rule2"}
+        assert score.to_dict()["reasons"] == score.reasons
+    
+    def test_static_reasons_are_shared(self):
+        """Test that fixed reasons reuse one string across scores"""
+        first, second = MatchScore(), MatchScore()
+        for score in (first, second):
+            score.add_score("weight_match", 1.0, 2.0, "Weight only available in ticket")
+        
+        assert first.reasons == ["weight_match: Weight only available in ticket"]
+        assert first.reasons[0] is second.reasons[0]
+    
     def test_calculate_confidence(self):
         """Test confidence calculation"""
         score = MatchScore()
@@ -149,6 +172,36 @@ class TestMatchCandidate:
         assert candidate.should_reject() is True
 
 
+class TestMatchFeatures:
+    """Test suite for MatchFeatures class"""
+    
+    def test_from_images_marks_missing_values(self):
+        """Test that missing dates and weights become NaN"""
+        image = Mock(spec=TicketImageRead)
+        image.ticket_number = "ABC123"
+        image.created_at = None
+        
+        features = MatchFeatures.from_images([image])
+        
+        assert len(features) == 1
+        assert features.ticket_numbers == ["ABC123"]
+        assert features.references == [""]
+        assert np.isnan(features.days[0])
+        assert np.isnan(features.weights[0])
+    
+    def test_from_tickets(self):
+        """Test extracting ticket fields"""
+        ticket = Mock(spec=TicketRead)
+        ticket.ticket_number = "ABC123"
+        ticket.entry_date = date(2023, 1, 15)
+        ticket.net_weight = 10.5
+        
+        features = MatchFeatures.from_tickets([ticket])
+        
+        assert features.days[0] == date(2023, 1, 15).toordinal()
+        assert features.weights[0] == 10.5
+
+
 class TestTicketMatchEngine:
     """Test suite for TicketMatchEngine class"""
     
@@ -186,6 +239,19 @@ class TestTicketMatchEngine:
         candidate = candidates[0]
         assert candidate.confidence >= 85.0  # Should be high confidence
     
+    def test_identical_ticket_numbers_skip_fuzzy_match(self, monkeypatch):
+        """Test that identical ticket numbers score full points without fuzzy matching"""
+        monkeypatch.setattr(
+            match_engine.FuzzyMatchUtils, "fuzzy_ticket_match",
+            Mock(side_effect=AssertionError("fuzzy match should not run"))
+        )
+        
+        score = self.engine._calculate_match_score(self.ticket, self.image)
+        
+        assert score.breakdown["ticket_number"]["points"] == self.engine.scoring_rules["ticket_number_exact"]
+        assert score.breakdown["ticket_number"]["details"] == "Exact match: ABC123 = ABC123"
+        assert ticket_number_similarity("ABC123", "ABC123") == 1.0
+    
     def test_ticket_number_mismatch_scoring(self):
         """Test scoring when ticket numbers don't match"""
         self.image.ticket_number = "XYZ789"
@@ -283,6 +349,26 @@ class TestTicketMatchEngine:
         assert len(batch_matches[self.ticket.id]) >= 1
         assert len(batch_matches[ticket2.id]) >= 1
     
+    def test_batch_matching_in_blocks(self):
+        """Test that block size does not change batch results"""
+        tickets = []
+        for number in ["ABC123", "ABC124", "XYZ789"]:
+            ticket = Mock(spec=TicketRead)
+            ticket.id = uuid4()
+            ticket.ticket_number = number
+            ticket.entry_date = date(2023, 1, 15)
+            ticket.net_weight = 10.5
+            tickets.append(ticket)
+        
+        expected = self.engine.find_matches_for_batch(tickets, [self.image])
+        
+        self.engine.ticket_block_size = 2
+        blocked = self.engine.find_matches_for_batch(iter(tickets), [self.image])
+        
+        assert list(blocked) == [ticket.id for ticket in tickets]
+        for ticket_id, candidates in expected.items():
+            assert [c.confidence for c in blocked[ticket_id]] == [c.confidence for c in candidates]
+    
     def test_conflict_resolution_single_winner(self):
         """Test conflict resolution when multiple tickets match same image"""
         # Create second ticket that also matches the same image
@@ -310,6 +396,40 @@ class TestTicketMatchEngine:
         assert len(ticket1_matches) >= 1
         assert len(ticket2_matches) >= 1
     
+    def test_conflict_resolution_picks_best_claimant(self):
+        """Test that the highest claim wins and ties go to the earliest claim"""
+        def claim(ticket_id, confidence):
+            score = MatchScore()
+            score.confidence = confidence
+            ticket = Mock(spec=TicketRead)
+            ticket.id = ticket_id
+            return MatchCandidate(ticket, self.image, score)
+        
+        first, second, third = uuid4(), uuid4(), uuid4()
+        batch_matches = {
+            first: [claim(first, 90.0)],
+            second: [claim(second, 95.0)],
+            third: [claim(third, 95.0)],
+        }
+        
+        resolved = self.engine.resolve_conflicts(batch_matches)
+        
+        assert resolved[second][0].confidence == 95.0
+        assert "Won conflict resolution" in resolved[second][0].score.reasons
+        assert resolved[first][0].confidence == 45.0
+        assert resolved[third][0].confidence == 47.5
+        assert "Lost conflict resolution - needs manual review" in resolved[third][0].score.reasons
+    
+    def test_conflict_resolution_without_conflicts(self):
+        """Test that uncontested candidates pass through untouched"""
+        batch_matches = self.engine.find_matches_for_batch([self.ticket], [self.image])
+        
+        resolved = self.engine.resolve_conflicts(batch_matches)
+        
+        assert resolved == batch_matches
+        assert resolved[self.ticket.id] is not batch_matches[self.ticket.id]
+        assert not any("conflict" in reason for reason in resolved[self.ticket.id][0].score.reasons)
+    
     def test_batch_statistics(self):
         """Test calculation of batch statistics"""
         # Create tickets with different match qualities
@@ -341,6 +461,34 @@ class TestTicketMatchEngine:
         assert stats["total_tickets"] == 2
         assert isinstance(stats["average_confidence"], float)
     
+    def test_batch_statistics_buckets(self):
+        """Test distribution, conflict and average calculation"""
+        def candidates(*confidences):
+            result = []
+            for confidence in confidences:
+                score = MatchScore()
+                score.confidence = confidence
+                result.append(MatchCandidate(self.ticket, self.image, score))
+            return result
+        
+        batch_matches = {
+            uuid4(): candidates(97.0, 62.0),
+            uuid4(): candidates(85.0),
+            uuid4(): candidates(60.0, 59.9),
+            uuid4(): candidates(30.0),
+            uuid4(): [],
+        }
+        
+        stats = self.engine.get_batch_statistics(batch_matches)
+        
+        assert stats["match_distribution"] == {"excellent": 1, "good": 1, "fair": 1, "poor": 1}
+        assert stats["auto_accepted"] == 2
+        assert stats["needs_review"] == 1
+        assert stats["unmatched"] == 2
+        assert stats["conflicts"] == 1
+        assert stats["average_confidence"] == pytest.approx((97.0 + 85.0 + 60.0 + 30.0) / 5)
+        assert isinstance(stats["unmatched"], int)
+    
     def test_empty_batch_statistics(self):
         """Test statistics calculation for empty batch"""
         stats = self.engine.get_batch_statistics({})
@@ -413,4 +561,72 @@ class TestTicketMatchEngine:
         
         candidate = candidates[0]
         # Should still match on ticket number
-        assert candidate.confidence > 0
\ No newline at end of file
+        assert candidate.confidence > 0    
+    def test_score_matrix_matches_pairwise_scoring(self):
+        """Test that the vectorized score matrix agrees with per-pair scoring"""
+        ticket2 = Mock(spec=TicketRead)
+        ticket2.id = uuid4()
+        ticket2.ticket_number = "ABC124"
+        ticket2.entry_date = None
+        ticket2.net_weight = 0.0
+        
+        image2 = Mock(spec=TicketImageRead)
+        image2.id = uuid4()
+        image2.ticket_number = None
+        image2.created_at = datetime(2023, 1, 18, 8, 0)
+        
+        image3 = Mock(spec=TicketImageRead)
+        image3.id = uuid4()
+        image3.ticket_number = "ABC12O"
+        image3.created_at = datetime(2023, 1, 16, 8, 0)
+        image3.extracted_weight = 10.8
+        
+        tickets = [self.ticket, ticket2]
+        images = [self.image, image2, image3]
+        
+        matrix = self.engine._score_matrix(MatchFeatures.from_tickets(tickets), MatchFeatures.from_images(images))
+        
+        assert matrix.shape == (2, 3)
+        for row, ticket in enumerate(tickets):
+            for col, image in enumerate(images):
+                score = self.engine._calculate_match_score(ticket, image)
+                assert matrix[row, col] == pytest.approx(score.calculate_confidence())
+    
+    def test_score_matrix_empty(self):
+        """Test the score matrix for a batch without images"""
+        matrix = self.engine._score_matrix(MatchFeatures.from_tickets([self.ticket]), MatchFeatures.from_images([]))
+        
+        assert matrix.shape == (1, 0)
+    
+    def test_ticket_number_similarity_is_cached(self):
+        """Test that equivalent ticket number pairs share one cache entry"""
+        match_engine._ticket_number_similarity.cache_clear()
+        
+        assert ticket_number_similarity("ABC-123", "abc12O") == ticket_number_similarity(" ABC123", "ABC12O")
+        
+        info = match_engine._ticket_number_similarity.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+    
+    def test_batch_matching_skips_fuzzy_match_for_length_mismatch(self, monkeypatch):
+        """Test that pairs ruled out by length are not fuzzy matched"""
+        short_image = Mock(spec=TicketImageRead)
+        short_image.id = uuid4()
+        short_image.ticket_number = "A1"
+        short_image.created_at = datetime(2023, 1, 15, 10, 30)
+        self.ticket.ticket_number = "A1234567890"
+        
+        compared = []
+        real_similarity = match_engine.ticket_number_similarity
+        monkeypatch.setattr(
+            match_engine, "ticket_number_similarity",
+            lambda a, b: compared.append((a, b)) or real_similarity(a, b)
+        )
+        
+        matrix = self.engine._score_matrix(
+            MatchFeatures.from_tickets([self.ticket]), MatchFeatures.from_images([short_image])
+        )
+        
+        assert compared == []
+        assert matrix[0, 0] < 20.0
+        assert self.engine.find_matches_for_batch([self.ticket], [short_image])[self.ticket.id] == []
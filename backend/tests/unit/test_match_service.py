@@ -0,0 +1,137 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import inspect
+from sqlmodel import SQLModel, create_engine
+
+from backend.models.match_result import MatchResult, BulkMatchDecision
+from backend.routers.match_router import bulk_match_decision
+from backend.services.match_service import MatchService
+
+
+class TestMatchResultTable:
+
+    @pytest.fixture
+    def engine(self):
+        engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(engine, tables=[MatchResult.__table__])
+        yield engine
+        engine.dispose()
+
+    def test_create_all_builds_partial_review_index(self, engine):
+        """Test that databases built from the models get the review queue index"""
+        indexes = {index["name"]: index for index in inspect(engine).get_indexes("match_results")}
+
+        assert "ix_match_results_review" in indexes
+
+        with engine.connect() as conn:
+            index_sql = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE name = 'ix_match_results_review'"
+            ).scalar_one()
+        assert "(confidence DESC, created_at)" in index_sql
+        assert "WHERE reviewed = false AND confidence >= 60 AND confidence < 85" in index_sql
+
+
+class TestBulkDecideMatches:
+
+    @pytest.fixture
+    def match_results(self):
+        return [
+            MatchResult(id=uuid4(), ticket_id=uuid4(), image_id=uuid4(), confidence=confidence)
+            for confidence in (72.0, 64.0)
+        ]
+
+    @pytest.fixture
+    def tickets(self, match_results):
+        tickets = []
+        for match_result in match_results:
+            ticket = Mock()
+            ticket.id = match_result.ticket_id
+            ticket.image_id = None
+            tickets.append(ticket)
+        return tickets
+
+    @pytest.fixture
+    def session(self, match_results, tickets):
+        """Session whose first query returns the match results and the second the tickets"""
+        session = Mock()
+        session.exec.side_effect = [
+            Mock(all=Mock(return_value=match_results)),
+            Mock(all=Mock(return_value=tickets)),
+        ]
+        return session
+
+    @pytest.fixture
+    def match_service(self, session):
+        service = MatchService(session)
+        service.audit_service.log_event = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_accept_links_tickets_to_images(self, match_service, match_results, tickets, session):
+        user_id = uuid4()
+        decision = BulkMatchDecision(match_ids=[m.id for m in match_results], accepted=True, reason="checked")
+
+        results = await match_service.bulk_decide_matches(user_id, decision)
+
+        assert [r.id for r in results] == [m.id for m in match_results]
+        assert all(r.accepted and r.reviewed and r.reviewed_by == user_id for r in results)
+        assert all(r.reason == "checked" for r in results)
+        assert [t.image_id for t in tickets] == [m.image_id for m in match_results]
+        match_service.audit_service.log_event.assert_awaited_once()
+        assert match_service.audit_service.log_event.call_args.kwargs["details"] == "Bulk accepted 2 matches"
+        session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_reject_does_not_link_tickets(self, match_service, match_results, tickets, session):
+        decision = BulkMatchDecision(match_ids=[m.id for m in match_results], accepted=False)
+
+        results = await match_service.bulk_decide_matches(uuid4(), decision)
+
+        assert all(r.reviewed and not r.accepted for r in results)
+        assert all(t.image_id is None for t in tickets)
+        # Only the match results were queried
+        assert session.exec.call_count == 1
+        assert match_service.audit_service.log_event.call_args.kwargs["details"] == "Bulk rejected 2 matches"
+
+    @pytest.mark.asyncio
+    async def test_duplicate_ids_are_decided_once(self, match_service, match_results, session):
+        match_id = match_results[0].id
+        session.exec.side_effect = [Mock(all=Mock(return_value=match_results[:1]))]
+        decision = BulkMatchDecision(match_ids=[match_id, match_id], accepted=False)
+
+        results = await match_service.bulk_decide_matches(uuid4(), decision)
+
+        assert [r.id for r in results] == [match_id]
+        assert match_service.audit_service.log_event.call_args.kwargs["details"] == "Bulk rejected 1 matches"
+
+    @pytest.mark.asyncio
+    async def test_unknown_id_raises_and_commits_nothing(self, match_service, match_results, session):
+        unknown_id = uuid4()
+        session.exec.side_effect = [Mock(all=Mock(return_value=match_results))]
+        decision = BulkMatchDecision(match_ids=[m.id for m in match_results] + [unknown_id], accepted=True)
+
+        with pytest.raises(ValueError, match=str(unknown_id)):
+            await match_service.bulk_decide_matches(uuid4(), decision)
+
+        session.commit.assert_not_called()
+        match_service.audit_service.log_event.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_router_returns_404_for_unknown_id(self, match_service, session):
+        session.exec.side_effect = [Mock(all=Mock(return_value=[]))]
+        decision = BulkMatchDecision(match_ids=[uuid4()], accepted=True)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await bulk_match_decision(decision, current_user=Mock(id=uuid4()), match_service=match_service)
+
+        assert exc_info.value.status_code == 404
+
+    def test_match_ids_must_be_non_empty_and_bounded(self):
+        with pytest.raises(ValidationError):
+            BulkMatchDecision(match_ids=[], accepted=True)
+        with pytest.raises(ValidationError):
+            BulkMatchDecision(match_ids=[uuid4() for _ in range(501)], accepted=True)
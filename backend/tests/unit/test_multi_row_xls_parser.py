@@ -0,0 +1,132 @@
+import pytest
+import xlwt
+from datetime import date
+
+from backend.services.multi_row_xls_parser import MultiRowXlsParser
+
+
+def _write_ticket(sheet, row, ticket_number, status, reference, weights):
+    """Write one ticket in the APRIL 14 2025 multi-row layout, returning the next free row"""
+    gross, tare, net = weights
+    sheet.write(row, 0, 'TICKET #')
+    sheet.write(row, 1, ticket_number)
+    sheet.write(row, 4, status)
+    sheet.write(row + 1, 0, 'ATTENDANT:')
+    sheet.write(row + 1, 1, ' Jane ')
+    sheet.write(row + 1, 3, 'CONST. & DEMO.')
+    sheet.write(row + 2, 0, 'VEHICLE:')
+    sheet.write(row + 2, 1, 'TRUCK 12')
+    sheet.write(row + 2, 2, 'LICENSE:')
+    sheet.write(row + 2, 3, 'ABC123')
+    sheet.write(row + 3, 0, 'REFERENCE:')
+    sheet.write(row + 3, 1, reference)
+    sheet.write(row + 4, 0, 'ENTER:')
+    sheet.write(row + 4, 1, 45761.0)
+    sheet.write(row + 4, 2, '08:30')
+    sheet.write(row + 4, 3, 'EXIT:')
+    sheet.write(row + 4, 4, 45761.0)
+    sheet.write(row + 4, 5, '08:45')
+    sheet.write(row + 5, 0, 'GROSS')
+    sheet.write(row + 5, 1, gross)
+    sheet.write(row + 5, 2, 'TARE')
+    sheet.write(row + 5, 3, tare)
+    sheet.write(row + 5, 4, 'NET')
+    sheet.write(row + 5, 5, net)
+    return row + 7
+
+
+class TestMultiRowXlsParser:
+
+    @pytest.fixture
+    def xls_path(self, tmp_path):
+        workbook = xlwt.Workbook()
+        sheet = workbook.add_sheet('Sheet1')
+        row = _write_ticket(sheet, 0, 4121.0, 'REPRINT', '#007', (25000, 10000, 15000))
+        row = _write_ticket(sheet, row, 4122.0, 'VOID - REPRINT', '#008', (1000, 500, 500))
+        _write_ticket(sheet, row, 'T4123', '', 'MM1001', (30000, 12000, 18000))
+        path = tmp_path / "tickets.xls"
+        workbook.save(str(path))
+        return path
+
+    def test_parse_xls_file(self, xls_path):
+        """Test extracting tickets from the multi-row layout"""
+        tickets, errors = MultiRowXlsParser().parse_xls_file(xls_path)
+
+        assert errors == []
+        # The VOID ticket is skipped
+        assert [t.ticket_number for t in tickets] == ["4121", "T4123"]
+
+        first = tickets[0]
+        assert first.status == "REPRINT"
+        assert first.reference == "#007"
+        assert first.attendant == "Jane"
+        assert first.vehicle == "TRUCK 12"
+        assert first.license == "ABC123"
+        assert first.material == "CONST. & DEMO."
+        assert first.entry_date == date(2025, 4, 14)
+        assert first.exit_date == date(2025, 4, 14)
+        assert first.entry_time == "08:30"
+        assert first.exit_time == "08:45"
+        assert (first.gross_weight, first.tare_weight, first.net_weight) == (25.0, 10.0, 15.0)
+        assert first.row_number == 1
+
+        assert tickets[1].reference == "MM1001"
+        assert tickets[1].net_weight == 18.0
+        assert tickets[1].row_number == 15
+
+    def test_parse_xls_file_without_tickets(self, tmp_path):
+        """Test a sheet with no TICKET # rows"""
+        workbook = xlwt.Workbook()
+        workbook.add_sheet('Sheet1').write(0, 0, 'SUMMARY')
+        path = tmp_path / "empty.xls"
+        workbook.save(str(path))
+
+        assert MultiRowXlsParser().parse_xls_file(path) == ([], [])
+
+    def test_label_lookup_is_case_insensitive_and_skips_bad_weights(self, tmp_path):
+        """Test label matching ignores case and falls through unreadable weights"""
+        workbook = xlwt.Workbook()
+        sheet = workbook.add_sheet('Sheet1')
+        sheet.write(0, 0, 'Ticket #')
+        sheet.write(0, 1, 'T1')
+        sheet.write(1, 0, ' vehicle: ')
+        sheet.write(1, 1, 'TRUCK 7')
+        sheet.write(2, 0, 'NET')
+        sheet.write(2, 1, 'N/A')
+        sheet.write(3, 0, 'net')
+        sheet.write(3, 1, 4200)
+        path = tmp_path / "labels.xls"
+        workbook.save(str(path))
+
+        tickets, errors = MultiRowXlsParser().parse_xls_file(path)
+
+        assert errors == []
+        assert tickets[0].vehicle == "TRUCK 7"
+        assert tickets[0].net_weight == 4.2
+        assert tickets[0].material == "CONST. & DEMO."
+
+    def test_parse_xls_file_reuses_open_workbook(self, xls_path, monkeypatch):
+        """Test that a workbook opened by the caller is not read again"""
+        parser = MultiRowXlsParser()
+        workbook = parser.excel_utils.open_xls_file(xls_path)
+
+        def fail_open(file_path):
+            raise AssertionError("workbook was opened twice")
+
+        monkeypatch.setattr(parser.excel_utils, "open_xls_file", fail_open)
+        tickets, errors = parser.parse_xls_file(xls_path, workbook=workbook)
+
+        assert errors == []
+        assert [t.ticket_number for t in tickets] == ["4121", "T4123"]
+
+    def test_iter_tickets_yields_in_sheet_order(self, xls_path):
+        """Test that tickets are yielded one by one, skipping VOID tickets"""
+        items = MultiRowXlsParser().iter_tickets(xls_path)
+
+        assert next(items).ticket_number == "4121"
+        assert [item.ticket_number for item in items] == ["T4123"]
+
+    def test_iter_tickets_raises_file_errors(self, tmp_path):
+        """Test that unreadable files raise instead of yielding an error entry"""
+        with pytest.raises(ValueError, match="Cannot open XLS file"):
+            list(MultiRowXlsParser().iter_tickets(tmp_path / "missing.xls"))
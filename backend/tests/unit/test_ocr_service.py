@@ -1,8 +1,10 @@
 import pytest
 import re
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 from PIL import Image
 
+from backend.services import ocr_service as ocr_module
 from backend.services.ocr_service import OCRService
 
 
@@ -124,6 +126,15 @@ class TestOCRService:
         assert ticket_number is not None
         assert confidence > 0
     
+    def test_find_best_ticket_number_picks_ticket_token(self, ocr_service):
+        texts = ['Ticket', 'No.', 't4121', 'Net', '12.5']
+        confidences = [90.0, 90.0, 75.0, 90.0, 90.0]
+        
+        ticket_number, confidence = ocr_service._find_best_ticket_number(texts, confidences)
+        
+        assert ticket_number == 'T4121'
+        assert confidence == 95.0
+    
     def test_find_best_ticket_number_no_valid_patterns(self, ocr_service):
         texts = ['Event', 'Details', 'Location']
         confidences = [90.0, 95.0, 88.0]
@@ -185,15 +196,50 @@ class TestOCRService:
     @patch('backend.services.ocr_service.pytesseract.image_to_string')
     @patch('backend.services.ocr_service.pytesseract.image_to_data')
     def test_extract_all_text_success(self, mock_data, mock_string, ocr_service, sample_image):
-        mock_string.return_value = "TK-2024-001 Event Details"
         mock_data.return_value = {
-            'conf': [95, 90, 85, 80, 75]
+            'text': ['', 'TK-2024-001', 'Event', 'Details', ' ', 'Net'],
+            'conf': [-1, 95, 90, 85, -1, 75],
+            'block_num': [1, 1, 1, 1, 1, 1],
+            'par_num': [1, 1, 1, 1, 1, 1],
+            'line_num': [0, 1, 1, 1, 2, 2]
         }
         
         text, confidence = ocr_service.extract_all_text(sample_image)
         
-        assert text == "TK-2024-001 Event Details"
-        assert confidence > 0
+        assert text == "TK-2024-001 Event Details\nNet"
+        assert confidence == 86.25
+        # Recognition runs once; the text is rebuilt from the word data
+        mock_data.assert_called_once()
+        mock_string.assert_not_called()
+    
+    def test_extract_ticket_number_with_tesserocr(self, ocr_service, sample_image, monkeypatch):
+        words = [('Ticket', 90.0), ('', 50.0), ('T4121', 80.0), ('noise', -1.0)]
+        api = Mock()
+        api.GetIterator.return_value = iter(
+            Mock(**{'GetUTF8Text.return_value': text, 'Confidence.return_value': conf})
+            for text, conf in words
+        )
+        fake_tesserocr = SimpleNamespace(
+            PyTessBaseAPI=Mock(return_value=api),
+            PSM=SimpleNamespace(SINGLE_BLOCK=6),
+            RIL=SimpleNamespace(WORD=3),
+            iterate_level=lambda iterator, level: iterator
+        )
+        monkeypatch.setattr(ocr_module, 'TESSEROCR_AVAILABLE', True)
+        monkeypatch.setattr(ocr_module, 'tesserocr', fake_tesserocr)
+        
+        with patch('backend.services.ocr_service.pytesseract.image_to_data') as mock_data:
+            ticket_number, confidence = ocr_service.extract_ticket_number(sample_image)
+        
+        assert ticket_number == 'T4121'
+        assert confidence == 100.0
+        mock_data.assert_not_called()
+        api.SetImage.assert_called_once_with(sample_image)
+        
+        # The API handle is created once and reused
+        api.GetIterator.return_value = iter([])
+        assert ocr_service.extract_ticket_number(sample_image) == (None, 0.0)
+        fake_tesserocr.PyTessBaseAPI.assert_called_once_with(psm=6)
     
     def test_is_ocr_available(self, ocr_service):
         result = ocr_service.is_ocr_available()
@@ -233,6 +279,16 @@ class TestOCRService:
         assert ticket_number is None  # Fallback doesn't extract text
         assert confidence > 0  # But should have positive confidence
     
+    def test_fallback_confidence_from_image_statistics(self, ocr_service):
+        # Half black: strong contrast and plenty of content
+        image = Image.new('RGB', (400, 200), color='white')
+        image.paste((0, 0, 0), (0, 0, 200, 200))
+        assert ocr_service._fallback_ticket_extraction(image) == (None, 70.0)
+        
+        # Blank page: size points only
+        blank = Image.new('L', (400, 200), color=255)
+        assert ocr_service._fallback_ticket_extraction(blank) == (None, 20.0)
+    
     @patch('backend.services.ocr_service.pytesseract.image_to_data')
     def test_extract_ticket_number_empty_ocr_result(self, mock_tesseract, ocr_service, sample_image):
         mock_tesseract.return_value = {
@@ -5,10 +5,26 @@ from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 from PIL import Image
 import io
+import PyPDF2
 
 from backend.services.pdf_extraction_service import PDFExtractionService
 
 
+def _render_to_folder(pages, rendered_paths=None):
+    """Fake convert_from_path(paths_only=True) writing pages[n - 1] for page n"""
+    def render(path, first_page, last_page, output_folder, paths_only, **kwargs):
+        assert paths_only
+        paths = []
+        for page in range(first_page, last_page + 1):
+            page_path = os.path.join(output_folder, f"page-{page:04d}.png")
+            pages[page - 1].save(page_path)
+            paths.append(page_path)
+        if rendered_paths is not None:
+            rendered_paths.extend(paths)
+        return paths
+    return render
+
+
 class TestPDFExtractionService:
     
     @pytest.fixture
@@ -49,18 +65,60 @@ class TestPDFExtractionService:
         assert pdf_service.default_dpi == 300
         assert pdf_service.min_page_width == 100
         assert pdf_service.min_page_height == 100
+        assert pdf_service.thread_count >= 1
+        assert pdf_service.max_enhance_workers >= 1
+        assert pdf_service.max_ticket_workers >= 1
         assert hasattr(pdf_service, 'image_utils')
     
-    def test_validate_pdf_file_valid(self, pdf_service, temp_pdf_file):
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 1})
+    def test_validate_pdf_file_valid(self, mock_pdfinfo, pdf_service, temp_pdf_file):
         with patch('backend.services.pdf_extraction_service.convert_from_path') as mock_convert:
-            # Mock a successful image conversion
-            mock_image = Mock()
-            mock_convert.return_value = [mock_image]
-            
             result = pdf_service.validate_pdf_file(temp_pdf_file)
             
             assert result is True
-            mock_convert.assert_called_once()
+            mock_pdfinfo.assert_called_once_with(str(temp_pdf_file))
+            # Metadata is enough, no page is rendered
+            mock_convert.assert_not_called()
+    
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 1})
+    def test_validate_pdf_file_deep_renders_first_page(self, mock_pdfinfo, pdf_service, temp_pdf_file):
+        with patch('backend.services.pdf_extraction_service.convert_from_path') as mock_convert:
+            mock_convert.return_value = []
+            
+            result = pdf_service.validate_pdf_file(temp_pdf_file, deep=True)
+            
+            assert result is False
+            assert mock_convert.call_args.kwargs['last_page'] == 1
+    
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path')
+    def test_pdfinfo_cached_until_file_changes(self, mock_pdfinfo, pdf_service, temp_pdf_file):
+        mock_pdfinfo.return_value = {'Pages': 3}
+        
+        assert pdf_service.validate_pdf_file(temp_pdf_file) is True
+        assert pdf_service.get_pdf_info(temp_pdf_file)['page_count'] == 3
+        assert mock_pdfinfo.call_count == 1
+        
+        with open(temp_pdf_file, 'ab') as pdf_file:
+            pdf_file.write(b'\n')
+        mock_pdfinfo.return_value = {'Pages': 4}
+        
+        assert pdf_service.get_pdf_info(temp_pdf_file)['page_count'] == 4
+        assert mock_pdfinfo.call_count == 2
+    
+    @pytest.mark.parametrize("page_size, expected_dpi", [
+        ('612 x 792 pts (letter)', 300),
+        ('841.89 x 1190.55 pts (A3)', 218),
+        ('2384 x 3370 pts (A0)', 150),
+        ('', 300),
+    ])
+    def test_render_dpi_follows_page_width(self, pdf_service, temp_pdf_file, page_size, expected_dpi):
+        with patch('backend.services.pdf_extraction_service.pdfinfo_from_path') as mock_pdfinfo:
+            mock_pdfinfo.return_value = {'Pages': 1, 'Page size': page_size}
+            
+            assert pdf_service._get_render_dpi(temp_pdf_file) == expected_dpi
+    
+    def test_render_dpi_defaults_when_pdfinfo_fails(self, pdf_service):
+        assert pdf_service._get_render_dpi("/nonexistent/file.pdf") == pdf_service.default_dpi
     
     def test_validate_pdf_file_not_exists(self, pdf_service):
         result = pdf_service.validate_pdf_file("/nonexistent/file.pdf")
@@ -77,15 +135,15 @@ class TestPDFExtractionService:
             os.unlink(temp_path)
     
     def test_validate_pdf_file_no_pages(self, pdf_service, temp_pdf_file):
-        with patch('backend.services.pdf_extraction_service.convert_from_path') as mock_convert:
-            # Mock empty image list (no pages)
-            mock_convert.return_value = []
+        with patch('backend.services.pdf_extraction_service.pdfinfo_from_path') as mock_pdfinfo:
+            mock_pdfinfo.return_value = {'Pages': 0}
             
             result = pdf_service.validate_pdf_file(temp_pdf_file)
             
             assert result is False
     
-    def test_extract_pages_as_images_success(self, pdf_service):
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 2})
+    def test_extract_pages_as_images_success(self, mock_pdfinfo, pdf_service):
         with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
             temp_path = temp_file.name
             # Write minimal PDF content
@@ -97,7 +155,7 @@ class TestPDFExtractionService:
             mock_image2 = Image.new('RGB', (800, 600), color='gray')
             
             with patch('backend.services.pdf_extraction_service.convert_from_path') as mock_convert:
-                mock_convert.return_value = [mock_image1, mock_image2]
+                mock_convert.side_effect = _render_to_folder([mock_image1, mock_image2])
                 
                 # Mock image enhancement
                 with patch.object(pdf_service.image_utils, 'enhance_image_for_ocr', side_effect=lambda x: x):
@@ -106,11 +164,68 @@ class TestPDFExtractionService:
                 assert len(result) == 2
                 assert result[0][0] == 1  # Page number
                 assert result[1][0] == 2  # Page number
+                assert mock_convert.call_args.kwargs['thread_count'] == pdf_service.thread_count
                 assert isinstance(result[0][1], Image.Image)
                 assert isinstance(result[1][1], Image.Image)
         finally:
             os.unlink(temp_path)
     
+    @patch('backend.services.pdf_extraction_service.convert_from_path')
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 5})
+    def test_extract_pages_as_images_enhances_pages_in_parallel(self, mock_pdfinfo, mock_convert, pdf_service, temp_pdf_file):
+        mock_convert.side_effect = _render_to_folder([Image.new('RGB', (800 + page, 600)) for page in range(5)])
+        pdf_service.max_enhance_workers = 3
+        
+        def enhance(image):
+            if image.width == 802:
+                raise RuntimeError("enhancement failed")
+            return image
+        
+        with patch.object(pdf_service.image_utils, 'enhance_image_for_ocr', side_effect=enhance):
+            result = pdf_service.extract_pages_as_images(temp_pdf_file)
+        
+        assert [(page_num, img.width) for page_num, img in result] == [
+            (1, 800), (2, 801), (4, 803), (5, 804)
+        ]
+    
+    @patch('backend.services.pdf_extraction_service.convert_from_path')
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 20})
+    def test_iter_pages_as_images_renders_in_batches(self, mock_pdfinfo, mock_convert, pdf_service, temp_pdf_file):
+        rendered_paths = []
+        mock_convert.side_effect = _render_to_folder(
+            [Image.new('L', (801 + page, 600)) for page in range(20)], rendered_paths
+        )
+        pdf_service.page_batch_size = 8
+        
+        with patch.object(pdf_service.image_utils, 'enhance_image_for_ocr', side_effect=lambda x: x):
+            pages = pdf_service.iter_pages_as_images(temp_pdf_file)
+            
+            assert next(pages)[0] == 1
+            assert mock_convert.call_count == 1
+            
+            rest = list(pages)
+        
+        assert [page_num for page_num, _ in rest] == list(range(2, 21))
+        assert rest[-1][1].width == 820
+        ranges = [(c.kwargs['first_page'], c.kwargs['last_page']) for c in mock_convert.call_args_list]
+        assert ranges == [(1, 8), (9, 16), (17, 20)]
+        # Rendered files are removed once decoded
+        assert not any(os.path.exists(path) for path in rendered_paths)
+    
+    @patch('backend.services.pdf_extraction_service.convert_from_path')
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path',
+           return_value={'Pages': 2, 'Page size': '1224 x 1584 pts'})
+    def test_extracted_pages_keep_render_dpi(self, mock_pdfinfo, mock_convert, pdf_service, temp_pdf_file):
+        """Test pages rendered to PGM files, which store no DPI, carry the render DPI"""
+        mock_convert.side_effect = _render_to_folder([Image.new('L', (2550, 3300), color=255)] * 2)
+        
+        result = pdf_service.extract_pages_as_images(temp_pdf_file)
+        
+        assert mock_convert.call_args.kwargs['dpi'] == 150
+        for _, image in result:
+            assert image.info['dpi'] == (150, 150)
+            assert pdf_service.image_utils.calculate_dpi(image) == (150.0, 150.0)
+    
     def test_extract_pages_as_images_file_not_found(self, pdf_service):
         with pytest.raises(ValueError, match="PDF file not found"):
             pdf_service.extract_pages_as_images("/nonexistent/file.pdf")
@@ -135,8 +250,8 @@ class TestPDFExtractionService:
             temp_path = temp_file.name
         
         try:
-            with patch('backend.services.pdf_extraction_service.convert_from_path') as mock_convert:
-                mock_convert.return_value = []  # Empty list of images
+            with patch('backend.services.pdf_extraction_service.pdfinfo_from_path') as mock_pdfinfo:
+                mock_pdfinfo.return_value = {'Pages': 0}
                 
                 with pytest.raises(ValueError, match="PDF contains no pages"):
                     pdf_service.extract_pages_as_images(temp_path)
@@ -144,10 +259,11 @@ class TestPDFExtractionService:
             os.unlink(temp_path)
     
     @patch('backend.services.pdf_extraction_service.convert_from_path')
-    def test_extract_pages_pathlib_path(self, mock_convert_from_path, pdf_service):
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 1})
+    def test_extract_pages_pathlib_path(self, mock_pdfinfo, mock_convert_from_path, pdf_service):
         # Create a mock PIL Image
         sample_image = Image.new('RGB', (800, 600), color='white')
-        mock_convert_from_path.return_value = [sample_image]
+        mock_convert_from_path.side_effect = _render_to_folder([sample_image])
         
         with patch.object(pdf_service.image_utils, 'enhance_image_for_ocr', side_effect=lambda x: x):
             with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
@@ -180,7 +296,8 @@ class TestPDFExtractionService:
             mock_convert_from_path.assert_called_once_with(
                 temp_path,
                 dpi=300,
-                fmt='PNG',
+                fmt='ppm',
+                grayscale=True,
                 first_page=1,
                 last_page=1
             )
@@ -222,6 +339,26 @@ class TestPDFExtractionService:
             mock_crop.assert_called_once()
             mock_validate.assert_called_once()
     
+    def test_detect_and_crop_tickets_keeps_ticket_order_in_parallel(self, pdf_service, sample_image):
+        boundaries = [(0, top, 800, top + 100) for top in range(0, 600, 100)]
+        pdf_service.max_ticket_workers = 4
+        
+        with patch.object(pdf_service.image_utils, 'detect_multiple_tickets', return_value=boundaries), \
+             patch.object(pdf_service.image_utils, 'validate_image_completeness',
+                          side_effect=lambda img: img.getpixel((0, 0)) != 0), \
+             patch.object(pdf_service.image_utils, 'extract_ticket_number_from_image',
+                          side_effect=lambda img: str(img.getpixel((0, 0)))):
+            page = Image.new('L', (800, 600))
+            for idx in range(1, 6):
+                page.paste(idx * 10, (0, idx * 100, 800, idx * 100 + 100))
+            
+            result = pdf_service.detect_and_crop_tickets(page, 2)
+        
+        # The first band is blank (pixel value 0) and is skipped
+        assert [metadata['ticket_index'] for _, metadata in result] == [1, 2, 3, 4, 5]
+        assert [metadata['detected_ticket_number'] for _, metadata in result] == ['10', '20', '30', '40', '50']
+        assert [metadata['boundaries'] for _, metadata in result] == boundaries[1:]
+    
     def test_detect_and_crop_tickets_no_boundaries(self, pdf_service, sample_image):
         with patch.object(pdf_service.image_utils, 'detect_multiple_tickets') as mock_detect, \
              patch.object(pdf_service.image_utils, 'validate_image_completeness') as mock_validate:
@@ -263,24 +400,30 @@ class TestPDFExtractionService:
             assert result == sample_image  # Should return original on error
     
     @patch('backend.services.pdf_extraction_service.convert_from_path')
-    def test_get_pdf_info_success(self, mock_convert_from_path, pdf_service, temp_pdf_file):
-        # Create mock PIL Images for 2 pages
-        mock_image1 = Image.new('RGB', (800, 600), color='white')
-        mock_image2 = Image.new('RGB', (800, 600), color='white')
-        mock_convert_from_path.return_value = [mock_image1, mock_image2]
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 2})
+    def test_get_pdf_info_success(self, mock_pdfinfo, mock_convert_from_path, pdf_service, tmp_path):
+        # Two 800x600 pt pages, the second one rotated to portrait
+        writer = PyPDF2.PdfWriter()
+        writer.add_blank_page(width=800, height=600)
+        writer.add_blank_page(width=800, height=600)
+        writer.pages[1].rotate(90)
+        pdf_path = tmp_path / "info.pdf"
+        with open(pdf_path, 'wb') as pdf_file:
+            writer.write(pdf_file)
         
-        result = pdf_service.get_pdf_info(temp_pdf_file)
+        result = pdf_service.get_pdf_info(pdf_path)
         
         assert result['page_count'] == 2
-        assert result['metadata'] == {}  # pdf2image doesn't provide metadata
+        assert result['metadata'] == {}
         assert len(result['pages_info']) == 2
         assert result['pages_info'][0]['page_number'] == 1
         assert result['pages_info'][0]['width'] == 800
         assert result['pages_info'][0]['height'] == 600
         assert result['pages_info'][1]['page_number'] == 2
-        assert result['pages_info'][1]['width'] == 800
-        assert result['pages_info'][1]['height'] == 600
+        assert result['pages_info'][1]['width'] == 600
+        assert result['pages_info'][1]['height'] == 800
         assert result['file_size'] > 0
+        mock_convert_from_path.assert_not_called()
     
     def test_get_pdf_info_error(self, pdf_service):
         result = pdf_service.get_pdf_info("/nonexistent/file.pdf")
@@ -290,7 +433,8 @@ class TestPDFExtractionService:
         assert 'error' in result
     
     @patch('backend.services.pdf_extraction_service.convert_from_path')
-    def test_extract_specific_pages_success(self, mock_convert_from_path, pdf_service):
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 5})
+    def test_extract_specific_pages_success(self, mock_pdfinfo, mock_convert_from_path, pdf_service):
         # Create 5 mock PIL Images
         mock_images = [Image.new('RGB', (800, 600), color='white') for _ in range(5)]
         mock_convert_from_path.return_value = mock_images
@@ -311,7 +455,8 @@ class TestPDFExtractionService:
                 os.unlink(temp_path)
     
     @patch('backend.services.pdf_extraction_service.convert_from_path')
-    def test_extract_specific_pages_invalid_page_numbers(self, mock_convert_from_path, pdf_service):
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 3})
+    def test_extract_specific_pages_invalid_page_numbers(self, mock_pdfinfo, mock_convert_from_path, pdf_service):
         # Create 3 mock PIL Images
         mock_images = [Image.new('RGB', (800, 600), color='white') for _ in range(3)]
         mock_convert_from_path.return_value = mock_images
@@ -328,6 +473,22 @@ class TestPDFExtractionService:
             finally:
                 os.unlink(temp_path)
     
+    @patch('backend.services.pdf_extraction_service.convert_from_path')
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 10})
+    def test_extract_specific_pages_renders_contiguous_runs(self, mock_pdfinfo, mock_convert_from_path, pdf_service, temp_pdf_file):
+        def render(path, first_page, last_page, **kwargs):
+            return [Image.new('RGB', (800 + page, 600)) for page in range(first_page, last_page + 1)]
+        mock_convert_from_path.side_effect = render
+        
+        with patch.object(pdf_service.image_utils, 'enhance_image_for_ocr', side_effect=lambda x: x):
+            result = pdf_service.extract_specific_pages(temp_pdf_file, [5, 2, 3, 4, 9])
+        
+        assert [(page_num, img.width) for page_num, img in result] == [
+            (5, 805), (2, 802), (3, 803), (4, 804), (9, 809)
+        ]
+        ranges = [(c.kwargs['first_page'], c.kwargs['last_page']) for c in mock_convert_from_path.call_args_list]
+        assert ranges == [(2, 5), (9, 9)]
+    
     def test_extract_specific_pages_error(self, pdf_service):
         result = pdf_service.extract_specific_pages("/nonexistent/file.pdf", [1, 2])
         assert result == []
@@ -356,12 +517,13 @@ class TestPDFExtractionService:
         finally:
             os.unlink(temp_path)
     
-    def test_small_page_dimensions_handling(self, pdf_service):
+    @patch('backend.services.pdf_extraction_service.pdfinfo_from_path', return_value={'Pages': 2})
+    def test_small_page_dimensions_handling(self, mock_pdfinfo, pdf_service):
         with patch('backend.services.pdf_extraction_service.convert_from_path') as mock_convert_from_path:
             # Create 2 mock PIL Images with different sizes
             normal_image = Image.new('RGB', (800, 600), color='white')
             small_image = Image.new('RGB', (50, 30), color='white')
-            mock_convert_from_path.return_value = [normal_image, small_image]
+            mock_convert_from_path.side_effect = _render_to_folder([normal_image, small_image])
             
             with patch.object(pdf_service.image_utils, 'enhance_image_for_ocr', side_effect=lambda x: x):
                 with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
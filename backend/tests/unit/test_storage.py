@@ -79,7 +79,37 @@ class TestStorageService:
         assert file_path.exists()
         assert file_path.read_bytes() == test_content
         assert file_path.name == "direct.txt"
-    
+
+    @pytest.mark.asyncio
+    async def test_read_file(self):
+        """Test reading stored files by absolute and relative path"""
+        file_path = await self.storage_service.save_file_content(
+            self.test_batch_id,
+            b"stored bytes",
+            "stored.bin"
+        )
+
+        assert await self.storage_service.read_file(str(file_path)) == b"stored bytes"
+        assert await self.storage_service.read_file(f"{self.test_batch_id}/stored.bin") == b"stored bytes"
+        assert await self.storage_service.read_file("missing.bin") is None
+
+    @pytest.mark.asyncio
+    async def test_read_files(self):
+        """Test reading several files in one call"""
+        first = await self.storage_service.save_file_content(self.test_batch_id, b"one", "one.bin")
+        second = await self.storage_service.save_file_content(self.test_batch_id, b"two", "two.bin")
+
+        contents = await self.storage_service.read_files(
+            [str(first), str(second), str(first), "missing.bin"],
+            max_concurrency=2
+        )
+
+        assert contents == {
+            str(first): b"one",
+            str(second): b"two",
+            "missing.bin": None
+        }
+
     def test_file_exists(self):
         """Test checking if file exists"""
         # File doesn't exist initially
@@ -6,7 +6,10 @@ from unittest.mock import Mock, AsyncMock
 from backend.services.weekly_export_service import WeeklyExportService
 from backend.models.ticket import Ticket
 from backend.models.client import Client
-from backend.models.export import ExportRequest, ExportValidation
+from backend.models.export import (
+    ExportRequest, ExportValidation,
+    WeeklyGrouping, ClientGrouping, ReferenceGrouping
+)
 
 
 class TestWeeklyExportService:
@@ -343,6 +346,35 @@ class TestWeeklyExportService:
         # Should skip ticket without rate
         assert len(week_groups) == 0
     
+    def test_sort_groups_orders_by_key(self, service):
+        """Test weeks, clients and references are stored in key order"""
+        def client_group(name):
+            return ClientGrouping(
+                client_id=uuid4(),
+                client_name=name,
+                reference_groups={
+                    ref: ReferenceGrouping(reference=ref) for ref in ("MM1001", "#007")
+                },
+                rate_per_tonne=25.0
+            )
+        
+        week_groups = {
+            week_key: WeeklyGrouping(
+                week_start=date.fromisoformat(week_key),
+                week_end=date.fromisoformat(week_key),
+                client_groups={"b": client_group("B"), "a": client_group("A")}
+            )
+            for week_key in ("2024-04-22", "2024-04-15")
+        }
+        
+        sorted_groups = service._sort_groups(week_groups)
+        
+        assert list(sorted_groups) == ["2024-04-15", "2024-04-22"]
+        for week_group in sorted_groups.values():
+            assert list(week_group.client_groups) == ["a", "b"]
+            for client in week_group.client_groups.values():
+                assert list(client.reference_groups) == ["#007", "MM1001"]
+    
     @pytest.mark.asyncio
     async def test_log_export_operation(self, service, mock_db):
         """Test logging export operation"""
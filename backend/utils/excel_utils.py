@@ -1,10 +1,39 @@
 import xlrd
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 from xlrd.sheet import Sheet
 import re
 from datetime import datetime, date
 
+# Text date formats accepted in date cells, tried in order
+DATE_FORMATS = (
+    '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y',
+    '%Y%m%d', '%d.%m.%Y', '%Y.%m.%d'
+)
+
+
+@lru_cache(maxsize=1024)
+def _excel_serial_to_date(value: float, workbook_datemode: int) -> Optional[date]:
+    """Convert an Excel date number, cached since a sheet repeats few dates"""
+    try:
+        date_tuple = xlrd.xldate_as_tuple(value, workbook_datemode)
+        return datetime(*date_tuple).date()
+    except xlrd.xldate.XLDateError:
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _text_to_date(text: str) -> Optional[date]:
+    """Parse a text date against DATE_FORMATS, cached by text"""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
 class ExcelUtils:
     """Utility functions for working with legacy .xls files"""
     
@@ -265,26 +294,11 @@ class ExcelUtils:
         
         # If it's an Excel date number
         if isinstance(value, (int, float)):
-            try:
-                date_tuple = xlrd.xldate_as_tuple(value, workbook_datemode)
-                return datetime(*date_tuple).date()
-            except xlrd.xldate.XLDateError:
-                pass
+            return _excel_serial_to_date(value, workbook_datemode)
         
         # Try to parse text date
         if isinstance(value, str):
-            text = value.strip()
-            # Common date formats
-            date_formats = [
-                '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y',
-                '%Y%m%d', '%d.%m.%Y', '%Y.%m.%d'
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(text, fmt).date()
-                except ValueError:
-                    continue
+            return _text_to_date(value.strip())
         
         return None
     
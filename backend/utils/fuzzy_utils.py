@@ -1,7 +1,10 @@
-import re
 from typing import Tuple
 from difflib import SequenceMatcher
 
+# Characters dropped during normalization, applied with str.translate
+_TICKET_SEPARATORS = str.maketrans('', '', '-_/')
+_REFERENCE_PUNCTUATION = str.maketrans('', '', '.,;:!?')
+
 
 class FuzzyMatchUtils:
     """Utilities for fuzzy string matching and OCR error tolerance"""
@@ -14,30 +17,23 @@ class FuzzyMatchUtils:
         if not s2:
             return len(s1)
         
-        # Create matrix
-        matrix = [[0] * (len(s2) + 1) for _ in range(len(s1) + 1)]
-        
-        # Initialize first row and column
-        for i in range(len(s1) + 1):
-            matrix[i][0] = i
-        for j in range(len(s2) + 1):
-            matrix[0][j] = j
-        
-        # Fill matrix
-        for i in range(1, len(s1) + 1):
-            for j in range(1, len(s2) + 1):
-                if s1[i-1] == s2[j-1]:
-                    cost = 0
-                else:
-                    cost = 1
-                
-                matrix[i][j] = min(
-                    matrix[i-1][j] + 1,      # deletion
-                    matrix[i][j-1] + 1,      # insertion
-                    matrix[i-1][j-1] + cost  # substitution
-                )
-        
-        return matrix[len(s1)][len(s2)]
+        # Keep the shorter string along the row so only two rows are stored
+        if len(s1) < len(s2):
+            s1, s2 = s2, s1
+        
+        previous = list(range(len(s2) + 1))
+        for i, c1 in enumerate(s1, start=1):
+            current = [i]
+            for j, c2 in enumerate(s2, start=1):
+                cost = 0 if c1 == c2 else 1
+                current.append(min(
+                    previous[j] + 1,         # deletion
+                    current[j-1] + 1,        # insertion
+                    previous[j-1] + cost     # substitution
+                ))
+            previous = current
+        
+        return previous[-1]
     
     @staticmethod
     def similarity_ratio(s1: str, s2: str) -> float:
@@ -96,12 +92,10 @@ class FuzzyMatchUtils:
             return ""
         
         # Remove whitespace and convert to uppercase
-        normalized = re.sub(r'\s+', '', ticket.upper())
+        normalized = ''.join(ticket.upper().split())
         
         # Remove common separators that might be inconsistent
-        normalized = re.sub(r'[-_/]', '', normalized)
-        
-        return normalized
+        return normalized.translate(_TICKET_SEPARATORS)
     
     @staticmethod
     def _adjust_for_ocr_errors(s1: str, s2: str, base_similarity: float) -> float:
@@ -144,14 +138,19 @@ class FuzzyMatchUtils:
                     variant = s2[:i] + replacement + s2[i+1:]
                     s2_variants.append(variant)
         
-        # Find best match among variants
+        # Perfect match after OCR correction
+        if not set(s1_variants).isdisjoint(s2_variants):
+            return 1.0
+        
+        # Find best match among variants, reusing the matcher's analysis of
+        # each s2 variant across all s1 variants
         best_similarity = base_similarity
-        for v1 in s1_variants:
-            for v2 in s2_variants:
-                if v1 == v2:
-                    return 1.0  # Perfect match after OCR correction
-                similarity = FuzzyMatchUtils.similarity_ratio(v1, v2)
-                best_similarity = max(best_similarity, similarity)
+        matcher = SequenceMatcher(None)
+        for v2 in s2_variants:
+            matcher.set_seq2(v2)
+            for v1 in s1_variants:
+                matcher.set_seq1(v1)
+                best_similarity = max(best_similarity, matcher.ratio())
         
         return best_similarity
     
@@ -197,12 +196,10 @@ class FuzzyMatchUtils:
             return ""
         
         # Convert to uppercase and remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', reference.upper().strip())
+        normalized = ' '.join(reference.upper().split())
         
         # Remove common punctuation that might be inconsistent
-        normalized = re.sub(r'[.,;:!?]', '', normalized)
-        
-        return normalized
+        return normalized.translate(_REFERENCE_PUNCTUATION)
     
     @staticmethod
     def weight_within_tolerance(weight1: float, weight2: float, tolerance: float = 0.5) -> Tuple[bool, float]:
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Tuple, Optional, Union
+from typing import List, Tuple, Optional, Union
 from PIL import Image, ImageStat
 import numpy as np
 import logging
@@ -34,6 +34,63 @@ class ImageUtils:
             logger.warning(f"Could not determine DPI: {e}")
             return 72.0, 72.0
     
+    @staticmethod
+    def grayscale_histogram(image: Image.Image) -> List[int]:
+        """
+        Calculate the 256-bin luminance histogram of an image
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            List of 256 pixel counts, one per grayscale level
+        """
+        # Convert to grayscale
+        if image.mode != 'L':
+            gray = image.convert('L')
+        else:
+            gray = image
+        
+        return gray.histogram()
+    
+    @staticmethod
+    def contrast_ratio_from_histogram(histogram: List[int]) -> float:
+        """
+        Calculate contrast ratio from a grayscale histogram
+        
+        Args:
+            histogram: 256-bin histogram from grayscale_histogram()
+            
+        Returns:
+            Contrast ratio as percentage (0-100)
+        """
+        # Calculate standard deviation as measure of contrast
+        stat = ImageStat.Stat(histogram)
+        contrast = stat.stddev[0]
+        
+        # Normalize to percentage (typical range 0-128 for 8-bit images)
+        contrast_percentage = (contrast / 128.0) * 100.0
+        
+        return min(contrast_percentage, 100.0)
+    
+    @staticmethod
+    def completeness_from_histogram(histogram: List[int]) -> float:
+        """
+        Calculate the percentage of non-white pixels from a grayscale histogram
+        
+        Args:
+            histogram: 256-bin histogram from grayscale_histogram()
+            
+        Returns:
+            Percentage of pixels darker than the white threshold (0-100)
+        """
+        # Count non-white pixels (white is > 240)
+        total_pixels = sum(histogram)
+        if total_pixels == 0:
+            return 0.0
+        
+        return sum(histogram[:240]) / total_pixels * 100.0
+    
     @staticmethod
     def calculate_contrast_ratio(image: Image.Image) -> float:
         """
@@ -46,20 +103,8 @@ class ImageUtils:
             Contrast ratio as percentage (0-100)
         """
         try:
-            # Convert to grayscale for contrast calculation
-            if image.mode != 'L':
-                gray_image = image.convert('L')
-            else:
-                gray_image = image
-            
-            # Calculate standard deviation as measure of contrast
-            stat = ImageStat.Stat(gray_image)
-            contrast = stat.stddev[0]
-            
-            # Normalize to percentage (typical range 0-128 for 8-bit images)
-            contrast_percentage = (contrast / 128.0) * 100.0
-            
-            return min(contrast_percentage, 100.0)
+            histogram = ImageUtils.grayscale_histogram(image)
+            return ImageUtils.contrast_ratio_from_histogram(histogram)
             
         except Exception as e:
             logger.error(f"Error calculating contrast: {e}")
@@ -150,9 +195,6 @@ class ImageUtils:
             if image.mode != 'L':
                 image = image.convert('L')
             
-            # Convert to numpy array for processing
-            np.array(image)
-            
             # Apply histogram equalization to improve contrast
             from PIL import ImageOps
             enhanced = ImageOps.equalize(image)
@@ -221,7 +263,7 @@ class ImageUtils:
                 gray = image
             
             # Convert to numpy array
-            img_array = np.array(gray)
+            img_array = np.asarray(gray)
             
             # Simple edge detection - find significant changes in brightness
             # This is a basic implementation - could be enhanced with OpenCV
@@ -273,7 +315,7 @@ class ImageUtils:
             else:
                 gray = image
             
-            img_array = np.array(gray)
+            img_array = np.asarray(gray)
             
             # Find horizontal dividing lines (strong horizontal edges)
             # Calculate horizontal gradients
@@ -344,6 +386,20 @@ class ImageUtils:
             # Return full page as single ticket on error
             return [(0, 0, image.size[0], image.size[1])]
     
+    @staticmethod
+    def compute_completeness_percentage(image: Image.Image) -> float:
+        """
+        Calculate the percentage of non-white pixels in an image
+        
+        Args:
+            image: PIL Image object
+            
+        Returns:
+            Percentage of pixels darker than the white threshold (0-100)
+        """
+        histogram = ImageUtils.grayscale_histogram(image)
+        return ImageUtils.completeness_from_histogram(histogram)
+    
     @staticmethod
     def validate_image_completeness(image: Image.Image, min_filled_percentage: float = 10.0) -> bool:
         """
@@ -357,21 +413,7 @@ class ImageUtils:
             True if image has sufficient content
         """
         try:
-            # Convert to grayscale
-            if image.mode != 'L':
-                gray = image.convert('L')
-            else:
-                gray = image
-            
-            # Convert to numpy array
-            img_array = np.array(gray)
-            
-            # Count non-white pixels (assuming white is > 240)
-            non_white_pixels = np.sum(img_array < 240)
-            total_pixels = img_array.size
-            
-            filled_percentage = (non_white_pixels / total_pixels) * 100.0
-            
+            filled_percentage = ImageUtils.compute_completeness_percentage(image)
             return filled_percentage >= min_filled_percentage
             
         except Exception as e: